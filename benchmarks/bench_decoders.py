@@ -0,0 +1,265 @@
+"""Decoder benchmark, compares the typed decoders against the previous dict filter path.
+
+Run from the repository root:
+    python -m benchmarks.bench_decoders --items 100000
+"""
+import argparse
+import os
+import sys
+import time
+# Run as a script the repository root is not on the path, "python -m" adds it
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from receiver.decoders import DECODERS, ROW_BUILDERS, decode_message
+from processor.batches import record_from_row
+from benchmarks.synthetic import synthesize_items
+
+# Previous receiver path, kept here as the baseline
+def legacy_calculate_despawn_time(disappear_time, first_seen):
+    if disappear_time is None or first_seen is None:
+        return None
+    time_diff = disappear_time - first_seen
+    total_seconds = time_diff // 1
+    return total_seconds
+
+# Extract quest rewards information
+def legacy_extract_quest_rewards(quest_rewards):
+    extracted_rewards = []  # Use a list to store information about each reward
+
+    for reward in quest_rewards:
+        reward_info = reward.get('info', {})
+        reward_data = {
+            'reward_type': reward.get('type'),  # Always extract the reward type
+            'pokemon_id': reward_info.get('pokemon_id'),
+            'form_id': reward_info.get('form_id'),
+            'item_id': reward_info.get('item_id'),
+            'amount': reward_info.get('amount')
+        }
+
+        # Keep None values, as they will be stored as NULL in the database
+        extracted_rewards.append(reward_data)
+
+    return extracted_rewards
+
+def legacy_extract_pvp_ranks(pvp_data):
+    ranks = {f'pvp_{category}_rank': None for category in ['great', 'little', 'ultra']}
+    if pvp_data:
+        for category in ['great', 'little', 'ultra']:
+            category_data = pvp_data.get(category, [])
+            ranks[f'pvp_{category}_rank'] = 1 if any(entry.get('rank') == 1 for entry in category_data) else None
+    return ranks
+
+# Pokémon record
+def legacy_build_pokemon_data(message, geofence_name):
+    ind_attack = message['individual_attack']
+    ind_defense = message['individual_defense']
+    ind_stamina = message['individual_stamina']
+
+    if ind_attack == ind_defense == ind_stamina == 15:
+        iv_value = 100
+    elif ind_attack == ind_defense == ind_stamina == 0:
+        iv_value = 0
+    else:
+        iv_value = None
+
+    despawn_time = legacy_calculate_despawn_time(
+        message.get('disappear_time'),
+        message.get('first_seen')
+    )
+    return {
+        'pokemon_id': message['pokemon_id'],
+        'form': message['form'],
+        'latitude': message['latitude'],
+        'longitude': message['longitude'],
+        'iv': iv_value,
+        **legacy_extract_pvp_ranks(message.get('pvp', {})),
+        'shiny':message['shiny'],
+        'area_name': geofence_name,
+        'despawn_time': despawn_time
+    }
+
+# Quest record
+def legacy_build_quest_data(message, geofence_name):
+    rewards_extracted = legacy_extract_quest_rewards(message.get('rewards', []))
+    quest_data_to_store = {
+        'pokestop_id': message.get('pokestop_id'),
+        'area_name': geofence_name,
+        # Initialize as None by default
+        'ar_type': None,
+        'normal_type': None,
+        'reward_ar_type': None,
+        'reward_normal_type': None,
+        'reward_ar_item_id': None,
+        'reward_ar_item_amount': None,
+        'reward_normal_item_id': None,
+        'reward_normal_item_amount': None,
+        'reward_ar_poke_id': None,
+        'reward_ar_poke_form': None,
+        'reward_normal_poke_id': None,
+        'reward_normal_poke_form': None,
+    }
+    # Determine AR or Normal
+    quest_type_field = 'ar_type' if message.get('with_ar') else 'normal_type'
+    quest_data_to_store[quest_type_field] = message.get('type')
+
+    # Process rewards
+    for reward in rewards_extracted:
+        reward_prefix = 'reward_ar_' if message.get('with_ar') else 'reward_normal_'
+        if 'pokemon_id' in reward:
+            quest_data_to_store[f'{reward_prefix}poke_id'] = reward.get('pokemon_id')
+            quest_data_to_store[f'{reward_prefix}poke_form'] = reward.get('form_id', None)
+        if 'item_id' in reward:
+            quest_data_to_store[f'{reward_prefix}item_id'] = reward.get('item_id')
+            quest_data_to_store[f'{reward_prefix}item_amount'] = reward.get('amount', None)
+        elif 'amount' in reward and not ('pokemon_id' in reward or 'item_id' in reward):
+            quest_data_to_store[f'{reward_prefix}item_amount'] = reward.get('amount')
+
+        # Update reward_ar_type or reward_normal_type based on the reward type and with_ar value
+        if message.get('with_ar'):
+            quest_data_to_store['reward_ar_type'] = reward.get('reward_type')
+        else:
+            quest_data_to_store['reward_normal_type'] = reward.get('reward_type')
+        # Break if theres more then one reward per quest
+        break
+
+    return quest_data_to_store
+
+# Raid record
+def legacy_build_raid_data(message, geofence_name):
+    return {
+        'gym_id': message['gym_id'],
+        'ex_raid_eligible': message['ex_raid_eligible'],
+        'is_exclusive': message['is_exclusive'],
+        'level': message['level'],
+        'pokemon_id': message['pokemon_id'],
+        'form': message['form'],
+        'costume': message['costume'],
+        'area_name': geofence_name,
+    }
+
+# Invasion record
+def legacy_build_invasion_data(message, geofence_name):
+    return {
+        'pokestop_id': message['pokestop_id'],
+        'display_type': message['display_type'],
+        'character': message['character'],
+        'confirmed': message['confirmed'],
+        'area_name': geofence_name,
+    }
+
+# Raid filters
+def legacy_raid_filter_criteria(message):
+    raid_required_fields = [
+        'gym_id', 'ex_raid_eligible', 'is_exclusive', 'level', 'pokemon_id', 'form', 'costume', 'latitude', 'longitude'
+    ]
+    return all(message.get(raid_field) is not None for raid_field in raid_required_fields)
+
+# Invasion filters
+def legacy_invasion_filter_criteria(message):
+    invasion_required_fields = [
+        'display_type', 'character', 'confirmed', 'pokestop_id', 'latitude', 'longitude'
+    ]
+    return all(message.get(invasion_field) is not None for invasion_field in invasion_required_fields)
+
+# Quest filters
+def legacy_quest_filter_criteria(message):
+    # Check for mandatory fields: type, with_ar, latitude, and longitude
+    basic_checks = all(key in message for key in ['type', 'with_ar', 'latitude', 'longitude'])
+
+    # Initialize rewards_check to False to ensure it must pass checks to turn True
+    rewards_check = False
+    if 'rewards' in message and isinstance(message['rewards'], list) and len(message['rewards']) > 0:
+        for reward in message['rewards']:
+            # Each reward must have a type and an info dictionary
+            if 'type' in reward and 'info' in reward:
+                info = reward['info']
+                # Each info must have either (pokemon_id and form_id) or (item_id and amount)
+                if ('pokemon_id' in info) or ('item_id' in info and 'amount' in info) or ('amount' in info):
+                    rewards_check = True
+                else:
+                    # If any reward does not meet the criteria, fail the check and stop looping
+                    rewards_check = False
+                    break
+            else:
+                # If any reward does not have the correct structure, fail the check and stop looping
+                rewards_check = False
+                break
+
+    return basic_checks and rewards_check
+
+# Pokémon filters
+def legacy_filter_criteria(message):
+    required_fields = [
+        'pokemon_id', 'form', 'latitude', 'longitude',
+        'individual_attack', 'individual_defense', 'individual_stamina'
+    ]
+    return all(message.get(field) is not None for field in required_fields)
+
+
+LEGACY_PATH = {
+    'pokemon': (legacy_filter_criteria, legacy_build_pokemon_data),
+    'quest': (legacy_quest_filter_criteria, legacy_build_quest_data),
+    'raid': (lambda message: legacy_raid_filter_criteria(message) and message['pokemon_id'] not in (None, 0), legacy_build_raid_data),
+    'invasion': (legacy_invasion_filter_criteria, legacy_build_invasion_data),
+}
+
+def legacy_process(items):
+    records = []
+    for item in items:
+        item_type = item.get('type')
+        if item_type not in LEGACY_PATH:
+            continue
+        message = item.get('message', {})
+        filter_function, build_function = LEGACY_PATH[item_type]
+        if filter_function(message):
+            records.append(build_function(message, 'Area'))
+    return records
+
+# Rows of (type, row) like the receiver queues them, they are only turned into dicts to compare them
+def decoder_process(items):
+    rows = []
+    for item in items:
+        item_type = item.get('type')
+        if item_type not in DECODERS:
+            continue
+        decoded = decode_message(item_type, item.get('message', {}))
+        if decoded is not None:
+            rows.append((item_type, ROW_BUILDERS[item_type](decoded, 'Area')))
+    return rows
+
+# Both paths run in turns, so a busy machine slows them down alike
+def measure(processes, items, repeat):
+    best = [None] * len(processes)
+    results = [None] * len(processes)
+    for _ in range(repeat):
+        for index, process in enumerate(processes):
+            start = time.perf_counter()
+            results[index] = process(items)
+            elapsed = time.perf_counter() - start
+            best[index] = elapsed if best[index] is None else min(best[index], elapsed)
+    return best, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=100000, help='Number of webhook items to synthesize')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per path, the best one is reported')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    items = synthesize_items(args.items, args.seed)
+    (legacy_time, decoder_time), (legacy_records, decoder_rows) = measure((legacy_process, decoder_process), items, args.repeat)
+    decoder_records = [record_from_row(item_type, row) for item_type, row in decoder_rows]
+
+    print(f"Items: {len(items)}, records kept: {len(decoder_records)}")
+    print(f"Legacy dict path: {legacy_time * 1e9 / len(items):8.0f} ns/item")
+    print(f"Typed decoders:   {decoder_time * 1e9 / len(items):8.0f} ns/item ({legacy_time / decoder_time:.2f}x)")
+    # Queued records also carry the location of quests, raids and invasions, the legacy ones did not
+    same_records = len(legacy_records) == len(decoder_records) and all(
+        legacy_record == {key: record.get(key) for key in legacy_record}
+        for legacy_record, record in zip(legacy_records, decoder_records)
+    )
+    if not same_records:
+        print("WARNING: decoded records differ from the legacy path")
+
+if __name__ == '__main__':
+    main()
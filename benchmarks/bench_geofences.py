@@ -0,0 +1,184 @@
+"""Geofence classification benchmark, compares the area lookup strategies of the receiver over fence sets of growing size.
+
+Every combination of fence count and vertex count gets its own synthetic Koji fences and point cloud.
+Run from the repository root:
+    python -m benchmarks.bench_geofences --fences 10,100,1000 --vertices 10,100,1000 --points 100000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import shapely
+from cachetools import TTLCache
+from shapely.geometry import Point, Polygon
+# Run as a script the repository root is not on the path, "python -m" adds it
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from receiver.geofence_index import GeofenceIndex
+from benchmarks.synthetic import synthesize_geofences
+
+# Points this close to a fence edge, in degrees, are boundary points
+BOUNDARY_WIDTH = 0.00001
+DEFAULT_POINT_MIX = {'inside': 0.8, 'outside': 0.15, 'boundary': 0.05}
+
+
+def parse_int_list(text):
+    return [int(value) for value in text.split(',')]
+
+def parse_point_mix(text):
+    """Point mix from "inside=0.8,outside=0.15,boundary=0.05"."""
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind.strip() not in DEFAULT_POINT_MIX:
+            raise ValueError(f"Unknown point kind in mix: {kind}")
+        mix[kind.strip()] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("The mix needs at least one positive weight")
+    return {kind: weight / total for kind, weight in mix.items()}
+
+# Previous receiver lookup, kept here as the baseline
+def legacy_is_inside_geofence(lat, lon, geofences):
+    point = Point(lon, lat)
+    for geofence in geofences:
+        geofence_name = geofence.get("properties", {}).get("name", "Unknown")
+        polygon = geofence["geometry"]["coordinates"][0]
+        if point.within(Polygon(polygon)):
+            return True, geofence_name
+    return False, None
+
+def inside_points(rnd, polygons, count):
+    lons = np.empty(0)
+    lats = np.empty(0)
+    while len(lons) < count:
+        # Sample the bounding box of random fences, keep points clear of their edges
+        fences = polygons[rnd.integers(0, len(polygons), count)]
+        bounds = shapely.bounds(fences)
+        candidate_lons = rnd.uniform(bounds[:, 0], bounds[:, 2])
+        candidate_lats = rnd.uniform(bounds[:, 1], bounds[:, 3])
+        keep = shapely.contains_xy(fences, candidate_lons, candidate_lats)
+        keep &= shapely.distance(shapely.boundary(fences), shapely.points(candidate_lons, candidate_lats)) > BOUNDARY_WIDTH
+        lons = np.concatenate([lons, candidate_lons[keep]])
+        lats = np.concatenate([lats, candidate_lats[keep]])
+    return lats[:count], lons[:count]
+
+def outside_points(rnd, polygons, bounds, count):
+    south, west, size = bounds
+    tree = shapely.STRtree(polygons)
+    lons = np.empty(0)
+    lats = np.empty(0)
+    while len(lons) < count:
+        candidate_lons = rnd.uniform(west, west + size, count)
+        candidate_lats = rnd.uniform(south, south + size, count)
+        points = shapely.points(candidate_lons, candidate_lats)
+        near = tree.query(points, predicate='dwithin', distance=BOUNDARY_WIDTH)[0]
+        keep = np.ones(count, dtype=bool)
+        keep[near] = False
+        lons = np.concatenate([lons, candidate_lons[keep]])
+        lats = np.concatenate([lats, candidate_lats[keep]])
+    return lats[:count], lons[:count]
+
+def boundary_points(rnd, polygons, count):
+    # Points on a random spot of a fence edge, moved up to BOUNDARY_WIDTH either way
+    rings = shapely.get_exterior_ring(polygons[rnd.integers(0, len(polygons), count)])
+    points = shapely.line_interpolate_point(rings, rnd.random(count), normalized=True)
+    lons = shapely.get_x(points) + rnd.uniform(-BOUNDARY_WIDTH, BOUNDARY_WIDTH, count)
+    lats = shapely.get_y(points) + rnd.uniform(-BOUNDARY_WIDTH, BOUNDARY_WIDTH, count)
+    return lats, lons
+
+def synthesize_points(geofences, bounds, count, point_mix, seed):
+    """Shuffled point cloud with the inside, outside and boundary shares of point_mix."""
+    rnd = np.random.default_rng(seed)
+    polygons = np.array([Polygon(geofence['geometry']['coordinates'][0]) for geofence in geofences], dtype=object)
+    counts = {kind: int(round(count * point_mix.get(kind, 0))) for kind in DEFAULT_POINT_MIX}
+    parts = [
+        inside_points(rnd, polygons, counts['inside']),
+        outside_points(rnd, polygons, bounds, counts['outside']),
+        boundary_points(rnd, polygons, counts['boundary']),
+    ]
+    lats = np.concatenate([part[0] for part in parts])
+    lons = np.concatenate([part[1] for part in parts])
+    order = rnd.permutation(len(lats))
+    return lats[order], lons[order]
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+def run_legacy(geofences, lats, lons, budget):
+    """Looks up as many points as fit in budget seconds, the baseline is too slow for the whole cloud."""
+    areas = []
+    started = time.perf_counter()
+    for lat, lon in zip(lats.tolist(), lons.tolist()):
+        areas.append(legacy_is_inside_geofence(lat, lon, geofences)[1])
+        if time.perf_counter() - started > budget:
+            break
+    return time.perf_counter() - started, areas
+
+def run_single(geofence_index, lats, lons):
+    return [geofence_index.lookup(lat, lon)[1] for lat, lon in zip(lats.tolist(), lons.tolist())]
+
+# Stable locations come back with the area found the last time, like the receiver area memo
+def run_memo(area_memo, areas):
+    return [area_memo[index] for index in range(len(areas))]
+
+def mismatches(areas, reference):
+    return sum(area != expected for area, expected in zip(areas, reference))
+
+def bench_fence_set(args, fence_count, vertex_count):
+    bounds = (args.south, args.west, args.size)
+    geofences = synthesize_geofences(fence_count, args.seed, bounds, vertices=vertex_count)
+    lats, lons = synthesize_points(geofences, bounds, args.points, args.point_mix, args.seed)
+
+    results = []
+    index_build, plain_index = timed(GeofenceIndex, geofences)
+    grid_build, grid_index = timed(GeofenceIndex, geofences, args.grid_cell_size, args.grid_max_cells)
+
+    batch_time, reference = timed(plain_index.lookup_many, lats, lons)
+    results.append(('index, batch', index_build, batch_time, len(lats), 0))
+    single_time, areas = timed(run_single, plain_index, lats, lons)
+    results.append(('index, single', index_build, single_time, len(lats), mismatches(areas, reference)))
+    grid_batch_time, areas = timed(grid_index.lookup_many, lats, lons)
+    results.append((f'grid {grid_index.grid_cell_size}, batch', grid_build, grid_batch_time, len(lats), mismatches(areas, reference)))
+    grid_single_time, areas = timed(run_single, grid_index, lats, lons)
+    results.append((f'grid {grid_index.grid_cell_size}, single', grid_build, grid_single_time, len(lats), mismatches(areas, reference)))
+
+    area_memo = TTLCache(maxsize=len(reference), ttl=3600)
+    for index, area in enumerate(reference):
+        area_memo[index] = area
+    memo_time, areas = timed(run_memo, area_memo, reference)
+    results.append(('area memo, warm', 0.0, memo_time, len(lats), mismatches(areas, reference)))
+
+    legacy_time, areas = run_legacy(geofences, lats, lons, args.legacy_budget)
+    results.append(('legacy is_inside_geofence', 0.0, legacy_time, len(areas), mismatches(areas, reference)))
+
+    grid_stats = grid_index.grid_stats()
+    print(f"\n{fence_count} fences of {vertex_count} vertices, {len(lats)} points, grid hit rate {100 * grid_stats['hit_rate']:.1f}% over {grid_stats['cells']} cells")
+    print(f"  {'strategy':<28} {'build ms':>10} {'ns/point':>12} {'points':>8} {'mismatches':>10}")
+    for strategy, build_time, lookup_time, points, mismatch_count in results:
+        print(f"  {strategy:<28} {build_time * 1000:>10.1f} {lookup_time * 1e9 / max(points, 1):>12.0f} {points:>8} {mismatch_count:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fences', type=parse_int_list, default=[10, 100, 1000], help='Fence counts, comma separated')
+    parser.add_argument('--vertices', type=parse_int_list, default=[10, 100, 1000], help='Vertices per fence, comma separated')
+    parser.add_argument('--points', type=int, default=100000, help='Points per fence set')
+    parser.add_argument('--point-mix', type=parse_point_mix, default=DEFAULT_POINT_MIX, help='Like inside=0.8,outside=0.15,boundary=0.05')
+    parser.add_argument('--south', type=float, default=38.5)
+    parser.add_argument('--west', type=float, default=-28.7)
+    parser.add_argument('--size', type=float, default=0.5, help='Degrees covered by the fences')
+    parser.add_argument('--grid-cell-size', type=float, default=0.01, help='GEOFENCE_GRID_CELL_SIZE of the grid strategies')
+    parser.add_argument('--grid-max-cells', type=int, default=1000000, help='GEOFENCE_GRID_MAX_CELLS of the grid strategies')
+    parser.add_argument('--legacy-budget', type=float, default=2.0, help='Seconds spent on the legacy lookup per fence set')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    for fence_count in args.fences:
+        for vertex_count in args.vertices:
+            bench_fence_set(args, fence_count, vertex_count)
+
+if __name__ == '__main__':
+    main()
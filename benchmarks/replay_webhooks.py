@@ -0,0 +1,200 @@
+"""End to end receiver benchmark, replays synthetic Golbat webhooks against the FastAPI app in process.
+
+Batches are encoded by the publisher as usual and handed to stand-ins of the insert tasks instead of
+Redis and Celery, so the numbers cover parsing, filtering, classification, queueing and encoding.
+
+Run from the repository root:
+    python -m benchmarks.replay_webhooks --requests 200 --payload-size 500 --geofences 50
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+# Run as a script the repository root is not on the path, "python -m" adds it
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import DEFAULT_MIX, parse_mix, synthesize_items, synthesize_geofences
+from receiver.geofence_snapshot import geofence_version, save_snapshot
+
+# The receiver reads its config on import, without a config.json the example one is used
+if not os.path.exists('config/config.json') and 'PSYDUCK_CONFIG' not in os.environ:
+    with open('config/config.example.json') as example_file:
+        example_config = json.load(example_file)
+    # Nothing connects to the database, it only needs to parse
+    example_config['database']['PORT'] = '3306'
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as config_file:
+        json.dump(example_config, config_file)
+    os.environ['PSYDUCK_CONFIG'] = config_file.name
+    atexit.register(os.unlink, config_file.name)
+
+import httpx
+from config.app_config import app_config
+import receiver.webhookparser as webhookparser
+from receiver.aggregator import PokemonAggregator
+from receiver.dedup import DedupFilter
+
+
+class ReplayTask:
+    """Takes the place of an insert task, counts what would have been sent to the broker."""
+
+    def __init__(self):
+        self.batches = 0
+        self.records = 0
+        self.payload_bytes = 0
+
+    # Batch ids end with the first and last record id of the batch
+    def delay(self, payload, batch_id):
+        first, last = batch_id.rsplit(':', 1)[1].split('-')
+        self.batches += 1
+        self.records += int(last) - int(first) + 1
+        self.payload_bytes += len(payload)
+
+
+class ReplayAggregateTask:
+    """Takes the place of the aggregate upsert task, counts the rows that would have been upserted."""
+
+    def __init__(self):
+        self.upserts = 0
+        self.rows = 0
+        self.payload_bytes = 0
+
+    def delay(self, deltas, unique_id):
+        self.upserts += 1
+        self.rows += len(deltas)
+        self.payload_bytes += len(json.dumps(deltas))
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def build_bodies(args, mix):
+    items = synthesize_items(args.requests * args.payload_size, args.seed, mix)
+    return [
+        json.dumps(items[start:start + args.payload_size]).encode()
+        for start in range(0, len(items), args.payload_size)
+    ]
+
+async def replay(bodies, concurrency):
+    latencies = []
+    statuses = {}
+    next_body = iter(bodies)
+    transport = httpx.ASGITransport(app=webhookparser.webhook_processor, client=('127.0.0.1', 1234))
+    async with httpx.AsyncClient(transport=transport, base_url='http://receiver') as client:
+        async def sender():
+            for body in next_body:
+                started = time.perf_counter()
+                response = await client.post('/webhook', content=body, headers={'Content-Type': 'application/json'})
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                # The in-process transport never waits on a socket, give the loop its turn like a real connection would
+                await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(sender() for _ in range(concurrency)))
+        replay_time = time.perf_counter() - started
+    if set(statuses) - {200, 202}:
+        print(f"Webhook answers by status code: {statuses}")
+    return replay_time, latencies
+
+async def run(args, bodies):
+    webhookparser.flush_task = asyncio.create_task(webhookparser.flush_queues())
+    if app_config.process_workers > 0:
+        webhookparser.payload_pool = webhookparser.start_payload_pool()
+    if webhookparser.pipeline:
+        webhookparser.pipeline.start()
+    replay_time, latencies = await replay(bodies, args.concurrency)
+    # Publishes what is still queued or in the pipeline, like a receiver that is stopped
+    drain_started = time.perf_counter()
+    await webhookparser.shutdown_event()
+    return replay_time, time.perf_counter() - drain_started, sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='Webhook requests to replay')
+    parser.add_argument('--payload-size', type=int, default=500, help='Items per webhook request')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help='Type mix, like pokemon=0.7,quest=0.1,raid=0.1,invasion=0.1')
+    parser.add_argument('--geofences', type=int, default=50, help='Number of synthetic geofences')
+    parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight at once')
+    parser.add_argument('--stream-parse', action='store_true', help='Parse the bodies incrementally (STREAM_PARSE)')
+    parser.add_argument('--pipeline', action='store_true', help='Answer with 202 and process in stages (PIPELINE)')
+    parser.add_argument('--process-workers', type=int, default=0, help='Decode and classify in worker processes (PROCESS_WORKERS)')
+    parser.add_argument('--defer-classification', action='store_true', help='Queue records without an area (DEFER_CLASSIFICATION), nothing is published to Redis')
+    parser.add_argument('--aggregate', action='store_true', help='Count pokemon in the receiver and upsert the counters (POKEMON_AGGREGATION)')
+    parser.add_argument('--no-raw-pokemon', action='store_true', help='With --aggregate, queue no raw pokemon rows (POKEMON_RAW_STORAGE false)')
+    parser.add_argument('--dedup', action='store_true', help='Drop repeated messages (DEDUP)')
+    parser.add_argument('--log', action='store_true', help='Keep the receiver logger enabled')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    app_config.allow_webhook_host = ''
+    app_config.spool = False
+    app_config.stream_parse = args.stream_parse
+    app_config.process_workers = args.process_workers
+    app_config.defer_classification = args.defer_classification
+    app_config.pokemon_raw_storage = not args.no_raw_pokemon
+    if args.aggregate and not args.defer_classification:
+        webhookparser.aggregator = PokemonAggregator()
+    if args.pipeline and not webhookparser.pipeline:
+        webhookparser.pipeline = webhookparser.build_pipeline()
+    if args.dedup and not webhookparser.dedup_filters:
+        webhookparser.dedup_filters = {
+            'pokemon': DedupFilter(app_config.pokemon_dedup_ttl, app_config.dedup_max_keys),
+            'quest': DedupFilter(app_config.quest_dedup_ttl, app_config.dedup_max_keys),
+            'raid': DedupFilter(app_config.raid_dedup_ttl, app_config.dedup_max_keys),
+            'invasion': DedupFilter(app_config.invasion_dedup_ttl, app_config.dedup_max_keys),
+        }
+    if not args.log:
+        webhookparser.logger.disabled = True
+
+    tasks = {record_type: ReplayTask() for record_type in ('pokemon', 'quest', 'raid', 'invasion')}
+    webhookparser.insert_data_task = tasks['pokemon']
+    webhookparser.insert_quest_data_task = tasks['quest']
+    webhookparser.insert_raid_data_task = tasks['raid']
+    webhookparser.insert_invasion_data_task = tasks['invasion']
+    aggregate_task = ReplayAggregateTask()
+    webhookparser.upsert_aggregates_task = aggregate_task
+
+    build_started = time.perf_counter()
+    geofences = synthesize_geofences(args.geofences, args.seed)
+    version = geofence_version(geofences)
+    if args.process_workers > 0:
+        # Worker processes load the geofences from a snapshot
+        snapshot_dir = tempfile.TemporaryDirectory()
+        app_config.geofence_snapshot = os.path.join(snapshot_dir.name, 'geofences.json')
+        save_snapshot(app_config.geofence_snapshot, geofences, version)
+    webhookparser.store_geofences(geofences, version)
+    bodies = build_bodies(args, args.mix)
+    print(f"Prepared {len(bodies)} webhooks of {args.payload_size} items and {args.geofences} geofences in {time.perf_counter() - build_started:.1f}s, peak RSS {peak_rss_mb():.0f} MB")
+
+    replay_time, drain_time, latencies = asyncio.run(run(args, bodies))
+
+    messages = len(bodies) * args.payload_size
+    published = sum(task.records for task in tasks.values())
+    print(f"Messages: {messages}, published records: {published}")
+    dropped = {
+        reason: sum(counter.value for (_, counter_reason), counter in webhookparser.filtered_counts.items() if counter_reason == reason)
+        for reason in ('invalid', 'duplicate', 'shed')
+    }
+    dropped['outside geofences'] = sum(counter.value for counter in webhookparser.outside_geofence_counts.values())
+    print("Dropped: " + ", ".join(f"{reason} {count}" for reason, count in dropped.items()))
+    for record_type, task in tasks.items():
+        print(f"  {record_type:<9} {task.records:>9} records in {task.batches:>5} batches, {task.payload_bytes / 1024:.0f} KiB")
+    if webhookparser.aggregator is not None:
+        print(f"  {'aggregate':<9} {aggregate_task.rows:>9} rows    in {aggregate_task.upserts:>5} upserts, {aggregate_task.payload_bytes / 1024:.0f} KiB")
+    print(f"Throughput: {messages / replay_time:,.0f} messages/s ({len(bodies) / replay_time:.1f} requests/s) received, {messages / (replay_time + drain_time):,.0f} messages/s including the {drain_time:.2f}s drain")
+    print(f"Request latency: p50 {percentile(latencies, 0.5) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+    print(f"Peak RSS: {peak_rss_mb():.0f} MB")
+
+if __name__ == '__main__':
+    main()
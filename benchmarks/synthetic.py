@@ -0,0 +1,116 @@
+"""Synthetic webhook items and Koji geofences shared by the benchmarks."""
+import copy
+import json
+import math
+import random
+
+SNIPPET_FILE = 'examples/unclean_data_snippet.json'
+
+DEFAULT_MIX = {'pokemon': 0.7, 'quest': 0.1, 'raid': 0.1, 'invasion': 0.1}
+# (south, west, size in degrees) of the area the items and fences are spread over
+DEFAULT_BOUNDS = (38.5, -28.7, 0.1)
+
+
+def parse_mix(text):
+    """Type mix from "pokemon=0.7,quest=0.1,...", weights don't need to add up to 1."""
+    mix = {}
+    for part in text.split(','):
+        item_type, _, weight = part.partition('=')
+        if item_type.strip() not in DEFAULT_MIX:
+            raise ValueError(f"Unknown item type in mix: {item_type}")
+        mix[item_type.strip()] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+# The snippet is a fragment of a Golbat payload, a single pokemon item followed by a comma
+def load_snippet_items():
+    with open(SNIPPET_FILE) as snippet_file:
+        snippet = snippet_file.read().strip().rstrip(',')
+    return json.loads(f'[{snippet}]')
+
+def synthesize_items(count, seed, mix=DEFAULT_MIX, bounds=DEFAULT_BOUNDS):
+    rnd = random.Random(seed)
+    south, west, size = bounds
+    total_weight = sum(mix.values())
+    cumulative = 0.0
+    thresholds = []
+    for item_type, weight in mix.items():
+        cumulative += weight / total_weight
+        thresholds.append((cumulative, item_type))
+    pokemon_templates = [item for item in load_snippet_items() if item.get('type') == 'pokemon']
+    # Pokestops and gyms don't move, the first location drawn for an id is kept for all its items
+    fort_locations = {}
+    items = []
+    for index in range(count):
+        latitude = south + rnd.random() * size
+        longitude = west + rnd.random() * size
+        roll = rnd.random()
+        item_type = next((item_type for threshold, item_type in thresholds if roll < threshold), thresholds[-1][1])
+        if item_type == 'pokemon':
+            item = copy.deepcopy(rnd.choice(pokemon_templates))
+            message = item['message']
+            message['latitude'] = latitude
+            message['longitude'] = longitude
+            message['encounter_id'] = str(rnd.getrandbits(63))
+            message['spawnpoint_id'] = format(rnd.getrandbits(48), 'X')
+            message['individual_attack'] = rnd.choice([0, 15, rnd.randint(0, 15)])
+            if rnd.random() < 0.05:
+                del message['individual_attack']
+        elif item_type == 'quest':
+            pokestop_id = f'stop{rnd.randint(0, 5000)}'
+            latitude, longitude = fort_locations.setdefault(pokestop_id, (latitude, longitude))
+            item = {'type': 'quest', 'message': {
+                'pokestop_id': pokestop_id, 'type': rnd.randint(1, 60), 'with_ar': rnd.random() < 0.5,
+                'latitude': latitude, 'longitude': longitude, 'title': 'quest_title', 'target': 3,
+                'rewards': [{'type': 2, 'info': {'item_id': 701, 'amount': 5}}],
+                'conditions': [{'type': 1, 'info': {'pokemon_type_ids': [12]}}],
+            }}
+        elif item_type == 'raid':
+            gym_id = f'gym{rnd.randint(0, 2000)}'
+            latitude, longitude = fort_locations.setdefault(gym_id, (latitude, longitude))
+            item = {'type': 'raid', 'message': {
+                'gym_id': gym_id, 'ex_raid_eligible': False, 'is_exclusive': False,
+                'level': rnd.choice([1, 3, 5]), 'pokemon_id': rnd.choice([0, 150, 384]), 'form': 0, 'costume': 0,
+                'latitude': latitude, 'longitude': longitude, 'move_1': 1, 'move_2': 2, 'cp': 40000,
+                'end': 1703956234 + rnd.randint(0, 96) * 900,
+            }}
+        else:
+            pokestop_id = f'stop{rnd.randint(0, 5000)}'
+            latitude, longitude = fort_locations.setdefault(pokestop_id, (latitude, longitude))
+            item = {'type': 'invasion', 'message': {
+                'pokestop_id': pokestop_id, 'display_type': 1, 'character': rnd.randint(4, 50),
+                'confirmed': rnd.random() < 0.5, 'latitude': latitude, 'longitude': longitude,
+                'incident_expire_timestamp': 1703956234 + rnd.randint(0, 96) * 900,
+            }}
+        items.append(item)
+    return items
+
+def synthesize_geofences(count, seed, bounds=DEFAULT_BOUNDS, vertices=16, coverage=0.9):
+    """Koji features that don't overlap, one irregular polygon inside each cell of a grid over bounds.
+
+    Coverage is the share of every cell the polygon reaches out to, the rest of the area is outside all fences.
+    """
+    rnd = random.Random(seed)
+    south, west, size = bounds
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    cell_width = size / columns
+    cell_height = size / rows
+    geofences = []
+    for index in range(count):
+        row, column = divmod(index, columns)
+        center_lat = south + (row + 0.5) * cell_height
+        center_lon = west + (column + 0.5) * cell_width
+        ring = []
+        for vertex in range(vertices):
+            angle = 2 * math.pi * vertex / vertices
+            reach = coverage * rnd.uniform(0.8, 1.0) / 2
+            ring.append([center_lon + math.cos(angle) * reach * cell_width, center_lat + math.sin(angle) * reach * cell_height])
+        ring.append(ring[0])
+        geofences.append({
+            'type': 'Feature',
+            'properties': {'name': f'Area{index}'},
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+        })
+    return geofences
@@ -1,4 +1,5 @@
 import json
+import os
 import urllib.parse
 
 class AppConfig:
@@ -15,18 +16,65 @@ class AppConfig:
         self.refresh_geofences = int(config['koji']['REFRESH_GEOFENCES'])
         self.max_tries_geofences = int(config['koji']['MAX_TRIES_GEOFENCES'])
         self.retry_delay_mult_geofences = int(config['koji']['RETRY_DELAY_MULT_GEOFENCES'])
+        self.geofence_snapshot = config['koji'].get('GEOFENCE_SNAPSHOT', '')
         self.allow_webhook_host = config['receiver']['ALLOW_WEBHOOK_HOST']
         self.receiver_host = config['receiver']['HOST']
         self.receiver_port = int(config['receiver']['PORT'])
         self.receiver_workers = int(config['receiver']['WORKERS'])
+        self.receiver_reuse_port = config['receiver'].get('REUSE_PORT', 'false').lower() == 'true'
+        self.receiver_shutdown_timeout = int(config['receiver'].get('SHUTDOWN_TIMEOUT', '60'))
         self.max_queue_size = int(config['receiver']['MAX_QUEUE_SIZE'])
         self.max_quest_queue_size = int(config['receiver']['MAX_QUEST_QUEUE_SIZE'])
         self.max_raid_queue_size = int(config['receiver']['MAX_RAID_QUEUE_SIZE'])
         self.max_invasion_queue_size = int(config['receiver']['MAX_INVASION_QUEUE_SIZE'])
         self.extra_flush_threshold = int(config['receiver']['EXTRA_FLUSH_THRESHOLD'])
         self.flush_interval = int(config['receiver']['EXTRA_FLUSH_INTERVAL'])
+        self.flush_check_interval = float(config['receiver'].get('FLUSH_CHECK_INTERVAL', '5'))
+        self.pokemon_max_age = int(config['receiver'].get('POKEMON_MAX_AGE', str(self.flush_interval)))
+        self.quest_max_age = int(config['receiver'].get('QUEST_MAX_AGE', '1800'))
+        self.raid_max_age = int(config['receiver'].get('RAID_MAX_AGE', '1800'))
+        self.invasion_max_age = int(config['receiver'].get('INVASION_MAX_AGE', '1800'))
+        self.geofence_grid_cell_size = float(config['receiver'].get('GEOFENCE_GRID_CELL_SIZE', '0.01'))
+        self.geofence_grid_max_cells = int(config['receiver'].get('GEOFENCE_GRID_MAX_CELLS', '1000000'))
+        self.area_memo_size = int(config['receiver'].get('AREA_MEMO_SIZE', '200000'))
+        self.area_memo_ttl = int(config['receiver'].get('AREA_MEMO_TTL', '3600'))
+        self.geofence_batch_lookup = config['receiver'].get('GEOFENCE_BATCH_LOOKUP', 'true').lower() == 'true'
+        self.stream_parse = config['receiver'].get('STREAM_PARSE', 'false').lower() == 'true'
+        self.stream_batch_size = int(config['receiver'].get('STREAM_BATCH_SIZE', '1000'))
+        self.stream_max_item_size = int(config['receiver'].get('STREAM_MAX_ITEM_SIZE', '1048576'))
+        self.pipeline = config['receiver'].get('PIPELINE', 'false').lower() == 'true'
+        self.pipeline_queue_size = int(config['receiver'].get('PIPELINE_QUEUE_SIZE', '64'))
+        self.process_workers = int(config['receiver'].get('PROCESS_WORKERS', '0'))
+        self.defer_classification = config['receiver'].get('DEFER_CLASSIFICATION', 'false').lower() == 'true'
+        self.pokemon_aggregation = config['receiver'].get('POKEMON_AGGREGATION', 'false').lower() == 'true'
+        self.pokemon_raw_storage = config['receiver'].get('POKEMON_RAW_STORAGE', 'true').lower() == 'true'
+        self.aggregation_flush_interval = float(config['receiver'].get('AGGREGATION_FLUSH_INTERVAL', '60'))
         self.max_retries = int(config['receiver']['MAX_RETRIES'])
         self.retry_delay = int(config['receiver']['RETRY_DELAY'])
+        self.publish_workers = int(config['receiver'].get('PUBLISH_WORKERS', '2'))
+        self.transport = config['receiver'].get('TRANSPORT', 'celery').lower()
+        self.spool = config['receiver'].get('SPOOL', 'false').lower() == 'true'
+        self.spool_dir = config['receiver'].get('SPOOL_DIR', 'spool')
+        self.spool_segment_size = int(config['receiver'].get('SPOOL_SEGMENT_SIZE', '67108864'))
+        self.spool_max_bytes = int(config['receiver'].get('SPOOL_MAX_BYTES', '1073741824'))
+        self.dedup = config['receiver'].get('DEDUP', 'false').lower() == 'true'
+        self.dedup_max_keys = int(config['receiver'].get('DEDUP_MAX_KEYS', '2000000'))
+        self.pokemon_dedup_ttl = int(config['receiver'].get('POKEMON_DEDUP_TTL', '3600'))
+        self.quest_dedup_ttl = int(config['receiver'].get('QUEST_DEDUP_TTL', '86400'))
+        self.raid_dedup_ttl = int(config['receiver'].get('RAID_DEDUP_TTL', '3600'))
+        self.invasion_dedup_ttl = int(config['receiver'].get('INVASION_DEDUP_TTL', '3600'))
+        self.pokemon_max_buffered = int(config['receiver'].get('POKEMON_MAX_BUFFERED', str(10 * self.max_queue_size)))
+        self.quest_max_buffered = int(config['receiver'].get('QUEST_MAX_BUFFERED', str(10 * self.max_quest_queue_size)))
+        self.raid_max_buffered = int(config['receiver'].get('RAID_MAX_BUFFERED', str(10 * self.max_raid_queue_size)))
+        self.invasion_max_buffered = int(config['receiver'].get('INVASION_MAX_BUFFERED', str(10 * self.max_invasion_queue_size)))
+        self.pokemon_max_buffered_bytes = int(config['receiver'].get('POKEMON_MAX_BUFFERED_BYTES', '0'))
+        self.quest_max_buffered_bytes = int(config['receiver'].get('QUEST_MAX_BUFFERED_BYTES', '0'))
+        self.raid_max_buffered_bytes = int(config['receiver'].get('RAID_MAX_BUFFERED_BYTES', '0'))
+        self.invasion_max_buffered_bytes = int(config['receiver'].get('INVASION_MAX_BUFFERED_BYTES', '0'))
+        self.max_buffered_bytes = int(config['receiver'].get('MAX_BUFFERED_BYTES', '536870912'))
+        self.shed_order = [record_type.strip() for record_type in config['receiver'].get('SHED_ORDER', 'pokemon,invasion,raid,quest').split(',') if record_type.strip()]
+        self.shed_start = float(config['receiver'].get('SHED_START', '0.7'))
+        self.retry_after = int(config['receiver'].get('RETRY_AFTER', '30'))
         self.webhook_console_log_level = config['receiver']['CONSOLE_LOG_LEVEL']
         self.webhook_log_level = config['receiver']['LOG_LEVEL']
         self.webhook_log_file = config['receiver']['LOG_FILE']
@@ -50,11 +98,17 @@ class AppConfig:
         self.celery_log_max_bytes = int(config['celery']['LOG_MAX_BYTES'])
         self.celery_max_log_files = int(config['celery']['MAX_LOG_FILES'])
         self.celery_workers = int(config['celery']['WORKERS'])
+        self.geofence_check_interval = int(config['celery'].get('GEOFENCE_CHECK_INTERVAL', '60'))
         self.redis_host = config['redis']['HOST']
         self.redis_port = int(config['redis']['PORT'])
         self.redis_db = config['redis']['DB']
         self.redis_url = f"redis://:{encoded_redis_password}@{config['redis']['HOST']}:{config['redis']['PORT']}/{config['redis']['DB']}"
         self.redis_clean = config['redis']['CLEAN'].lower() == 'true'
+        self.stream_max_len = int(config['redis'].get('STREAM_MAX_LEN', '0'))
+        self.stream_writer_name = config['redis'].get('STREAM_WRITER_NAME', '')
+        self.stream_writer_batch_size = int(config['redis'].get('STREAM_WRITER_BATCH_SIZE', '5000'))
+        self.stream_writer_max_wait = float(config['redis'].get('STREAM_WRITER_MAX_WAIT', '5'))
+        self.stream_writer_claim_idle = int(config['redis'].get('STREAM_WRITER_CLAIM_IDLE', '60'))
         self.api_log_level = config['api']['LOG_LEVEL']
         self.api_console_log_level = config['api']['CONSOLE_LOG_LEVEL']
         self.api_log_file = config['api']['LOG_FILE']
@@ -70,4 +124,5 @@ class AppConfig:
         self.api_header_name = config['api']['HEADER_NAME']
         self.api_path_restriction = config['api']['PATH_RESTRICTION'].lower() == 'true'
 
-app_config = AppConfig()
\ No newline at end of file
+# PSYDUCK_CONFIG points at another config file, the benchmarks use the example one
+app_config = AppConfig(os.environ.get('PSYDUCK_CONFIG', 'config/config.json'))
\ No newline at end of file
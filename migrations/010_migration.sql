@@ -0,0 +1,320 @@
+-- Pokemon counters aggregated by the receiver, bucket is the hour they were counted in
+-- and first_seen the unix time the first pokemon of a row was counted
+CREATE TABLE IF NOT EXISTS aggregated_pokemon_stats (
+    bucket DATETIME NOT NULL,
+    area_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+    pokemon_id INTEGER NOT NULL,
+    form VARCHAR(15) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+    total INT DEFAULT 0,
+    total_iv100 INT DEFAULT 0,
+    total_iv0 INT DEFAULT 0,
+    total_top1_little INT DEFAULT 0,
+    total_top1_great INT DEFAULT 0,
+    total_top1_ultra INT DEFAULT 0,
+    total_shiny INT DEFAULT 0,
+    sum_lat DOUBLE DEFAULT 0,
+    sum_lon DOUBLE DEFAULT 0,
+    sum_despawn BIGINT DEFAULT 0,
+    count_despawn INT DEFAULT 0,
+    tth_5 INT DEFAULT 0,
+    tth_10 INT DEFAULT 0,
+    tth_15 INT DEFAULT 0,
+    tth_20 INT DEFAULT 0,
+    tth_25 INT DEFAULT 0,
+    tth_30 INT DEFAULT 0,
+    tth_35 INT DEFAULT 0,
+    tth_40 INT DEFAULT 0,
+    tth_45 INT DEFAULT 0,
+    tth_50 INT DEFAULT 0,
+    tth_55 INT DEFAULT 0,
+    tth_55_plus INT DEFAULT 0,
+    first_seen INT UNSIGNED NOT NULL,
+    PRIMARY KEY (bucket, area_name, pokemon_id, form),
+    INDEX idx_first_seen (first_seen)
+) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- Aggregate flushes already added to the counters, a flush delivered again is skipped
+CREATE TABLE IF NOT EXISTS aggregated_pokemon_flushes (
+    unique_id VARCHAR(255) NOT NULL,
+    inserted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (unique_id),
+    INDEX idx_inserted_at (inserted_at)
+);
+
+-- Counters of a period by area, pokemon and form in temp_pokemon_stats.
+-- Every hour of an area counts its sightings until a receiver started to aggregate it, the aggregated counters from then on.
+-- Receivers aggregating with POKEMON_RAW_STORAGE still insert sightings, they would count twice otherwise
+DROP PROCEDURE IF EXISTS collect_pokemon_stats;
+CREATE PROCEDURE collect_pokemon_stats(IN period_start DATETIME, IN period_end DATETIME)
+BEGIN
+    DROP TEMPORARY TABLE IF EXISTS temp_pokemon_stats;
+
+    CREATE TEMPORARY TABLE temp_pokemon_stats AS
+    SELECT
+        area_name,
+        pokemon_id,
+        form,
+        SUM(total) AS total,
+        SUM(total_iv100) AS total_iv100,
+        SUM(total_iv0) AS total_iv0,
+        SUM(total_top1_little) AS total_top1_little,
+        SUM(total_top1_great) AS total_top1_great,
+        SUM(total_top1_ultra) AS total_top1_ultra,
+        SUM(total_shiny) AS total_shiny,
+        SUM(sum_lat) AS sum_lat,
+        SUM(sum_lon) AS sum_lon,
+        SUM(sum_despawn) AS sum_despawn,
+        SUM(count_despawn) AS count_despawn,
+        SUM(tth_5) AS tth_5,
+        SUM(tth_10) AS tth_10,
+        SUM(tth_15) AS tth_15,
+        SUM(tth_20) AS tth_20,
+        SUM(tth_25) AS tth_25,
+        SUM(tth_30) AS tth_30,
+        SUM(tth_35) AS tth_35,
+        SUM(tth_40) AS tth_40,
+        SUM(tth_45) AS tth_45,
+        SUM(tth_50) AS tth_50,
+        SUM(tth_55) AS tth_55,
+        SUM(tth_55_plus) AS tth_55_plus
+    FROM (
+        SELECT
+            area_name, pokemon_id, form, total, total_iv100, total_iv0, total_top1_little, total_top1_great,
+            total_top1_ultra, total_shiny, sum_lat, sum_lon, sum_despawn, count_despawn, tth_5, tth_10, tth_15,
+            tth_20, tth_25, tth_30, tth_35, tth_40, tth_45, tth_50, tth_55, tth_55_plus
+        FROM aggregated_pokemon_stats
+        WHERE bucket >= period_start AND bucket < period_end
+
+        UNION ALL
+
+        SELECT
+            area_name,
+            pokemon_id,
+            form,
+            COUNT(pokemon_id) AS total,
+            SUM(CASE WHEN iv = 100 THEN 1 ELSE 0 END) AS total_iv100,
+            SUM(CASE WHEN iv = 0 THEN 1 ELSE 0 END) AS total_iv0,
+            SUM(CASE WHEN pvp_little_rank = 1 THEN 1 ELSE 0 END) AS total_top1_little,
+            SUM(CASE WHEN pvp_great_rank = 1 THEN 1 ELSE 0 END) AS total_top1_great,
+            SUM(CASE WHEN pvp_ultra_rank = 1 THEN 1 ELSE 0 END) AS total_top1_ultra,
+            SUM(CASE WHEN shiny = 1 THEN 1 ELSE 0 END) AS total_shiny,
+            SUM(latitude) AS sum_lat,
+            SUM(longitude) AS sum_lon,
+            SUM(despawn_time) AS sum_despawn,
+            COUNT(despawn_time) AS count_despawn,
+            SUM(CASE WHEN despawn_time < 300 THEN 1 ELSE 0 END) AS tth_5,
+            SUM(CASE WHEN despawn_time >= 300 AND despawn_time < 600 THEN 1 ELSE 0 END) AS tth_10,
+            SUM(CASE WHEN despawn_time >= 600 AND despawn_time < 900 THEN 1 ELSE 0 END) AS tth_15,
+            SUM(CASE WHEN despawn_time >= 900 AND despawn_time < 1200 THEN 1 ELSE 0 END) AS tth_20,
+            SUM(CASE WHEN despawn_time >= 1200 AND despawn_time < 1500 THEN 1 ELSE 0 END) AS tth_25,
+            SUM(CASE WHEN despawn_time >= 1500 AND despawn_time < 1800 THEN 1 ELSE 0 END) AS tth_30,
+            SUM(CASE WHEN despawn_time >= 1800 AND despawn_time < 2100 THEN 1 ELSE 0 END) AS tth_35,
+            SUM(CASE WHEN despawn_time >= 2100 AND despawn_time < 2400 THEN 1 ELSE 0 END) AS tth_40,
+            SUM(CASE WHEN despawn_time >= 2400 AND despawn_time < 2700 THEN 1 ELSE 0 END) AS tth_45,
+            SUM(CASE WHEN despawn_time >= 2700 AND despawn_time < 3000 THEN 1 ELSE 0 END) AS tth_50,
+            SUM(CASE WHEN despawn_time >= 3000 AND despawn_time < 3300 THEN 1 ELSE 0 END) AS tth_55,
+            SUM(CASE WHEN despawn_time >= 3300 THEN 1 ELSE 0 END) AS tth_55_plus
+        FROM pokemon_sightings s
+        LEFT JOIN (
+            SELECT bucket, area_name AS aggregated_area, MIN(first_seen) AS aggregated_since
+            FROM aggregated_pokemon_stats
+            WHERE bucket >= period_start AND bucket < period_end
+            GROUP BY bucket, area_name
+        ) a ON a.aggregated_area = s.area_name AND a.bucket = DATE_FORMAT(s.inserted_at, '%Y-%m-%d %H:00:00')
+        WHERE s.inserted_at >= period_start AND s.inserted_at < period_end
+        AND (a.aggregated_since IS NULL OR UNIX_TIMESTAMP(s.inserted_at) < a.aggregated_since)
+        GROUP BY area_name, pokemon_id, form
+    ) AS sources
+    GROUP BY area_name, pokemon_id, form;
+END;
+
+-- Hourly surge
+DROP PROCEDURE IF EXISTS update_hourly_surge_stats;
+CREATE PROCEDURE update_hourly_surge_stats()
+BEGIN
+    CALL collect_pokemon_stats(DATE_FORMAT(NOW() - INTERVAL 1 HOUR, '%Y-%m-%d %H:00:00'), DATE_FORMAT(NOW(), '%Y-%m-%d %H:00:00'));
+
+    INSERT INTO hourly_surge_storage_pokemon_stats (hour, total_iv100, total_iv0, total_top1_little, total_top1_great, total_top1_ultra, total_shiny)
+    SELECT
+        STR_TO_DATE(DATE_FORMAT(NOW(), '%Y-%m-%d %H:00:00'), '%Y-%m-%d %H:%i:%s') AS hour,
+        NULLIF(SUM(total_iv100), 0) AS total_iv100,
+        NULLIF(SUM(total_iv0), 0) AS total_iv0,
+        NULLIF(SUM(total_top1_little), 0) AS total_top1_little,
+        NULLIF(SUM(total_top1_great), 0) AS total_top1_great,
+        NULLIF(SUM(total_top1_ultra), 0) AS total_top1_ultra,
+        NULLIF(SUM(total_shiny), 0) AS total_shiny
+    FROM temp_pokemon_stats
+    ON DUPLICATE KEY UPDATE
+        total_iv100 = VALUES(total_iv100),
+        total_iv0 = VALUES(total_iv0),
+        total_top1_little = VALUES(total_top1_little),
+        total_top1_great = VALUES(total_top1_great),
+        total_top1_ultra = VALUES(total_top1_ultra),
+        total_shiny = VALUES(total_shiny);
+
+    DROP TEMPORARY TABLE IF EXISTS temp_pokemon_stats;
+END;
+
+-- Hourly totals
+DROP PROCEDURE IF EXISTS update_hourly_total_stats;
+CREATE PROCEDURE update_hourly_total_stats()
+BEGIN
+    CALL collect_pokemon_stats(DATE_FORMAT(NOW() - INTERVAL 1 HOUR, '%Y-%m-%d %H:00:00'), DATE_FORMAT(NOW(), '%Y-%m-%d %H:00:00'));
+
+    CREATE TEMPORARY TABLE IF NOT EXISTS all_area_names AS
+    SELECT area_name FROM pokemon_sightings
+    UNION
+    SELECT area_name FROM aggregated_pokemon_stats;
+
+    REPLACE INTO hourly_total_api_pokemon_stats
+    SELECT
+        a.area_name,
+        COALESCE(t.total, 0) AS total,
+        NULLIF(t.total_iv100, 0) AS total_iv100,
+        NULLIF(t.total_iv0, 0) AS total_iv0,
+        NULLIF(t.total_top1_little, 0) AS total_top1_little,
+        NULLIF(t.total_top1_great, 0) AS total_top1_great,
+        NULLIF(t.total_top1_ultra, 0) AS total_top1_ultra,
+        NULLIF(t.total_shiny, 0) AS total_shiny,
+        t.sum_despawn / NULLIF(t.count_despawn, 0) AS avg_despawn
+    FROM all_area_names a
+    LEFT JOIN (
+        SELECT
+            area_name,
+            SUM(total) AS total,
+            SUM(total_iv100) AS total_iv100,
+            SUM(total_iv0) AS total_iv0,
+            SUM(total_top1_little) AS total_top1_little,
+            SUM(total_top1_great) AS total_top1_great,
+            SUM(total_top1_ultra) AS total_top1_ultra,
+            SUM(total_shiny) AS total_shiny,
+            SUM(sum_despawn) AS sum_despawn,
+            SUM(count_despawn) AS count_despawn
+        FROM temp_pokemon_stats
+        GROUP BY area_name
+    ) t ON a.area_name = t.area_name;
+
+    DROP TEMPORARY TABLE IF EXISTS temp_pokemon_stats;
+    DROP TEMPORARY TABLE IF EXISTS all_area_names;
+END;
+
+-- Hourly TTH storage
+DROP PROCEDURE IF EXISTS store_storage_hourly_pokemon_tth_stats;
+CREATE PROCEDURE store_storage_hourly_pokemon_tth_stats()
+BEGIN
+    CALL collect_pokemon_stats(DATE_FORMAT(NOW() - INTERVAL 1 HOUR, '%Y-%m-%d %H:00:00'), DATE_FORMAT(NOW(), '%Y-%m-%d %H:00:00'));
+
+    INSERT INTO storage_hourly_pokemon_tth_stats (`day_hour`, area_name, tth_5, tth_10, tth_15, tth_20, tth_25, tth_30, tth_35, tth_40, tth_45, tth_50, tth_55, tth_55_plus)
+    SELECT
+        STR_TO_DATE(DATE_FORMAT(NOW() - INTERVAL 1 HOUR, '%Y-%m-%d %H:00:00'), '%Y-%m-%d %H:%i:%s') AS `day_hour`,
+        area_name,
+        SUM(tth_5),
+        SUM(tth_10),
+        SUM(tth_15),
+        SUM(tth_20),
+        SUM(tth_25),
+        SUM(tth_30),
+        SUM(tth_35),
+        SUM(tth_40),
+        SUM(tth_45),
+        SUM(tth_50),
+        SUM(tth_55),
+        SUM(tth_55_plus)
+    FROM temp_pokemon_stats
+    GROUP BY area_name;
+
+    DROP TEMPORARY TABLE IF EXISTS temp_pokemon_stats;
+END;
+
+-- Daily grouped storage
+DROP PROCEDURE IF EXISTS store_daily_grouped_pokemon_stats;
+CREATE PROCEDURE store_daily_grouped_pokemon_stats()
+BEGIN
+    CALL collect_pokemon_stats(CURDATE() - INTERVAL 1 DAY, CURDATE());
+
+    INSERT INTO grouped_total_daily_pokemon_stats (day, pokemon_id, form, avg_lat, avg_lon, total, total_iv100, total_iv0, total_top1_little, total_top1_great, total_top1_ultra, total_shiny, area_name, avg_despawn)
+    SELECT
+        CURDATE() - INTERVAL 1 DAY AS day,
+        pokemon_id,
+        form,
+        sum_lat / total AS avg_lat,
+        sum_lon / total AS avg_lon,
+        total,
+        NULLIF(total_iv100, 0) AS total_iv100,
+        NULLIF(total_iv0, 0) AS total_iv0,
+        NULLIF(total_top1_little, 0) AS total_top1_little,
+        NULLIF(total_top1_great, 0) AS total_top1_great,
+        NULLIF(total_top1_ultra, 0) AS total_top1_ultra,
+        NULLIF(total_shiny, 0) AS total_shiny,
+        area_name,
+        sum_despawn / NULLIF(count_despawn, 0) AS avg_despawn
+    FROM temp_pokemon_stats
+    ORDER BY area_name, pokemon_id;
+
+    DROP TEMPORARY TABLE IF EXISTS temp_pokemon_stats;
+END;
+
+DROP EVENT IF EXISTS event_store_daily_grouped_stats;
+CREATE EVENT IF NOT EXISTS event_store_daily_grouped_stats
+ON SCHEDULE EVERY 1 DAY
+STARTS ADDDATE(CURDATE(), INTERVAL 1 DAY)
+DO
+CALL store_daily_grouped_pokemon_stats();
+
+-- Daily total storage
+DROP PROCEDURE IF EXISTS store_daily_total_pokemon_stats;
+CREATE PROCEDURE store_daily_total_pokemon_stats()
+BEGIN
+    CALL collect_pokemon_stats(CURDATE() - INTERVAL 1 DAY, CURDATE());
+
+    INSERT INTO daily_total_storage_pokemon_stats (day, area_name, total, total_iv100, total_iv0, total_top1_little, total_top1_great, total_top1_ultra, total_shiny, avg_despawn)
+    SELECT
+        CURDATE() - INTERVAL 1 DAY AS day,
+        area_name,
+        SUM(total) AS total,
+        SUM(total_iv100) AS total_iv100,
+        SUM(total_iv0) AS total_iv0,
+        SUM(total_top1_little) AS total_top1_little,
+        SUM(total_top1_great) AS total_top1_great,
+        SUM(total_top1_ultra) AS total_top1_ultra,
+        SUM(total_shiny) AS total_shiny,
+        SUM(sum_despawn) / NULLIF(SUM(count_despawn), 0) AS avg_despawn
+    FROM temp_pokemon_stats
+    GROUP BY area_name;
+
+    DROP TEMPORARY TABLE IF EXISTS temp_pokemon_stats;
+END;
+
+DROP EVENT IF EXISTS event_store_daily_total_api_stats;
+CREATE EVENT IF NOT EXISTS event_store_daily_total_api_stats
+ON SCHEDULE EVERY 1 DAY
+STARTS ADDDATE(CURDATE(), INTERVAL 1 DAY)
+DO
+CALL store_daily_total_pokemon_stats();
+
+-- Cleaning, same retention as the raw sightings
+DROP PROCEDURE IF EXISTS delete_aggregated_pokemon_stats_batches;
+CREATE PROCEDURE delete_aggregated_pokemon_stats_batches()
+BEGIN
+  DECLARE done INT DEFAULT FALSE;
+  DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+
+  WHILE NOT done DO
+    DELETE FROM aggregated_pokemon_stats
+    WHERE bucket < CURDATE() - INTERVAL 1 DAY
+    LIMIT 20000;
+
+    IF (ROW_COUNT() = 0) THEN
+      SET done = TRUE;
+    END IF;
+  END WHILE;
+
+  DELETE FROM aggregated_pokemon_flushes
+  WHERE inserted_at < CURDATE() - INTERVAL 1 DAY;
+END;
+
+CREATE EVENT IF NOT EXISTS clean_aggregated_pokemon_stats
+ON SCHEDULE EVERY 1 DAY
+STARTS ADDDATE(ADDDATE(CURDATE(), INTERVAL 1 DAY), INTERVAL '05:10:00' HOUR_SECOND)
+DO
+CALL delete_aggregated_pokemon_stats_batches();
@@ -0,0 +1,136 @@
+import base64
+import json
+import struct
+import zlib
+from array import array
+
+# Column order of the queued rows of every record type. Every row has its location,
+# insert workers classify the ones queued without an area
+RECORD_FIELDS = {
+    'pokemon': (
+        'pokemon_id', 'form', 'latitude', 'longitude', 'iv', 'pvp_great_rank', 'pvp_little_rank',
+        'pvp_ultra_rank', 'shiny', 'area_name', 'despawn_time'
+    ),
+    'quest': (
+        'pokestop_id', 'area_name', 'ar_type', 'normal_type', 'reward_ar_type', 'reward_normal_type',
+        'reward_ar_item_id', 'reward_ar_item_amount', 'reward_normal_item_id', 'reward_normal_item_amount',
+        'reward_ar_poke_id', 'reward_ar_poke_form', 'reward_normal_poke_id', 'reward_normal_poke_form',
+        'latitude', 'longitude'
+    ),
+    'raid': (
+        'gym_id', 'ex_raid_eligible', 'is_exclusive', 'level', 'pokemon_id', 'form', 'costume', 'area_name',
+        'latitude', 'longitude'
+    ),
+    'invasion': ('pokestop_id', 'display_type', 'character', 'confirmed', 'area_name', 'latitude', 'longitude'),
+}
+RECORD_TYPES = tuple(RECORD_FIELDS)
+# Trailing columns only needed to classify a row, batches leave them out when every row has an area
+LOCATION_FIELDS = ('latitude', 'longitude')
+
+# Counters of every (hour, area, pokemon_id, form) the receiver aggregates, in the column order of aggregated_pokemon_stats
+AGGREGATE_FIELDS = (
+    'total', 'total_iv100', 'total_iv0', 'total_top1_little', 'total_top1_great', 'total_top1_ultra', 'total_shiny',
+    'sum_lat', 'sum_lon', 'sum_despawn', 'count_despawn',
+    'tth_5', 'tth_10', 'tth_15', 'tth_20', 'tth_25', 'tth_30', 'tth_35', 'tth_40', 'tth_45', 'tth_50', 'tth_55', 'tth_55_plus'
+)
+
+BATCH_MAGIC = b'PSB1'
+BATCH_HEADER = struct.Struct('<4sBI')
+COLUMN_HEADER = struct.Struct('<cI')
+
+# Column kinds, anything that is not uniformly typed falls back to JSON
+INT_COLUMN = b'i'
+BOOL_COLUMN = b'b'
+FLOAT_COLUMN = b'f'
+STRING_COLUMN = b's'
+JSON_COLUMN = b'j'
+
+
+def record_from_row(record_type, row):
+    return dict(zip(RECORD_FIELDS[record_type], row))
+
+def column_kind(values):
+    kinds = {type(value) for value in values if value is not None}
+    if kinds == {bool}:
+        return BOOL_COLUMN
+    if kinds == {int} and all(value is None or -2 ** 63 <= value < 2 ** 63 for value in values):
+        return INT_COLUMN
+    if kinds == {float}:
+        return FLOAT_COLUMN
+    if kinds == {str}:
+        return STRING_COLUMN
+    if not kinds:
+        return INT_COLUMN
+    return JSON_COLUMN
+
+def encode_column(values):
+    kind = column_kind(values)
+    nulls = bytes(value is None for value in values)
+    if kind == JSON_COLUMN:
+        body = json.dumps(values, separators=(',', ':')).encode()
+    elif kind == STRING_COLUMN:
+        # Area names and ids repeat a lot, store each distinct string once
+        table = {}
+        indexes = array('I', (table.setdefault(value, len(table)) if value is not None else 0 for value in values))
+        strings = json.dumps(list(table), separators=(',', ':')).encode()
+        body = nulls + struct.pack('<I', len(strings)) + strings + indexes.tobytes()
+    else:
+        typecode = 'd' if kind == FLOAT_COLUMN else 'q'
+        body = nulls + array(typecode, (0 if value is None else value for value in values)).tobytes()
+    return COLUMN_HEADER.pack(kind, len(body)) + body
+
+def decode_column(kind, body, count):
+    if kind == JSON_COLUMN:
+        return json.loads(body)
+    nulls = body[:count]
+    body = body[count:]
+    if kind == STRING_COLUMN:
+        strings_size = struct.unpack_from('<I', body)[0]
+        strings = json.loads(body[4:4 + strings_size])
+        indexes = array('I')
+        indexes.frombytes(body[4 + strings_size:])
+        values = [strings[index] for index in indexes]
+    else:
+        values = array('d' if kind == FLOAT_COLUMN else 'q')
+        values.frombytes(body)
+        values = values.tolist()
+        if kind == BOOL_COLUMN:
+            values = [bool(value) for value in values]
+    return [None if is_null else value for value, is_null in zip(values, nulls)]
+
+def encode_batch(record_type, rows):
+    """Pack queued rows into a compact columnar payload, base64 text so it fits any Celery serializer."""
+    fields = RECORD_FIELDS[record_type]
+    columns = list(zip(*rows)) if rows else [()] * len(fields)
+    if fields[-len(LOCATION_FIELDS):] == LOCATION_FIELDS and None not in columns[fields.index('area_name')]:
+        columns = columns[:-len(LOCATION_FIELDS)]
+    raw = BATCH_HEADER.pack(BATCH_MAGIC, RECORD_TYPES.index(record_type), len(rows))
+    raw += b''.join(encode_column(list(column)) for column in columns)
+    return base64.b64encode(zlib.compress(raw, 1)).decode('ascii')
+
+def decode_batch(payload):
+    """Unpack a payload made by encode_batch into (record_type, rows)."""
+    raw = zlib.decompress(base64.b64decode(payload))
+    magic, type_index, count = BATCH_HEADER.unpack_from(raw)
+    if magic != BATCH_MAGIC:
+        raise ValueError("Not a Psyduck batch payload")
+    record_type = RECORD_TYPES[type_index]
+    offset = BATCH_HEADER.size
+    columns = []
+    for _ in RECORD_FIELDS[record_type]:
+        if offset >= len(raw):
+            # Batches of classified rows and of older receivers end before the location columns
+            columns.append([None] * count)
+            continue
+        kind, size = COLUMN_HEADER.unpack_from(raw, offset)
+        offset += COLUMN_HEADER.size
+        columns.append(decode_column(kind, raw[offset:offset + size], count))
+        offset += size
+    return record_type, list(zip(*columns)) if count else []
+
+def load_batch(data_batch):
+    """Records of a task batch, either a columnar payload or a plain list of record dicts."""
+    if isinstance(data_batch, str):
+        record_type, rows = decode_batch(data_batch)
+        return [record_from_row(record_type, row) for row in rows]
+    return data_batch
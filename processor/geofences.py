@@ -0,0 +1,65 @@
+import json
+import time
+import numpy as np
+from receiver.geofence_index import GeofenceIndex
+
+# Geofences the receiver publishes when classification is deferred to the insert workers
+GEOFENCES_KEY = 'psyduck:geofences'
+GEOFENCES_VERSION_KEY = 'psyduck:geofences:version'
+
+
+class GeofencesUnavailable(Exception):
+    """No geofences were published yet, deferred records can't be classified."""
+
+
+def publish_geofences(redis_client, geofences, version):
+    """Store the fences and their version for the insert workers in one transaction."""
+    pipeline = redis_client.pipeline(transaction=True)
+    pipeline.set(GEOFENCES_KEY, json.dumps({'version': version, 'geofences': geofences}, separators=(',', ':')))
+    pipeline.set(GEOFENCES_VERSION_KEY, version)
+    pipeline.execute()
+
+
+class WorkerGeofences:
+    """Geofence index of one worker process, rebuilt when the receiver publishes another version."""
+
+    def __init__(self, redis_client, check_interval=60, grid_cell_size=0.01, grid_max_cells=1000000):
+        self.redis_client = redis_client
+        self.check_interval = check_interval
+        self.grid_cell_size = grid_cell_size
+        self.grid_max_cells = grid_max_cells
+        self.geofence_index = None
+        self.version = None
+        self.last_check = None
+
+    # Only the version is read on every check, the fences when it changed
+    def current_index(self):
+        now = time.monotonic()
+        if self.geofence_index is None or self.last_check is None or now - self.last_check >= self.check_interval:
+            self.last_check = now
+            version = self.redis_client.get(GEOFENCES_VERSION_KEY)
+            if version is not None and version.decode() != self.version:
+                self.load()
+        if self.geofence_index is None:
+            raise GeofencesUnavailable("No geofences were published by the receiver")
+        return self.geofence_index
+
+    def load(self):
+        data = self.redis_client.get(GEOFENCES_KEY)
+        if data is None:
+            return
+        snapshot = json.loads(data)
+        self.geofence_index = GeofenceIndex(snapshot['geofences'], grid_cell_size=self.grid_cell_size, grid_max_cells=self.grid_max_cells)
+        self.version = snapshot['version']
+
+    def assign_areas(self, records):
+        """Fill in the area of the records queued without one, the ones outside every geofence are left out."""
+        unclassified = [record for record in records if record.get('area_name') is None]
+        if not unclassified:
+            return records
+        geofence_index = self.current_index()
+        lats = np.fromiter((record['latitude'] for record in unclassified), dtype=float, count=len(unclassified))
+        lons = np.fromiter((record['longitude'] for record in unclassified), dtype=float, count=len(unclassified))
+        for record, area_name in zip(unclassified, geofence_index.lookup_many(lats, lons)):
+            record['area_name'] = area_name
+        return [record for record in records if record['area_name'] is not None]
@@ -0,0 +1,112 @@
+from .batches import AGGREGATE_FIELDS
+
+# Insert statements of every record type and how a queued record maps onto their columns
+POKEMON_INSERT_QUERY = '''
+INSERT INTO pokemon_sightings (pokemon_id, form, latitude, longitude, iv,
+pvp_great_rank, pvp_little_rank, pvp_ultra_rank, shiny, area_name, despawn_time)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+QUEST_INSERT_QUERY = '''
+INSERT INTO quest_sightings (pokestop_id, ar_type, normal_type, reward_ar_type, reward_normal_type,
+reward_ar_item_id, reward_ar_item_amount, reward_normal_item_id, reward_normal_item_amount,
+reward_ar_poke_id, reward_ar_poke_form, reward_normal_poke_id, reward_normal_poke_form, area_name)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+RAID_INSERT_QUERY = '''
+INSERT INTO raid_sightings (gym_id, ex_raid_eligible, is_exclusive, level, pokemon_id, form, costume, area_name)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+INVASION_INSERT_QUERY = '''
+INSERT INTO invasion_sightings (pokestop_id, display_type, grunt, confirmed, area_name)
+VALUES (%s, %s, %s, %s, %s)
+'''
+
+# Aggregated counters are added to the stored ones, the bucket is the hour of the database time zone
+AGGREGATE_UPSERT_QUERY = f'''
+INSERT INTO aggregated_pokemon_stats (bucket, area_name, pokemon_id, form, {', '.join(AGGREGATE_FIELDS)}, first_seen)
+VALUES (%s, %s, %s, %s, {', '.join(['%s'] * len(AGGREGATE_FIELDS))}, %s)
+ON DUPLICATE KEY UPDATE {', '.join(f'{field} = {field} + VALUES({field})' for field in AGGREGATE_FIELDS)},
+first_seen = LEAST(first_seen, VALUES(first_seen))
+'''
+# Fails to add a row when the flush was already added, so the deltas of a redelivered task are skipped
+AGGREGATE_FLUSH_QUERY = 'INSERT IGNORE INTO aggregated_pokemon_flushes (unique_id) VALUES (%s)'
+# Hour of the database time zone a unix time falls in
+BUCKET_HOUR = "DATE_FORMAT(FROM_UNIXTIME(%s), '%%Y-%%m-%%d %%H:00:00')"
+
+def pokemon_values(data):
+    return (
+        data['pokemon_id'], data['form'], data['latitude'], data['longitude'],
+        data['iv'], data.get('pvp_great_rank'), data.get('pvp_little_rank'),
+        data.get('pvp_ultra_rank'), data['shiny'], data['area_name'],
+        data['despawn_time']
+    )
+
+def quest_values(data):
+    return (
+        data['pokestop_id'], data.get('ar_type', None), data.get('normal_type', None),
+        data.get('reward_ar_type', None), data.get('reward_normal_type', None),
+        data.get('reward_ar_item_id', None), data.get('reward_ar_item_amount', None),
+        data.get('reward_normal_item_id', None), data.get('reward_normal_item_amount', None),
+        data.get('reward_ar_poke_id', None), data.get('reward_ar_poke_form', None),
+        data.get('reward_normal_poke_id', None), data.get('reward_normal_poke_form', None),
+        data['area_name']
+    )
+
+def raid_values(data):
+    return (
+        data['gym_id'],
+        data['ex_raid_eligible'],
+        data['is_exclusive'],
+        data['level'],
+        data['pokemon_id'],
+        data.get('form', ''),
+        data.get('costume', ''),
+        data['area_name']
+    )
+
+def invasion_values(data):
+    return (
+        data['pokestop_id'],
+        data['display_type'],
+        data['character'],
+        data['confirmed'],
+        data.get('area_name', '')
+    )
+
+INSERTS = {
+    'pokemon': (POKEMON_INSERT_QUERY, pokemon_values),
+    'quest': (QUEST_INSERT_QUERY, quest_values),
+    'raid': (RAID_INSERT_QUERY, raid_values),
+    'invasion': (INVASION_INSERT_QUERY, invasion_values),
+}
+
+def insert_records(cursor, record_type, data_batch):
+    """Insert a batch of records of one type with a single multi-row statement, the caller commits."""
+    if not data_batch:
+        return 0
+    insert_query, values = INSERTS[record_type]
+    cursor.executemany(insert_query, [values(data) for data in data_batch])
+    return len(data_batch)
+
+# Converted by MySQL in one query, the upsert keeps plain values so its rows are still sent as one statement
+def bucket_hours(cursor, buckets):
+    buckets = sorted(set(buckets))
+    cursor.execute(f"SELECT {', '.join([BUCKET_HOUR] * len(buckets))}", buckets)
+    return dict(zip(buckets, cursor.fetchone()))
+
+def upsert_aggregates(cursor, deltas, unique_id):
+    """Add the deltas of (bucket, area_name, pokemon_id, form, *counters, first_seen) to the stored counters, once per unique_id.
+
+    Buckets are unix times, the counters are stored under the hour they fall in. The flush is recorded in the
+    same transaction, the caller commits. Returns None when it was already added.
+    """
+    if not cursor.execute(AGGREGATE_FLUSH_QUERY, (unique_id,)):
+        return None
+    if not deltas:
+        return 0
+    hours = bucket_hours(cursor, [delta[0] for delta in deltas])
+    cursor.executemany(AGGREGATE_UPSERT_QUERY, [(hours[delta[0]], *delta[1:]) for delta in deltas])
+    return len(deltas)
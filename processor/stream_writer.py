@@ -0,0 +1,259 @@
+import signal
+import time
+import zlib
+import pymysql
+import redis
+from pymysql.err import OperationalError, InterfaceError, MySQLError
+from processor.inserts import insert_records
+from processor.geofences import GeofencesUnavailable
+from processor.streams import STREAM_KEYS, STREAM_GROUP, WRITTEN_KEY, WRITTEN_TTL, decode_entry, entry_unique_id
+from processor.tasks import celery_logger
+
+STREAM_TYPES = {stream: record_type for record_type, stream in STREAM_KEYS.items()}
+
+
+class StreamWriter:
+    """Consumer group member that bulk inserts the Redis stream batches and acknowledges them after commit."""
+
+    def __init__(self, redis_client, db_config, consumer_name, batch_size=5000, max_wait=5, claim_idle=60, retry_delay=5, geofences=None):
+        self.redis_client = redis_client
+        # WorkerGeofences classifying the records queued without an area
+        self.geofences = geofences
+        self.db_config = db_config
+        self.consumer_name = consumer_name
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.claim_idle = claim_idle
+        self.retry_delay = retry_delay
+        self.conn = None
+        self.stopping = False
+        self.last_claim = 0
+        # Records per entry of the last read, so reads stop near batch_size records
+        self.entry_size = batch_size
+
+    def create_groups(self):
+        for stream in STREAM_KEYS.values():
+            try:
+                self.redis_client.xgroup_create(stream, STREAM_GROUP, id='0', mkstream=True)
+            except redis.ResponseError as e:
+                if 'BUSYGROUP' not in str(e):
+                    raise
+
+    def new_chunk(self):
+        return {stream: [] for stream in STREAM_KEYS.values()}
+
+    def entry_count(self, records):
+        return max(1, records // self.entry_size)
+
+    # Entries are decoded as they are read, the chunk holds their batch id and records
+    def add_entries(self, chunk, stream, entries):
+        unique_ids = [entry_unique_id(fields) for _, fields in entries]
+        written = self.written_batches(unique_ids)
+        seen = {unique_id for _, unique_id, _ in chunk[stream] if unique_id is not None}
+        added = 0
+        for (entry_id, fields), unique_id in zip(entries, unique_ids):
+            if unique_id is not None and (unique_id in written or unique_id in seen):
+                # Added twice by the receiver, acknowledged with the chunk without inserting it again
+                celery_logger.debug("Skipping stream entry %s of batch %s that is already inserted.", entry_id, unique_id)
+                chunk[stream].append((entry_id, unique_id, []))
+                continue
+            try:
+                records = decode_entry(fields)
+            except (ValueError, zlib.error) as e:
+                # Acknowledged with the chunk, it would fail the same way every time
+                celery_logger.error("Dropping stream entry %s that can't be decoded: %s", entry_id, e)
+                records = []
+            if unique_id is not None:
+                seen.add(unique_id)
+            chunk[stream].append((entry_id, unique_id, records))
+            added += len(records)
+        if entries:
+            self.entry_size = max(1, added // len(entries))
+        return added
+
+    def written_batches(self, unique_ids):
+        unique_ids = [unique_id for unique_id in unique_ids if unique_id is not None]
+        if not unique_ids:
+            return set()
+        found = self.redis_client.mget([WRITTEN_KEY % unique_id for unique_id in unique_ids])
+        return {unique_id for unique_id, value in zip(unique_ids, found) if value is not None}
+
+    def chunk_size(self, chunk):
+        return sum(len(records) for entries in chunk.values() for _, _, records in entries)
+
+    # Entries this consumer read before a restart but never acknowledged
+    def read_pending(self):
+        chunk = self.new_chunk()
+        response = self.redis_client.xreadgroup(STREAM_GROUP, self.consumer_name, {stream: '0' for stream in STREAM_KEYS.values()}, count=self.entry_count(self.batch_size))
+        for stream, entries in response or ():
+            self.add_entries(chunk, stream.decode(), entries)
+        return chunk
+
+    def claim_stream(self, stream):
+        min_idle_time = self.claim_idle * 1000
+        try:
+            return self.redis_client.xautoclaim(stream, STREAM_GROUP, self.consumer_name, min_idle_time, count=self.entry_count(self.batch_size))[1]
+        except redis.ResponseError:
+            # Redis before 6.2 has no XAUTOCLAIM
+            pending = self.redis_client.xpending_range(stream, STREAM_GROUP, min='-', max='+', count=self.entry_count(self.batch_size))
+            entry_ids = [entry['message_id'] for entry in pending if entry['time_since_delivered'] >= min_idle_time]
+            if not entry_ids:
+                return []
+            return self.redis_client.xclaim(stream, STREAM_GROUP, self.consumer_name, min_idle_time, entry_ids)
+
+    # Entries of consumers that stopped without acknowledging them
+    def claim_idle_entries(self, chunk):
+        claimed = 0
+        for stream in STREAM_KEYS.values():
+            claimed += self.add_entries(chunk, stream, self.claim_stream(stream))
+        if claimed:
+            celery_logger.info("Claimed %s idle stream records from other writers.", claimed)
+        return claimed
+
+    # Read until the chunk is full or max_wait seconds passed
+    def read_chunk(self):
+        chunk = self.new_chunk()
+        total = 0
+        if time.monotonic() - self.last_claim >= self.claim_idle:
+            self.last_claim = time.monotonic()
+            total += self.claim_idle_entries(chunk)
+
+        deadline = time.monotonic() + self.max_wait
+        while total < self.batch_size and not self.stopping:
+            block = int((deadline - time.monotonic()) * 1000)
+            if block <= 0:
+                break
+            response = self.redis_client.xreadgroup(STREAM_GROUP, self.consumer_name, {stream: '>' for stream in STREAM_KEYS.values()}, count=self.entry_count(self.batch_size - total), block=block)
+            for stream, entries in response or ():
+                total += self.add_entries(chunk, stream.decode(), entries)
+        return chunk
+
+    def connection(self):
+        if self.conn is None or not self.conn.open:
+            self.conn = pymysql.connect(**self.db_config)
+        else:
+            self.conn.ping(reconnect=True)
+        return self.conn
+
+    # Inserts the records of the entries in one transaction, rolled back when it fails
+    def insert_entries(self, conn, chunk):
+        inserted = {}
+        try:
+            with conn.cursor() as cursor:
+                for stream, entries in chunk.items():
+                    records = [record for _, _, entry_records in entries for record in entry_records]
+                    if self.geofences is not None:
+                        records = self.geofences.assign_areas(records)
+                    inserted[STREAM_TYPES[stream]] = insert_records(cursor, STREAM_TYPES[stream], records)
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except MySQLError:
+                pass
+            raise
+        return inserted
+
+    def write_chunk(self, chunk):
+        conn = self.connection()
+        try:
+            inserted = self.insert_entries(conn, chunk)
+        except (OperationalError, InterfaceError):
+            raise
+        except MySQLError as e:
+            celery_logger.warning("MySQL rejected a stream chunk of %s records, inserting each stream on its own: %s", self.chunk_size(chunk), e)
+            return self.write_streams(conn, chunk)
+        self.acknowledge(chunk)
+        return inserted
+
+    # Streams are committed and acknowledged one by one, a retry of the chunk skips those already done
+    def write_streams(self, conn, chunk):
+        inserted = {}
+        for stream, entries in chunk.items():
+            if not entries:
+                continue
+            try:
+                inserted.update(self.insert_entries(conn, {stream: entries}))
+            except (OperationalError, InterfaceError):
+                raise
+            except MySQLError:
+                inserted[STREAM_TYPES[stream]] = self.write_entries(conn, stream, entries)
+            else:
+                self.acknowledge({stream: entries})
+                chunk[stream] = []
+        return inserted
+
+    # Every entry in its own transaction, only the entries MySQL rejects are dropped
+    def write_entries(self, conn, stream, entries):
+        inserted = 0
+        while entries:
+            entry_id, unique_id, records = entries[0]
+            try:
+                inserted += self.insert_entries(conn, {stream: [entries[0]]})[STREAM_TYPES[stream]]
+            except (OperationalError, InterfaceError):
+                raise
+            except MySQLError as e:
+                # Retrying can't fix invalid data, drop the entry like a failed insert task would
+                celery_logger.error("Dropping stream entry %s of batch %s with %s records that MySQL rejected: %s", entry_id, unique_id, len(records), e)
+            self.acknowledge({stream: [entries[0]]})
+            del entries[0]
+        return inserted
+
+    # Only acknowledged once committed, a crash before this point replays the entries
+    def acknowledge(self, chunk):
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for stream, entries in chunk.items():
+            if entries:
+                entry_ids = [entry_id for entry_id, _, _ in entries]
+                for unique_id in {unique_id for _, unique_id, _ in entries if unique_id is not None}:
+                    pipeline.set(WRITTEN_KEY % unique_id, 1, ex=WRITTEN_TTL)
+                pipeline.xack(stream, STREAM_GROUP, *entry_ids)
+                pipeline.xdel(stream, *entry_ids)
+        pipeline.execute()
+
+    def stream_lengths(self):
+        return {record_type: self.redis_client.xlen(stream) for record_type, stream in STREAM_KEYS.items()}
+
+    def handle_signal(self, signum, frame):
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_signal)
+        signal.signal(signal.SIGINT, self.handle_signal)
+        self.create_groups()
+        celery_logger.info("Stream writer %s started.", self.consumer_name)
+
+        # Pending entries are read from the start until none are left, then only new ones
+        recovering = True
+        chunk = self.new_chunk()
+        while True:
+            if not any(chunk.values()):
+                if self.stopping:
+                    break
+                try:
+                    chunk = self.read_pending() if recovering else self.read_chunk()
+                except redis.RedisError as e:
+                    celery_logger.error("Failed to read from the Redis streams: %s", e)
+                    time.sleep(self.retry_delay)
+                    continue
+                if not any(chunk.values()):
+                    recovering = False
+                    continue
+
+            try:
+                inserted = self.write_chunk(chunk)
+            except (OperationalError, InterfaceError, redis.RedisError, GeofencesUnavailable) as e:
+                # Keep the same chunk and try again, it only lost the entries already committed and acknowledged
+                celery_logger.error("Failed to write stream chunk, retrying in %s seconds: %s", self.retry_delay, e)
+                self.conn = None
+                if self.stopping:
+                    # Still pending for this consumer, read again on the next start
+                    break
+                time.sleep(self.retry_delay)
+                continue
+            celery_logger.info("Inserted stream records %s, remaining in streams: %s", inserted, self.stream_lengths())
+            chunk = self.new_chunk()
+
+        if self.conn is not None and self.conn.open:
+            self.conn.close()
+        celery_logger.info("Stream writer %s stopped.", self.consumer_name)
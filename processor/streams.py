@@ -0,0 +1,58 @@
+import json
+from processor.batches import load_batch
+
+# One Redis stream per record type, read by the stream writers as a single consumer group
+STREAM_KEYS = {
+    'pokemon': 'psyduck:stream:pokemon',
+    'quest': 'psyduck:stream:quest',
+    'raid': 'psyduck:stream:raid',
+    'invasion': 'psyduck:stream:invasion',
+}
+STREAM_GROUP = 'psyduck_writers'
+# Entries hold one columnar batch each, entries of older receivers one JSON record
+BATCH_FIELD = b'b'
+RECORD_FIELD = b'r'
+# Batch id of the entry, a batch added again after a failed XADD reply is only inserted once
+UNIQUE_ID_FIELD = b'u'
+# Batch ids the stream writers inserted, kept long enough to outlast the receiver publish retries
+WRITTEN_KEY = 'psyduck:stream:written:%s'
+WRITTEN_TTL = 3600
+
+def decode_entry(fields):
+    """Records of a stream entry, entries deleted while pending come back without fields."""
+    if BATCH_FIELD in fields:
+        return load_batch(fields[BATCH_FIELD].decode('ascii'))
+    if RECORD_FIELD in fields:
+        return [json.loads(fields[RECORD_FIELD])]
+    return []
+
+def entry_unique_id(fields):
+    unique_id = fields.get(UNIQUE_ID_FIELD)
+    return unique_id.decode() if unique_id is not None else None
+
+
+class StreamProducer:
+    """Adds queued batches to the Redis stream of their type."""
+
+    def __init__(self, redis_client, max_len=0):
+        self.redis_client = redis_client
+        self.max_len = max_len or None
+
+    # The batch is added as the receiver encoded it, the stream writers decode it
+    def add(self, record_type, data_batch, unique_id):
+        fields = {BATCH_FIELD: data_batch, UNIQUE_ID_FIELD: unique_id}
+        self.redis_client.xadd(STREAM_KEYS[record_type], fields, maxlen=self.max_len, approximate=True)
+
+    def task(self, record_type):
+        return StreamTask(self, record_type)
+
+
+class StreamTask:
+    """Stands in for an insert task, so the receiver publishes to a stream the same way it calls delay()."""
+
+    def __init__(self, producer, record_type):
+        self.producer = producer
+        self.record_type = record_type
+
+    def delay(self, data_batch, unique_id):
+        self.producer.add(self.record_type, data_batch, unique_id)
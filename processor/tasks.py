@@ -1,48 +1,20 @@
 from .celery_app import celery
-import logging
-from logging.handlers import RotatingFileHandler
 from celery.utils.log import get_task_logger
 from config.app_config import app_config
 import pymysql
 from pymysql.err import OperationalError, ProgrammingError
-import os
-import hashlib
-import json
 import redis
 from datetime import datetime, date
+from .inserts import insert_records, upsert_aggregates
+from .batches import load_batch
+from .geofences import WorkerGeofences, GeofencesUnavailable
+from utils.logging_setup import setup_logging
 
-# Retrieve configuration values
-console_log_level_str = app_config.celery_console_log_level.upper()
-log_level_str = app_config.celery_log_level.upper()
-log_file = app_config.celery_log_file
-max_bytes = app_config.celery_log_max_bytes
-backup_count = app_config.celery_max_log_files
-
-# Celery logger
-celery_logger = get_task_logger(__name__)
-
-# Console logger setup
-if console_log_level_str == "OFF":
-    celery_logger.disabled = True
-else:
-    console_log_level = getattr(logging, console_log_level_str, logging.INFO)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(console_log_level)
-    console_formatter = logging.Formatter('[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
-    console_handler.setFormatter(console_formatter)
-    celery_logger.addHandler(console_handler)
-
-# File logger setup
-if log_level_str != "OFF":
-    log_level = getattr(logging, log_level_str, logging.INFO)
-    celery_logger.setLevel(log_level)
-    if not os.path.exists(os.path.dirname(log_file)):
-        os.makedirs(os.path.dirname(log_file))
-    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-    file_handler.setLevel(log_level)
-    file_formatter = logging.Formatter('[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
-    file_handler.setFormatter(file_formatter)
-    celery_logger.addHandler(file_handler)
+# Celery logger, its handlers run on a background thread
+celery_logger = setup_logging(
+    get_task_logger(__name__), app_config.celery_console_log_level, app_config.celery_log_level,
+    app_config.celery_log_file, app_config.celery_log_max_bytes, app_config.celery_max_log_files
+)
 
 # Database configuration
 db_config = {
@@ -55,17 +27,19 @@ db_config = {
 
 redis_client = redis.StrictRedis.from_url(app_config.redis_url)
 
-def generate_unique_id(data):
-    data_str = json.dumps(data, sort_keys=True)
-    return hashlib.md5(data_str.encode()).hexdigest()
+# Classifies the records a receiver with DEFER_CLASSIFICATION queued without an area
+worker_geofences = WorkerGeofences(
+    redis_client, app_config.geofence_check_interval,
+    app_config.geofence_grid_cell_size, app_config.geofence_grid_max_cells
+)
 
 # Pokemon Insert task
 @celery.task(bind=True, max_retries=app_config.max_retries)
 def insert_data_task(self, data_batch, unique_id):
-    celery_logger.debug(f"Pokemon Task received with unique_id: {unique_id}")
+    celery_logger.debug("Pokemon Task received with unique_id: %s", unique_id)
 
     if redis_client.get(unique_id):
-        celery_logger.debug(f"Duplicate Pokemon task skipped: {unique_id}")
+        celery_logger.debug("Duplicate Pokemon task skipped: %s", unique_id)
         return "Duplicate Pokemon task skipped"
 
     redis_client.set(unique_id, 'locked', ex=600)
@@ -74,35 +48,29 @@ def insert_data_task(self, data_batch, unique_id):
     try:
         conn = pymysql.connect(**db_config)
         cursor = conn.cursor()
-        celery_logger.debug(f"Inserting Pokemon data for unique_id: {unique_id}")
-
-        insert_query = '''
-        INSERT INTO pokemon_sightings (pokemon_id, form, latitude, longitude, iv,
-        pvp_great_rank, pvp_little_rank, pvp_ultra_rank, shiny, area_name, despawn_time)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        '''
-
-        for data in data_batch:
-            values = (
-                data['pokemon_id'], data['form'], data['latitude'], data['longitude'],
-                data['iv'], data.get('pvp_great_rank'), data.get('pvp_little_rank'),
-                data.get('pvp_ultra_rank'), data['shiny'], data['area_name'],
-                data['despawn_time']
-            )
-            cursor.execute(insert_query, values)
+        celery_logger.debug("Inserting Pokemon data for unique_id: %s", unique_id)
+        data_batch = worker_geofences.assign_areas(load_batch(data_batch))
+
+        insert_records(cursor, 'pokemon', data_batch)
         conn.commit()
         num_records = len(data_batch)
-        celery_logger.info(f"Successfully inserted {num_records} Pokemon records into the database for unique_id: {unique_id}")
+        celery_logger.info("Successfully inserted %s Pokemon records into the database for unique_id: %s", num_records, unique_id)
         return f"Inserted {num_records} Pokemon records"
     except OperationalError as error:
-        celery_logger.error(f"Failed to insert Pokemon record into MySQL table: {error}")
+        celery_logger.error("Failed to insert Pokemon record into MySQL table: %s", error)
         try:
             # Retry with exponential backoff
             retry_delay = app_config.retry_delay * (2 ** self.request.retries)
-            celery_logger.debug(f"Retrying Pokemon Insertion in {retry_delay} seconds...")
+            celery_logger.debug("Retrying Pokemon Insertion in %s seconds...", retry_delay)
             self.retry(countdown=retry_delay)
         except self.MaxRetriesExceededError:
             celery_logger.debug("Max Pokemon retries exceeded. Giving up.")
+    except GeofencesUnavailable as error:
+        celery_logger.warning("Unable to classify Pokemon records, retrying in %s seconds: %s", app_config.retry_delay, error)
+        try:
+            self.retry(countdown=app_config.retry_delay)
+        except self.MaxRetriesExceededError:
+            celery_logger.error("Max Pokemon retries exceeded, no geofences to classify with. Giving up.")
     finally:
         if conn is not None and conn.open:
             cursor.close()
@@ -112,10 +80,10 @@ def insert_data_task(self, data_batch, unique_id):
 # Quest Insert Task
 @celery.task(bind=True, max_retries=app_config.max_retries)
 def insert_quest_data_task(self, data_batch, unique_id):
-    celery_logger.debug(f"Quest Task received with unique_id: {unique_id}")
+    celery_logger.debug("Quest Task received with unique_id: %s", unique_id)
 
     if redis_client.get(unique_id):
-        celery_logger.debug(f"Duplicate Quest task skipped: {unique_id}")
+        celery_logger.debug("Duplicate Quest task skipped: %s", unique_id)
         return "Duplicate Quest task skipped"
 
     redis_client.set(unique_id, 'locked', ex=600)
@@ -124,39 +92,29 @@ def insert_quest_data_task(self, data_batch, unique_id):
     try:
         conn = pymysql.connect(**db_config)
         cursor = conn.cursor()
-        celery_logger.debug(f"Inserting Quest data for unique_id: {unique_id}")
-
-        insert_query = '''
-        INSERT INTO quest_sightings (pokestop_id, ar_type, normal_type, reward_ar_type, reward_normal_type,
-        reward_ar_item_id, reward_ar_item_amount, reward_normal_item_id, reward_normal_item_amount,
-        reward_ar_poke_id, reward_ar_poke_form, reward_normal_poke_id, reward_normal_poke_form, area_name)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        '''
-
-        for data in data_batch:
-            values = (
-                data['pokestop_id'], data.get('ar_type', None), data.get('normal_type', None),
-                data.get('reward_ar_type', None), data.get('reward_normal_type', None),
-                data.get('reward_ar_item_id', None), data.get('reward_ar_item_amount', None),
-                data.get('reward_normal_item_id', None), data.get('reward_normal_item_amount', None),
-                data.get('reward_ar_poke_id', None), data.get('reward_ar_poke_form', None),
-                data.get('reward_normal_poke_id', None), data.get('reward_normal_poke_form', None),
-                data['area_name']
-            )
-            cursor.execute(insert_query, values)
+        celery_logger.debug("Inserting Quest data for unique_id: %s", unique_id)
+        data_batch = worker_geofences.assign_areas(load_batch(data_batch))
+
+        insert_records(cursor, 'quest', data_batch)
         conn.commit()
         num_records = len(data_batch)
-        celery_logger.info(f"Successfully inserted {num_records} Quest records into the database for unique_id: {unique_id}")
+        celery_logger.info("Successfully inserted %s Quest records into the database for unique_id: %s", num_records, unique_id)
         return f"Inserted {num_records} Quest records"
     except OperationalError as error:
-        celery_logger.error(f"Failed to insert Quest record into MySQL table: {error}")
+        celery_logger.error("Failed to insert Quest record into MySQL table: %s", error)
         try:
             # Retry with exponential backoff
             retry_delay = app_config.retry_delay * (2 ** self.request.retries)
-            celery_logger.debug(f"Retrying Quest Insertion in {retry_delay} seconds...")
+            celery_logger.debug("Retrying Quest Insertion in %s seconds...", retry_delay)
             self.retry(countdown=retry_delay)
         except self.MaxRetriesExceededError:
             celery_logger.debug("Max Quest retries exceeded. Giving up.")
+    except GeofencesUnavailable as error:
+        celery_logger.warning("Unable to classify Quest records, retrying in %s seconds: %s", app_config.retry_delay, error)
+        try:
+            self.retry(countdown=app_config.retry_delay)
+        except self.MaxRetriesExceededError:
+            celery_logger.error("Max Quest retries exceeded, no geofences to classify with. Giving up.")
     finally:
         if conn is not None and conn.open:
             cursor.close()
@@ -166,10 +124,10 @@ def insert_quest_data_task(self, data_batch, unique_id):
 # Raid Insert Task
 @celery.task(bind=True, max_retries=app_config.max_retries)
 def insert_raid_data_task(self, data_batch, unique_id):
-    celery_logger.debug(f"Raid Task received with unique_id: {unique_id}")
+    celery_logger.debug("Raid Task received with unique_id: %s", unique_id)
 
     if redis_client.get(unique_id):
-        celery_logger.debug(f"Duplicate Raid task skipped: {unique_id}")
+        celery_logger.debug("Duplicate Raid task skipped: %s", unique_id)
         return "Duplicate Raid task skipped"
 
     redis_client.set(unique_id, 'locked', ex=600)
@@ -178,38 +136,29 @@ def insert_raid_data_task(self, data_batch, unique_id):
     try:
         conn = pymysql.connect(**db_config)
         cursor = conn.cursor()
-        celery_logger.debug(f"Inserting Raid data for unique_id: {unique_id}")
-
-        insert_query = '''
-        INSERT INTO raid_sightings (gym_id, ex_raid_eligible, is_exclusive, level, pokemon_id, form, costume, area_name)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        '''
-
-        for data in data_batch:
-            values = (
-                data['gym_id'],
-                data['ex_raid_eligible'],
-                data['is_exclusive'],
-                data['level'],
-                data['pokemon_id'],
-                data.get('form', ''),
-                data.get('costume', ''),
-                data['area_name']
-            )
-            cursor.execute(insert_query, values)
+        celery_logger.debug("Inserting Raid data for unique_id: %s", unique_id)
+        data_batch = worker_geofences.assign_areas(load_batch(data_batch))
+
+        insert_records(cursor, 'raid', data_batch)
         conn.commit()
         num_records = len(data_batch)
-        celery_logger.info(f"Successfully inserted {num_records} Raid records into the database for unique_id: {unique_id}")
+        celery_logger.info("Successfully inserted %s Raid records into the database for unique_id: %s", num_records, unique_id)
         return f"Inserted {num_records} Raid records"
     except OperationalError as error:
-        celery_logger.error(f"Failed to insert Raid record into MySQL table: {error}")
+        celery_logger.error("Failed to insert Raid record into MySQL table: %s", error)
         try:
             # Retry with exponential backoff
             retry_delay = app_config.retry_delay * (2 ** self.request.retries)
-            celery_logger.debug(f"Retrying Raid Insertion in {retry_delay} seconds...")
+            celery_logger.debug("Retrying Raid Insertion in %s seconds...", retry_delay)
             self.retry(countdown=retry_delay)
         except self.MaxRetriesExceededError:
             celery_logger.debug("Max Raid retries exceeded. Giving up.")
+    except GeofencesUnavailable as error:
+        celery_logger.warning("Unable to classify Raid records, retrying in %s seconds: %s", app_config.retry_delay, error)
+        try:
+            self.retry(countdown=app_config.retry_delay)
+        except self.MaxRetriesExceededError:
+            celery_logger.error("Max Raid retries exceeded, no geofences to classify with. Giving up.")
     finally:
         if conn is not None and conn.open:
             cursor.close()
@@ -219,10 +168,10 @@ def insert_raid_data_task(self, data_batch, unique_id):
 # Invasion Insert Task
 @celery.task(bind=True, max_retries=app_config.max_retries)
 def insert_invasion_data_task(self, data_batch, unique_id):
-    celery_logger.debug(f"Invasion Task received with unique_id: {unique_id}")
+    celery_logger.debug("Invasion Task received with unique_id: %s", unique_id)
 
     if redis_client.get(unique_id):
-        celery_logger.debug(f"Duplicate Invasion task skipped: {unique_id}")
+        celery_logger.debug("Duplicate Invasion task skipped: %s", unique_id)
         return "Duplicate Invasion task skipped"
 
     redis_client.set(unique_id, 'locked', ex=600)
@@ -231,35 +180,68 @@ def insert_invasion_data_task(self, data_batch, unique_id):
     try:
         conn = pymysql.connect(**db_config)
         cursor = conn.cursor()
-        celery_logger.debug(f"Inserting Invasion data for unique_id: {unique_id}")
-
-        insert_query = '''
-        INSERT INTO invasion_sightings (pokestop_id, display_type, grunt, confirmed, area_name)
-        VALUES (%s, %s, %s, %s, %s)
-        '''
-
-        for data in data_batch:
-            values = (
-                data['pokestop_id'],
-                data['display_type'],
-                data['character'],
-                data['confirmed'],
-                data.get('area_name', '')
-            )
-            cursor.execute(insert_query, values)
+        celery_logger.debug("Inserting Invasion data for unique_id: %s", unique_id)
+        data_batch = worker_geofences.assign_areas(load_batch(data_batch))
+
+        insert_records(cursor, 'invasion', data_batch)
         conn.commit()
         num_records = len(data_batch)
-        celery_logger.info(f"Successfully inserted {num_records} Invasion records into the database for unique_id: {unique_id}")
+        celery_logger.info("Successfully inserted %s Invasion records into the database for unique_id: %s", num_records, unique_id)
         return f"Inserted {num_records} Invasion records"
     except OperationalError as error:
-        celery_logger.error(f"Failed to insert Invasion record into MySQL table: {error}")
+        celery_logger.error("Failed to insert Invasion record into MySQL table: %s", error)
         try:
             # Retry with exponential backoff
             retry_delay = app_config.retry_delay * (2 ** self.request.retries)
-            celery_logger.debug(f"Retrying Invasion Insertion in {retry_delay} seconds...")
+            celery_logger.debug("Retrying Invasion Insertion in %s seconds...", retry_delay)
             self.retry(countdown=retry_delay)
         except self.MaxRetriesExceededError:
             celery_logger.debug("Max Invasion retries exceeded. Giving up.")
+    except GeofencesUnavailable as error:
+        celery_logger.warning("Unable to classify Invasion records, retrying in %s seconds: %s", app_config.retry_delay, error)
+        try:
+            self.retry(countdown=app_config.retry_delay)
+        except self.MaxRetriesExceededError:
+            celery_logger.error("Max Invasion retries exceeded, no geofences to classify with. Giving up.")
+    finally:
+        if conn is not None and conn.open:
+            cursor.close()
+            conn.close()
+        redis_client.delete(unique_id)
+
+# Pokemon Aggregates Upsert Task
+@celery.task(bind=True, max_retries=app_config.max_retries)
+def upsert_aggregates_task(self, deltas, unique_id):
+    celery_logger.debug("Pokemon Aggregates Task received with unique_id: %s", unique_id)
+
+    if redis_client.get(unique_id):
+        celery_logger.debug("Duplicate Pokemon Aggregates task skipped: %s", unique_id)
+        return "Duplicate Pokemon Aggregates task skipped"
+
+    redis_client.set(unique_id, 'locked', ex=600)
+
+    conn = None
+    try:
+        conn = pymysql.connect(**db_config)
+        cursor = conn.cursor()
+        celery_logger.debug("Upserting Pokemon aggregates for unique_id: %s", unique_id)
+
+        num_rows = upsert_aggregates(cursor, deltas, unique_id)
+        conn.commit()
+        if num_rows is None:
+            celery_logger.debug("Pokemon aggregates already upserted, skipped: %s", unique_id)
+            return "Pokemon aggregates already upserted"
+        celery_logger.info("Successfully upserted %s Pokemon aggregate rows into the database for unique_id: %s", num_rows, unique_id)
+        return f"Upserted {num_rows} Pokemon aggregate rows"
+    except OperationalError as error:
+        celery_logger.error("Failed to upsert Pokemon aggregates into MySQL table: %s", error)
+        try:
+            # Retry with exponential backoff
+            retry_delay = app_config.retry_delay * (2 ** self.request.retries)
+            celery_logger.debug("Retrying Pokemon Aggregates Upsert in %s seconds...", retry_delay)
+            self.retry(countdown=retry_delay)
+        except self.MaxRetriesExceededError:
+            celery_logger.debug("Max Pokemon Aggregates retries exceeded. Giving up.")
     finally:
         if conn is not None and conn.open:
             cursor.close()
@@ -274,7 +256,7 @@ def execute_query(query, params=None):
         cursor.execute(query, params or ())
         return cursor.fetchall()
     except OperationalError as err:
-        celery_logger.error(f"Database query error: {err}")
+        celery_logger.error("Database query error: %s", err)
         raise
     finally:
         if conn and conn.open:
@@ -0,0 +1,49 @@
+class AdmissionController:
+    """Decides which record types the receiver still accepts, from what its buffers hold."""
+
+    def __init__(self, buffers, limits, max_bytes=0, shed_order=(), shed_start=0.7, retry_after=30):
+        # buffers: record type to BatchBuffer, limits: record type to (max records, max bytes), 0 is no limit
+        self.buffers = buffers
+        self.limits = limits
+        self.max_bytes = max_bytes
+        self.retry_after = retry_after
+        # Lowest priority first, each type is shed at a higher share of max_bytes than the one before it
+        shed_order = [record_type for record_type in shed_order if record_type in buffers]
+        shed_order += [record_type for record_type in buffers if record_type not in shed_order]
+        steps = max(len(shed_order) - 1, 1)
+        self.shed_thresholds = {
+            record_type: max_bytes * (shed_start + (1 - shed_start) * position / steps)
+            for position, record_type in enumerate(shed_order)
+        }
+        self.shed_counts = {record_type: 0 for record_type in buffers}
+        self.rejected_counts = {}
+
+    def over_limit(self, record_type):
+        max_records, max_bytes = self.limits.get(record_type, (0, 0))
+        records, nbytes = self.buffers[record_type].buffered()
+        return (max_records and records >= max_records) or (max_bytes and nbytes >= max_bytes)
+
+    def shed_types(self):
+        """Record types that are dropped right now."""
+        shed = {record_type for record_type in self.buffers if self.over_limit(record_type)}
+        if self.max_bytes:
+            total_bytes = sum(buffer.buffered()[1] for buffer in self.buffers.values())
+            shed.update(record_type for record_type, threshold in self.shed_thresholds.items() if total_bytes >= threshold)
+        return shed
+
+    # Nothing would be accepted, so the request is refused before its body is read
+    def rejects_all(self, shed_types):
+        return len(shed_types) == len(self.buffers)
+
+    def record_shed(self, record_type, count=1):
+        self.shed_counts[record_type] += count
+
+    def record_rejected(self, status_code):
+        self.rejected_counts[status_code] = self.rejected_counts.get(status_code, 0) + 1
+
+    def stats(self):
+        return {
+            'shed_types': sorted(self.shed_types()),
+            'shed': dict(self.shed_counts),
+            'rejected': dict(self.rejected_counts),
+        }
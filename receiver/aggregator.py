@@ -0,0 +1,68 @@
+import time
+from processor.batches import AGGREGATE_FIELDS
+
+# Quarter hours of unix time, each falls inside one hour of any time zone. The workers store them under
+# the hour of the database time zone, so they line up with the hours of the raw sightings
+BUCKET_SECONDS = 900
+# Five minute steps of time to hide, the last one takes everything above 55 minutes
+TTH_STEP = 300
+TTH_FIRST = AGGREGATE_FIELDS.index('tth_5')
+TTH_LAST = AGGREGATE_FIELDS.index('tth_55_plus')
+
+
+class PokemonAggregator:
+    """Rolling counters of the queued pokemon, handed out as deltas that are added to the stored ones.
+
+    Pokemon count in the quarter hour they are added, a flush or a retry after it doesn't move them to the next one.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        # Unix time every counter was started, the stats use the earliest to tell from when sightings are aggregated
+        self.first_seen = {}
+        self.aggregated = 0
+
+    def __len__(self):
+        return len(self.counters)
+
+    # rows are in RECORD_FIELDS order
+    def add(self, rows, now=None):
+        counters = self.counters
+        now = int(time.time() if now is None else now)
+        bucket = now // BUCKET_SECONDS * BUCKET_SECONDS
+        for pokemon_id, form, latitude, longitude, iv, great, little, ultra, shiny, area_name, despawn_time in rows:
+            key = (bucket, area_name, pokemon_id, str(form))
+            counts = counters.get(key)
+            if counts is None:
+                counts = counters[key] = [0] * len(AGGREGATE_FIELDS)
+                self.first_seen[key] = now
+            counts[0] += 1
+            if iv == 100:
+                counts[1] += 1
+            elif iv == 0:
+                counts[2] += 1
+            if little == 1:
+                counts[3] += 1
+            if great == 1:
+                counts[4] += 1
+            if ultra == 1:
+                counts[5] += 1
+            if shiny:
+                counts[6] += 1
+            counts[7] += latitude
+            counts[8] += longitude
+            if despawn_time is not None:
+                counts[9] += despawn_time
+                counts[10] += 1
+                counts[min(TTH_FIRST + int(max(despawn_time, 0) // TTH_STEP), TTH_LAST)] += 1
+        self.aggregated += len(rows)
+
+    def pop_deltas(self):
+        """Rows of (bucket, area_name, pokemon_id, form, *counters, first_seen) since the last call, the counters start over."""
+        deltas = [[*key] + counts + [self.first_seen[key]] for key, counts in self.counters.items()]
+        self.counters = {}
+        self.first_seen = {}
+        return deltas
+
+    def stats(self):
+        return {'keys': len(self.counters), 'aggregated': self.aggregated}
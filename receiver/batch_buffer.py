@@ -0,0 +1,102 @@
+import os
+import socket
+import sys
+import time
+from collections import deque
+from itertools import count
+
+# Identifies this receiver process in batch ids, the start time keeps a reused pid from clashing
+INSTANCE_ID = f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+
+# Rows of one type are about the same size, only one in SIZE_SAMPLE appended rows is measured
+SIZE_SAMPLE = 64
+
+# Approximate in-memory size of a queued row and its values
+def record_size(record):
+    return sys.getsizeof(record) + sum(map(sys.getsizeof, record))
+
+
+class BatchBuffer:
+    """FIFO of queued rows of one record type with O(1) appends and O(batch) pops of full batches."""
+
+    def __init__(self, record_type, batch_size):
+        self.record_type = record_type
+        self.batch_size = batch_size
+        self.entries = deque()
+        # Monotonic id of every appended record, a batch is identified by the ids it holds
+        self.record_ids = count()
+        # Popped batches still held by the publisher
+        self.in_flight = 0
+        # Estimated size of one row, from the sampled ones
+        self.record_bytes = 0
+
+    @property
+    def nbytes(self):
+        return int(len(self.entries) * self.record_bytes)
+
+    @property
+    def in_flight_bytes(self):
+        return int(self.in_flight * self.record_bytes)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # seq is the spool sequence number of the record, None when spooling is disabled
+    def append(self, record, seq=None):
+        record_id = next(self.record_ids)
+        if record_id % SIZE_SAMPLE == 0:
+            self.sample_size(record)
+        self.entries.append((record, record_id, time.monotonic(), seq))
+
+    # Moving average, follows rows getting bigger or smaller within a few samples
+    def sample_size(self, record):
+        size = record_size(record)
+        self.record_bytes = (self.record_bytes * 3 + size) / 4 if self.record_bytes else size
+
+    def is_full(self):
+        return len(self.entries) >= self.batch_size
+
+    def pop_batch(self, size=None):
+        size = min(size or self.batch_size, len(self.entries))
+        popleft = self.entries.popleft
+        batch_data = []
+        batch_ids = []
+        batch_seqs = []
+        for _ in range(size):
+            record, record_id, enqueued_at, seq = popleft()
+            batch_data.append(record)
+            batch_ids.append(record_id)
+            batch_seqs.append(seq)
+        self.in_flight += size
+        return batch_data, batch_ids, batch_seqs
+
+    # A popped batch was published and is no longer held in memory
+    def release(self, batch_data):
+        self.in_flight -= len(batch_data)
+
+    # Stays the same when a requeued batch is popped again, so the insert tasks still skip duplicates
+    def batch_id(self, batch_ids):
+        return f"{INSTANCE_ID}:{self.record_type}:{batch_ids[0]}-{batch_ids[-1]}"
+
+    # Put a batch that could not be published back in front of the queue, its age restarts
+    def requeue(self, batch_data, batch_ids, batch_seqs):
+        enqueued_at = time.monotonic()
+        for record, record_id, seq in zip(reversed(batch_data), reversed(batch_ids), reversed(batch_seqs)):
+            self.entries.appendleft((record, record_id, enqueued_at, seq))
+        self.in_flight -= len(batch_data)
+
+    # Seconds the oldest queued record has been waiting
+    def oldest_age(self):
+        if not self.entries:
+            return 0.0
+        return time.monotonic() - self.entries[0][2]
+
+    # Records and bytes held in memory, queued or being published
+    def buffered(self):
+        return len(self.entries) + self.in_flight, self.nbytes + self.in_flight_bytes
+
+    def stats(self):
+        return {
+            'size': len(self.entries), 'bytes': self.nbytes, 'oldest_age': self.oldest_age(),
+            'in_flight': self.in_flight, 'in_flight_bytes': self.in_flight_bytes,
+        }
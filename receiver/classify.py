@@ -0,0 +1,82 @@
+import time
+import numpy as np
+from processor.batches import RECORD_FIELDS
+from receiver.decoders import ROW_BUILDERS
+
+AREA_INDEXES = {record_type: fields.index('area_name') for record_type, fields in RECORD_FIELDS.items()}
+
+
+def is_inside_geofence(lat, lon, geofence_index):
+    return geofence_index.lookup(lat, lon)
+
+# Stable location of a message, None when it can move
+def area_memo_key(item_type, decoded):
+    if item_type == 'pokemon':
+        location_id = decoded.spawnpoint_id
+        location_type = 'spawnpoint'
+    elif item_type == 'raid':
+        location_id = decoded.gym_id
+        location_type = 'gym'
+    else:
+        location_id = decoded.pokestop_id
+        location_type = 'pokestop'
+    if not location_id or location_id == 'None':
+        return None
+    return (location_type, location_id)
+
+# Assign an area to every message at once, None when outside all geofences. Without an area_memo every
+# message is looked up. observe_lookup gets the seconds spent in the geofence index, when it was needed
+def classify_messages(pending_messages, geofence_index, area_memo, batch_lookup=True, observe_lookup=None):
+    geofence_names = [None] * len(pending_messages)
+    memo_keys = []
+    lookup_indexes = []
+    for index, (item_type, decoded) in enumerate(pending_messages):
+        memo_key = area_memo_key(item_type, decoded) if area_memo is not None else None
+        if memo_key is not None and memo_key in area_memo:
+            geofence_names[index] = area_memo[memo_key]
+        else:
+            memo_keys.append(memo_key)
+            lookup_indexes.append(index)
+
+    if not lookup_indexes:
+        return geofence_names
+
+    lookup_started = time.perf_counter()
+    lats = np.fromiter((pending_messages[index][1].latitude for index in lookup_indexes), dtype=float, count=len(lookup_indexes))
+    lons = np.fromiter((pending_messages[index][1].longitude for index in lookup_indexes), dtype=float, count=len(lookup_indexes))
+    if batch_lookup:
+        looked_up_names = geofence_index.lookup_many(lats, lons)
+    else:
+        looked_up_names = [is_inside_geofence(lat, lon, geofence_index)[1] for lat, lon in zip(lats, lons)]
+    if observe_lookup is not None:
+        observe_lookup(time.perf_counter() - lookup_started)
+
+    for index, memo_key, geofence_name in zip(lookup_indexes, memo_keys, looked_up_names):
+        geofence_names[index] = geofence_name
+        if memo_key is not None:
+            area_memo[memo_key] = geofence_name
+    return geofence_names
+
+# Records of the messages inside a geofence by record type, with how many of every type were outside
+def build_records(pending_messages, geofence_names):
+    queued_records = {'pokemon': [], 'quest': [], 'raid': [], 'invasion': []}
+    outside_counts = {'pokemon': 0, 'quest': 0, 'raid': 0, 'invasion': 0}
+    for (item_type, decoded), geofence_name in zip(pending_messages, geofence_names):
+        if geofence_name is None:
+            outside_counts[item_type] += 1
+            continue
+        # Records carry no id of their own, batches are identified when they are published
+        queued_records[item_type].append(ROW_BUILDERS[item_type](decoded, geofence_name))
+    return queued_records, outside_counts
+
+# Records of every message without an area, the insert workers classify them before the insert
+def build_unclassified_records(pending_messages):
+    queued_records = {'pokemon': [], 'quest': [], 'raid': [], 'invasion': []}
+    for item_type, decoded in pending_messages:
+        queued_records[item_type].append(ROW_BUILDERS[item_type](decoded, None))
+    return queued_records
+
+# Same row with another area
+def with_area(item_type, row, area_name):
+    index = AREA_INDEXES[item_type]
+    return row[:index] + (area_name,) + row[index + 1:]
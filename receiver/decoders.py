@@ -0,0 +1,210 @@
+from collections import namedtuple
+from processor.batches import record_from_row
+
+# Compact decoded messages, only the fields Psyduck stores plus what is needed to classify them
+PokemonMessage = namedtuple('PokemonMessage', [
+    'pokemon_id', 'form', 'latitude', 'longitude', 'iv', 'pvp_great_rank', 'pvp_little_rank',
+    'pvp_ultra_rank', 'shiny', 'despawn_time', 'spawnpoint_id', 'encounter_id'
+])
+QuestMessage = namedtuple('QuestMessage', [
+    'pokestop_id', 'ar_type', 'normal_type', 'reward_ar_type', 'reward_normal_type',
+    'reward_ar_item_id', 'reward_ar_item_amount', 'reward_normal_item_id', 'reward_normal_item_amount',
+    'reward_ar_poke_id', 'reward_ar_poke_form', 'reward_normal_poke_id', 'reward_normal_poke_form',
+    'latitude', 'longitude', 'updated'
+])
+RaidMessage = namedtuple('RaidMessage', [
+    'gym_id', 'ex_raid_eligible', 'is_exclusive', 'level', 'pokemon_id', 'form', 'costume',
+    'latitude', 'longitude', 'end'
+])
+InvasionMessage = namedtuple('InvasionMessage', [
+    'pokestop_id', 'display_type', 'character', 'confirmed', 'latitude', 'longitude', 'incident_expire_timestamp'
+])
+
+
+def is_coordinate(value):
+    return type(value) is float or type(value) is int
+
+def calculate_despawn_time(disappear_time, first_seen):
+    if disappear_time is None or first_seen is None:
+        return None
+    time_diff = disappear_time - first_seen
+    total_seconds = time_diff // 1
+    return total_seconds
+
+def has_rank_one(pvp_data, category):
+    for entry in pvp_data.get(category) or ():
+        if entry.get('rank') == 1:
+            return 1
+    return None
+
+# Pokémon decoder
+def decode_pokemon(message):
+    get = message.get
+    pokemon_id = get('pokemon_id')
+    form = get('form')
+    latitude = get('latitude')
+    longitude = get('longitude')
+    ind_attack = get('individual_attack')
+    ind_defense = get('individual_defense')
+    ind_stamina = get('individual_stamina')
+    if (pokemon_id is None or form is None or ind_attack is None or ind_defense is None or ind_stamina is None
+            or not is_coordinate(latitude) or not is_coordinate(longitude)):
+        return None
+
+    if ind_attack == ind_defense == ind_stamina == 15:
+        iv_value = 100
+    elif ind_attack == ind_defense == ind_stamina == 0:
+        iv_value = 0
+    else:
+        iv_value = None
+
+    pvp_data = get('pvp')
+    if pvp_data:
+        pvp_great_rank = has_rank_one(pvp_data, 'great')
+        pvp_little_rank = has_rank_one(pvp_data, 'little')
+        pvp_ultra_rank = has_rank_one(pvp_data, 'ultra')
+    else:
+        pvp_great_rank = pvp_little_rank = pvp_ultra_rank = None
+
+    return PokemonMessage(
+        pokemon_id, form, latitude, longitude, iv_value, pvp_great_rank, pvp_little_rank, pvp_ultra_rank,
+        get('shiny'), calculate_despawn_time(get('disappear_time'), get('first_seen')), get('spawnpoint_id'),
+        get('encounter_id')
+    )
+
+# Quest decoder
+def decode_quest(message):
+    # Check for mandatory fields: type, with_ar, latitude, and longitude
+    if 'type' not in message or 'with_ar' not in message:
+        return None
+    latitude = message.get('latitude')
+    longitude = message.get('longitude')
+    if not is_coordinate(latitude) or not is_coordinate(longitude):
+        return None
+
+    rewards = message.get('rewards')
+    if not isinstance(rewards, list) or not rewards:
+        return None
+    for reward in rewards:
+        # Each reward must have a type and an info dictionary
+        if not isinstance(reward, dict) or 'type' not in reward or not isinstance(reward.get('info'), dict):
+            return None
+        info = reward['info']
+        # Each info must have either pokemon_id or an amount (items and stardust)
+        if 'pokemon_id' not in info and 'amount' not in info:
+            return None
+
+    # Only the first reward is stored, missing values are stored as NULL
+    reward = rewards[0]
+    info = reward['info']
+    quest_type = message.get('type')
+    if message.get('with_ar'):
+        return QuestMessage(
+            message.get('pokestop_id'), quest_type, None, reward.get('type'), None,
+            info.get('item_id'), info.get('amount'), None, None,
+            info.get('pokemon_id'), info.get('form_id'), None, None,
+            latitude, longitude, message.get('updated')
+        )
+    return QuestMessage(
+        message.get('pokestop_id'), None, quest_type, None, reward.get('type'),
+        None, None, info.get('item_id'), info.get('amount'),
+        None, None, info.get('pokemon_id'), info.get('form_id'),
+        latitude, longitude, message.get('updated')
+    )
+
+# Raid decoder
+def decode_raid(message):
+    get = message.get
+    gym_id = get('gym_id')
+    ex_raid_eligible = get('ex_raid_eligible')
+    is_exclusive = get('is_exclusive')
+    level = get('level')
+    pokemon_id = get('pokemon_id')
+    form = get('form')
+    costume = get('costume')
+    latitude = get('latitude')
+    longitude = get('longitude')
+    if (gym_id is None or ex_raid_eligible is None or is_exclusive is None or level is None
+            or pokemon_id in (None, 0) or form is None or costume is None
+            or not is_coordinate(latitude) or not is_coordinate(longitude)):
+        return None
+    return RaidMessage(gym_id, ex_raid_eligible, is_exclusive, level, pokemon_id, form, costume, latitude, longitude, get('end'))
+
+# Invasion decoder
+def decode_invasion(message):
+    get = message.get
+    pokestop_id = get('pokestop_id')
+    display_type = get('display_type')
+    character = get('character')
+    confirmed = get('confirmed')
+    latitude = get('latitude')
+    longitude = get('longitude')
+    if (pokestop_id is None or display_type is None or character is None or confirmed is None
+            or not is_coordinate(latitude) or not is_coordinate(longitude)):
+        return None
+    return InvasionMessage(pokestop_id, display_type, character, confirmed, latitude, longitude, get('incident_expire_timestamp'))
+
+# Pokémon row, in RECORD_FIELDS order
+def build_pokemon_row(decoded, geofence_name):
+    return (
+        decoded.pokemon_id, decoded.form, decoded.latitude, decoded.longitude, decoded.iv,
+        decoded.pvp_great_rank, decoded.pvp_little_rank, decoded.pvp_ultra_rank, decoded.shiny,
+        geofence_name, decoded.despawn_time
+    )
+
+# Quest row
+def build_quest_row(decoded, geofence_name):
+    return (
+        decoded.pokestop_id, geofence_name, decoded.ar_type, decoded.normal_type,
+        decoded.reward_ar_type, decoded.reward_normal_type, decoded.reward_ar_item_id,
+        decoded.reward_ar_item_amount, decoded.reward_normal_item_id, decoded.reward_normal_item_amount,
+        decoded.reward_ar_poke_id, decoded.reward_ar_poke_form, decoded.reward_normal_poke_id,
+        decoded.reward_normal_poke_form, decoded.latitude, decoded.longitude
+    )
+
+# Raid row
+def build_raid_row(decoded, geofence_name):
+    return (
+        decoded.gym_id, decoded.ex_raid_eligible, decoded.is_exclusive, decoded.level,
+        decoded.pokemon_id, decoded.form, decoded.costume, geofence_name, decoded.latitude, decoded.longitude
+    )
+
+# Invasion row
+def build_invasion_row(decoded, geofence_name):
+    return (
+        decoded.pokestop_id, decoded.display_type, decoded.character, decoded.confirmed, geofence_name,
+        decoded.latitude, decoded.longitude
+    )
+
+# Record dicts, as the insert tasks receive them
+def build_pokemon_data(decoded, geofence_name):
+    return record_from_row('pokemon', build_pokemon_row(decoded, geofence_name))
+
+def build_quest_data(decoded, geofence_name):
+    return record_from_row('quest', build_quest_row(decoded, geofence_name))
+
+def build_raid_data(decoded, geofence_name):
+    return record_from_row('raid', build_raid_row(decoded, geofence_name))
+
+def build_invasion_data(decoded, geofence_name):
+    return record_from_row('invasion', build_invasion_row(decoded, geofence_name))
+
+ROW_BUILDERS = {
+    'pokemon': build_pokemon_row,
+    'quest': build_quest_row,
+    'raid': build_raid_row,
+    'invasion': build_invasion_row,
+}
+
+DECODERS = {
+    'pokemon': decode_pokemon,
+    'quest': decode_quest,
+    'raid': decode_raid,
+    'invasion': decode_invasion,
+}
+
+def decode_message(item_type, message):
+    """Decode and validate a webhook message, None when it does not meet the filter criteria."""
+    if not isinstance(message, dict):
+        return None
+    return DECODERS[item_type](message)
@@ -0,0 +1,77 @@
+import time
+from datetime import date
+
+
+# Local calendar day of a quest, quests reset at midnight
+def quest_day(updated):
+    if type(updated) is not int and type(updated) is not float:
+        updated = time.time()
+    return date.fromtimestamp(updated).toordinal()
+
+# What makes a message a repeat of one already received, None when it can't be told apart
+def dedup_key(item_type, decoded):
+    if item_type == 'pokemon':
+        if decoded.encounter_id is None:
+            return None
+        return (decoded.encounter_id,)
+    if item_type == 'raid':
+        if decoded.end is None:
+            return None
+        return (decoded.gym_id, decoded.end)
+    if item_type == 'quest':
+        if decoded.pokestop_id is None:
+            return None
+        # AR and non AR quests of a pokestop are different quests
+        return (decoded.pokestop_id, decoded.ar_type is not None, quest_day(decoded.updated))
+    if item_type == 'invasion':
+        if decoded.incident_expire_timestamp is None:
+            return None
+        return (decoded.pokestop_id, decoded.incident_expire_timestamp)
+    return None
+
+
+class DedupFilter:
+    """Time bounded set of recently seen keys, kept as two rotating generations."""
+
+    def __init__(self, ttl, max_keys=1000000):
+        self.ttl = ttl
+        # Each generation holds half, so at most max_keys keys are remembered
+        self.generation_size = max(1, max_keys // 2)
+        self.current = set()
+        self.previous = set()
+        self.rotated_at = time.monotonic()
+        self.checked = 0
+        self.dropped = 0
+
+    # Keys are remembered for at least ttl seconds, unless the filter is full before that
+    def rotate(self):
+        self.previous = self.current
+        self.current = set()
+        self.rotated_at = time.monotonic()
+
+    def seen(self, key):
+        """Remember key and tell whether it was already seen."""
+        self.checked += 1
+        if key in self.current:
+            self.dropped += 1
+            return True
+        if key in self.previous:
+            # Still repeated, carry it over so it outlives the next rotation
+            self.current.add(key)
+            self.dropped += 1
+            return True
+        if len(self.current) >= self.generation_size or time.monotonic() - self.rotated_at >= self.ttl:
+            self.rotate()
+        self.current.add(key)
+        return False
+
+    def __len__(self):
+        return len(self.current) + len(self.previous)
+
+    def stats(self):
+        return {
+            'checked': self.checked,
+            'dropped': self.dropped,
+            'ratio': self.dropped / self.checked if self.checked else 0.0,
+            'keys': len(self),
+        }
@@ -0,0 +1,180 @@
+import logging
+import math
+import numpy as np
+import shapely
+from shapely.geometry import Point, Polygon
+from shapely.prepared import prep
+from shapely.strtree import STRtree
+
+logger = logging.getLogger("webhook_logger")
+
+# Grid cell states, fence indexes are used for cells fully inside a fence
+GRID_OUTSIDE = -2
+GRID_BOUNDARY = -1
+# Packs (x, y) cell coordinates into a single int64 key
+GRID_KEY_OFFSET = 2 ** 31
+GRID_KEY_SHIFT = 2 ** 32
+# Order of the counts returned by grid_hits
+GRID_HIT_KINDS = ('inside', 'outside', 'boundary')
+
+
+class GeofenceIndex:
+    """Prebuilt spatial index over the Koji geofences."""
+
+    def __init__(self, geofences, grid_cell_size=0, grid_max_cells=1000000):
+        self.names = []
+        self.polygons = []
+        self.prepared = []
+
+        for geofence in geofences:
+            geofence_name = geofence.get("properties", {}).get("name", "Unknown")
+            try:
+                polygon = Polygon(geofence["geometry"]["coordinates"][0])
+            except Exception as e:
+                logger.error("Error processing polygon for geofence %s, Error: %s", geofence_name, e)
+                continue
+            self.names.append(geofence_name)
+            self.polygons.append(polygon)
+            self.prepared.append(prep(polygon))
+
+        # Bounding box tree, candidates are confirmed against the prepared polygons
+        self.polygon_array = np.array(self.polygons, dtype=object)
+        shapely.prepare(self.polygon_array)
+        self.tree = STRtree(self.polygon_array)
+
+        # Grid covering, only boundary cells need an exact polygon test
+        self.grid_cell_size = grid_cell_size
+        self.grid_cells = {}
+        self.grid_keys = np.empty(0, dtype=np.int64)
+        self.grid_states = np.empty(0, dtype=np.int64)
+        self.grid_inside_hits = 0
+        self.grid_outside_hits = 0
+        self.grid_boundary_hits = 0
+        if grid_cell_size > 0 and self.polygons:
+            self.build_grid(grid_max_cells)
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def grid_cell_count(self, size):
+        cell_count = 0
+        for polygon in self.polygons:
+            min_x, min_y, max_x, max_y = polygon.bounds
+            cell_count += (math.floor(max_x / size) - math.floor(min_x / size) + 1) * (math.floor(max_y / size) - math.floor(min_y / size) + 1)
+        return cell_count
+
+    def build_grid(self, max_cells):
+        # Coarsen the grid until the fence bounding boxes fit in the cell budget
+        size = self.grid_cell_size
+        while self.grid_cell_count(size) > max_cells:
+            size *= 2
+        if size != self.grid_cell_size:
+            logger.warning("Geofence grid cell size %s exceeds %s cells, using %s instead.", self.grid_cell_size, max_cells, size)
+            self.grid_cell_size = size
+
+        for fence_index, polygon in enumerate(self.polygons):
+            min_x, min_y, max_x, max_y = polygon.bounds
+            cells_x = np.arange(math.floor(min_x / size), math.floor(max_x / size) + 1, dtype=np.int64)
+            cells_y = np.arange(math.floor(min_y / size), math.floor(max_y / size) + 1, dtype=np.int64)
+            grid_x, grid_y = np.meshgrid(cells_x, cells_y)
+            grid_x = grid_x.ravel()
+            grid_y = grid_y.ravel()
+            boxes = shapely.box(grid_x * size, grid_y * size, (grid_x + 1) * size, (grid_y + 1) * size)
+            inside = shapely.contains_properly(polygon, boxes)
+            touching = shapely.intersects(polygon, boxes)
+
+            keys = grid_x * GRID_KEY_SHIFT + grid_y + GRID_KEY_OFFSET
+            for key, cell_inside in zip(keys[touching].tolist(), inside[touching].tolist()):
+                # An earlier fence already owns or shares this cell
+                if key not in self.grid_cells:
+                    self.grid_cells[key] = fence_index if cell_inside else GRID_BOUNDARY
+
+        self.grid_keys = np.fromiter(sorted(self.grid_cells), dtype=np.int64, count=len(self.grid_cells))
+        self.grid_states = np.fromiter((self.grid_cells[key] for key in self.grid_keys.tolist()), dtype=np.int64, count=len(self.grid_keys))
+        boundary_cells = int(np.count_nonzero(self.grid_states == GRID_BOUNDARY))
+        logger.info("Built geofence grid with cell size %s: %s inside cells, %s boundary cells.", size, len(self.grid_keys) - boundary_cells, boundary_cells)
+
+    def grid_stats(self):
+        total = self.grid_inside_hits + self.grid_outside_hits + self.grid_boundary_hits
+        return {
+            'cell_size': self.grid_cell_size,
+            'cells': len(self.grid_keys),
+            'inside_hits': self.grid_inside_hits,
+            'outside_hits': self.grid_outside_hits,
+            'boundary_hits': self.grid_boundary_hits,
+            'hit_rate': (self.grid_inside_hits + self.grid_outside_hits) / total if total else 0.0,
+        }
+
+    # Lookups answered so far by each kind of grid cell, callers count the difference around their lookups
+    def grid_hits(self):
+        return self.grid_inside_hits, self.grid_outside_hits, self.grid_boundary_hits
+
+    def lookup(self, lat, lon):
+        if self.grid_cell_size > 0:
+            key = math.floor(lon / self.grid_cell_size) * GRID_KEY_SHIFT + math.floor(lat / self.grid_cell_size) + GRID_KEY_OFFSET
+            state = self.grid_cells.get(key, GRID_OUTSIDE)
+            if state == GRID_OUTSIDE:
+                self.grid_outside_hits += 1
+                return False, None
+            if state != GRID_BOUNDARY:
+                self.grid_inside_hits += 1
+                return True, self.names[state]
+            self.grid_boundary_hits += 1
+
+        point = Point(lon, lat)
+        # Keep Koji order so overlapping fences resolve to the same area as before
+        for index in sorted(self.tree.query(point)):
+            try:
+                if self.prepared[index].contains(point):
+                    return True, self.names[index]
+            except Exception as e:
+                logger.error("Error processing polygon for geofence %s, Error: %s", self.names[index], e)
+        return False, None
+
+    def lookup_many(self, lats, lons):
+        if not len(lats) or not self.polygons:
+            return [None] * len(lats)
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        if self.grid_cell_size <= 0 or not len(self.grid_keys):
+            return self.query_many(lats, lons)
+
+        keys = np.floor(lons / self.grid_cell_size).astype(np.int64) * GRID_KEY_SHIFT + np.floor(lats / self.grid_cell_size).astype(np.int64) + GRID_KEY_OFFSET
+        positions = np.minimum(np.searchsorted(self.grid_keys, keys), len(self.grid_keys) - 1)
+        states = np.where(self.grid_keys[positions] == keys, self.grid_states[positions], GRID_OUTSIDE)
+
+        inside = np.flatnonzero(states >= 0)
+        boundary = np.flatnonzero(states == GRID_BOUNDARY)
+        self.grid_inside_hits += len(inside)
+        self.grid_boundary_hits += len(boundary)
+        self.grid_outside_hits += len(states) - len(inside) - len(boundary)
+
+        areas = [None] * len(lats)
+        for point_index, fence_index in zip(inside.tolist(), states[inside].tolist()):
+            areas[point_index] = self.names[fence_index]
+        if len(boundary):
+            for point_index, area in zip(boundary.tolist(), self.query_many(lats[boundary], lons[boundary])):
+                areas[point_index] = area
+        return areas
+
+    def query_many(self, lats, lons):
+        areas = [None] * len(lats)
+        try:
+            # Bounding box candidates, then one prepared contains test per candidate pair
+            point_indices, fence_indices = self.tree.query(shapely.points(lons, lats))
+            inside = shapely.contains_xy(self.polygon_array[fence_indices], lons[point_indices], lats[point_indices])
+            point_indices = point_indices[inside]
+            fence_indices = fence_indices[inside]
+        except Exception as e:
+            logger.error("Batch geofence lookup failed, falling back to single lookups. Error: %s", e)
+            return [self.lookup(lat, lon)[1] for lat, lon in zip(lats.tolist(), lons.tolist())]
+
+        # First fence in Koji order wins for every point
+        order = np.lexsort((fence_indices, point_indices))
+        point_indices = point_indices[order]
+        fence_indices = fence_indices[order]
+        first = np.ones(len(point_indices), dtype=bool)
+        first[1:] = point_indices[1:] != point_indices[:-1]
+        for point_index, fence_index in zip(point_indices[first].tolist(), fence_indices[first].tolist()):
+            areas[point_index] = self.names[fence_index]
+        return areas
@@ -0,0 +1,41 @@
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger("webhook_logger")
+
+
+def geofence_version(geofences):
+    """Hash of a geofence feature list, the same fences always give the same version."""
+    return hashlib.sha1(json.dumps(geofences, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+def save_snapshot(path, geofences, version):
+    """Write the fences to path, readers see either the previous or the new file and never a partial one."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Every receiver process writes its own temporary file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as snapshot_file:
+        json.dump({'version': version, 'geofences': geofences}, snapshot_file, separators=(',', ':'))
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(tmp_path, path)
+
+def load_snapshot(path):
+    """Returns (geofences, version) of the last saved fences, None when there is no usable snapshot."""
+    try:
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        geofences = snapshot['geofences']
+        version = snapshot['version']
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error("Ignoring unreadable geofence snapshot %s: %s", path, e)
+        return None
+    if geofence_version(geofences) != version:
+        logger.error("Ignoring geofence snapshot %s, its content does not match its version.", path)
+        return None
+    return geofences, version
@@ -0,0 +1,131 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import uvicorn
+
+logger = logging.getLogger("webhook_logger")
+
+# Set inside every worker process, None when the receiver runs as a single process
+worker_state = None
+
+
+class WorkerState:
+    """Memory shared between the receiver workers and the process that started them."""
+
+    def __init__(self, worker_id, buffered_counts, flush_generation):
+        self.worker_id = worker_id
+        self.buffered_counts = buffered_counts
+        self.flush_generation = flush_generation
+        self.seen_generation = flush_generation.value
+
+    def report_buffered(self, buffered):
+        self.buffered_counts[self.worker_id] = buffered
+
+    def total_buffered(self):
+        return sum(self.buffered_counts[:])
+
+    # True once per flush the parent requested for every worker
+    def flush_requested(self):
+        generation = self.flush_generation.value
+        if generation == self.seen_generation:
+            return False
+        self.seen_generation = generation
+        return True
+
+
+def bind_reuseport_socket(host, port):
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+# Stop gracefully when the parent went away without stopping this worker
+def watch_parent(parent_pid):
+    while os.getppid() == parent_pid:
+        time.sleep(1)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+def run_worker(worker_id, host, port, buffered_counts, flush_generation):
+    global worker_state
+    # Own session, so a Ctrl+C on the terminal only reaches the parent which then stops workers once
+    os.setsid()
+    threading.Thread(target=watch_parent, args=(os.getppid(),), daemon=True).start()
+    worker_state = WorkerState(worker_id, buffered_counts, flush_generation)
+    # Each worker binds its own socket, the kernel balances connections between them
+    sock = bind_reuseport_socket(host, port)
+    config = uvicorn.Config("receiver.webhookparser:webhook_processor", host=host, port=port)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class ReceiverSupervisor:
+    """Starts N receiver processes on one port and coordinates their flushing and shutdown."""
+
+    def __init__(self, workers, host, port, flush_threshold, check_interval=5, shutdown_timeout=60):
+        self.context = multiprocessing.get_context("spawn")
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.flush_threshold = flush_threshold
+        self.check_interval = check_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.buffered_counts = self.context.Array('q', workers)
+        self.flush_generation = self.context.Value('q', 0)
+        self.processes = {}
+        self.stopping = False
+
+    def start_worker(self, worker_id):
+        process = self.context.Process(
+            target=run_worker,
+            args=(worker_id, self.host, self.port, self.buffered_counts, self.flush_generation),
+            name=f"receiver-worker-{worker_id}",
+        )
+        process.start()
+        self.processes[worker_id] = process
+        logger.info("Started receiver worker %s with pid %s.", worker_id, process.pid)
+
+    def handle_signal(self, signum, frame):
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_signal)
+        signal.signal(signal.SIGINT, self.handle_signal)
+        for worker_id in range(self.workers):
+            self.start_worker(worker_id)
+
+        while not self.stopping:
+            time.sleep(self.check_interval)
+            # Workers flush together once the buffers of all of them add up to the threshold
+            total_buffered = sum(self.buffered_counts[:])
+            if total_buffered >= self.flush_threshold:
+                with self.flush_generation.get_lock():
+                    self.flush_generation.value += 1
+                logger.info("Requesting a flush from every worker, %s records buffered in total.", total_buffered)
+            for worker_id, process in list(self.processes.items()):
+                if not process.is_alive() and not self.stopping:
+                    logger.error("Receiver worker %s exited with code %s, restarting it.", worker_id, process.exitcode)
+                    self.buffered_counts[worker_id] = 0
+                    self.start_worker(worker_id)
+
+        self.shutdown()
+
+    # Every worker drains its own queues in its shutdown event before exiting
+    def shutdown(self):
+        logger.info("Stopping receiver workers.")
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.shutdown_timeout
+        for worker_id, process in self.processes.items():
+            process.join(max(0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.error("Receiver worker %s did not drain within %s seconds, killing it.", worker_id, self.shutdown_timeout)
+                process.kill()
+                process.join()
+        logger.info("All receiver workers stopped.")
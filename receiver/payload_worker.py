@@ -0,0 +1,90 @@
+import json
+from receiver.classify import classify_messages, area_memo_key
+from receiver.decoders import DECODERS, ROW_BUILDERS, decode_message
+from receiver.dedup import dedup_key
+from receiver.geofence_index import GeofenceIndex, GRID_HIT_KINDS
+from receiver.geofence_snapshot import load_snapshot
+from utils.logging_setup import setup_worker_logging
+
+# Worker processes are spawned, this module never imports the receiver app.
+# Every worker builds its own geofence index from the snapshot the receiver saves
+
+
+class StaleGeofences(Exception):
+    """The snapshot on disk is not the geofence version the receiver classifies with."""
+
+
+# State of the worker process, set up by init_worker
+settings = {}
+geofence_index = None
+loaded_version = None
+
+def init_worker(log_config, snapshot_path, grid_cell_size, grid_max_cells, batch_lookup):
+    # Spawned workers import the main module again, which sets up logging from the config file
+    setup_worker_logging(*log_config)
+    settings.update(
+        snapshot_path=snapshot_path, grid_cell_size=grid_cell_size,
+        grid_max_cells=grid_max_cells, batch_lookup=batch_lookup,
+    )
+
+# The index of the given version, rebuilt from the snapshot when the receiver moved to another one
+def current_index(version):
+    global geofence_index, loaded_version
+    if version != loaded_version:
+        snapshot = load_snapshot(settings['snapshot_path'])
+        if snapshot is None or snapshot[1] != version:
+            raise StaleGeofences(version)
+        geofence_index = GeofenceIndex(snapshot[0], grid_cell_size=settings['grid_cell_size'], grid_max_cells=settings['grid_max_cells'])
+        loaded_version = version
+    return geofence_index
+
+# Decode and classify one webhook body. Returns (item type, dedup key, area memo key, area, row) of every decoded
+# message in order, the counts of (counter, item type) and the geofence lookup times. Only the receiver knows what
+# is a duplicate and what its area memo holds, so every message is looked up and repeats are dropped there.
+# Deferred records are queued without an area, the insert workers classify them
+def process_payload(body, version, shed_types, deferred=False):
+    index = None if deferred else current_index(version)
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Received data is not in list format")
+
+    counts = {}
+    pending_messages = []
+    for item in items:
+        if not isinstance(item, dict):
+            counts['received', 'other'] = counts.get(('received', 'other'), 0) + 1
+            counts['invalid', 'other'] = counts.get(('invalid', 'other'), 0) + 1
+            continue
+        item_type = item.get('type')
+        if not isinstance(item_type, str) or item_type not in DECODERS:
+            counts['received', 'other'] = counts.get(('received', 'other'), 0) + 1
+            counts['unsupported', 'other'] = counts.get(('unsupported', 'other'), 0) + 1
+            continue
+        counts['received', item_type] = counts.get(('received', item_type), 0) + 1
+        if item_type in shed_types:
+            counts['shed', item_type] = counts.get(('shed', item_type), 0) + 1
+            continue
+        decoded = decode_message(item_type, item.get('message', {}))
+        if decoded is None:
+            counts['invalid', item_type] = counts.get(('invalid', item_type), 0) + 1
+            continue
+        pending_messages.append((item_type, decoded))
+
+    lookup_seconds = []
+    if deferred:
+        messages = [
+            (item_type, dedup_key(item_type, decoded), None, None, ROW_BUILDERS[item_type](decoded, None))
+            for item_type, decoded in pending_messages
+        ]
+        return messages, counts, lookup_seconds
+
+    grid_hits = index.grid_hits()
+    geofence_names = classify_messages(pending_messages, index, None, settings['batch_lookup'], lookup_seconds.append)
+    for kind, before, after in zip(GRID_HIT_KINDS, grid_hits, index.grid_hits()):
+        if after > before:
+            counts['grid', kind] = after - before
+    messages = [
+        (item_type, dedup_key(item_type, decoded), area_memo_key(item_type, decoded), geofence_name, ROW_BUILDERS[item_type](decoded, geofence_name))
+        for (item_type, decoded), geofence_name in zip(pending_messages, geofence_names)
+    ]
+    return messages, counts, lookup_seconds
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from receiver.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger("webhook_logger")
+
+stage_depth = Gauge('psyduck_pipeline_stage_depth', 'Payloads waiting in front of a pipeline stage.', ['stage'])
+stage_processed = Counter('psyduck_pipeline_stage_processed_total', 'Payloads a pipeline stage has finished.', ['stage'])
+stage_failures = Counter('psyduck_pipeline_stage_failures_total', 'Payloads a pipeline stage failed on and dropped.', ['stage'])
+stage_seconds = Histogram('psyduck_pipeline_stage_seconds', 'Time a pipeline stage spends on one payload.', ['stage'])
+
+
+class Stage:
+    """One step of the ingestion pipeline, worker tasks going through a bounded queue."""
+
+    def __init__(self, name, handler, maxsize, workers=1):
+        # handler takes one payload and returns what goes to the next stage, None ends it there.
+        # It may return an awaitable for work that runs off the event loop, several workers keep
+        # several payloads in flight but don't keep their order
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize)
+        self.next_stage = None
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+        self.processed_count = stage_processed.labels(name)
+        self.failure_count = stage_failures.labels(name)
+        self.stage_seconds = stage_seconds.labels(name)
+        stage_depth.labels(name).set_function(self.queue.qsize)
+
+    async def run(self):
+        while True:
+            payload = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                result = self.handler(payload)
+                if asyncio.isfuture(result) or asyncio.iscoroutine(result):
+                    result = await result
+            except Exception as e:
+                self.failure_count.inc()
+                logger.error("Pipeline stage %s dropped a payload: %s", self.name, e)
+                result = None
+            elapsed = time.perf_counter() - started
+            self.busy_seconds += elapsed
+            self.stage_seconds.observe(elapsed)
+            self.processed += 1
+            self.processed_count.inc()
+            try:
+                # Waiting for room in the next stage is what slows down the ones before it
+                if result is not None and self.next_stage is not None:
+                    await self.next_stage.queue.put(result)
+            finally:
+                self.queue.task_done()
+
+    def stats(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            'depth': self.queue.qsize(),
+            'max_depth': self.queue.maxsize,
+            'workers': self.workers,
+            'processed': self.processed,
+            'per_second': self.processed / elapsed,
+            'busy': self.busy_seconds / elapsed / self.workers,
+        }
+
+
+class Pipeline:
+    """Stages joined by bounded queues, payloads are accepted as long as the first queue has room."""
+
+    def __init__(self, stages):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+        self.tasks = []
+        self.accepted = 0
+        self.rejected = 0
+
+    def start(self):
+        self.stop()
+        for stage in self.stages:
+            stage.started_at = time.monotonic()
+            self.tasks.extend(asyncio.create_task(stage.run()) for _ in range(stage.workers))
+
+    # Returns False when the first stage is full, the payload is not taken
+    def submit(self, payload):
+        try:
+            self.stages[0].queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.accepted += 1
+        return True
+
+    async def join(self):
+        """Waits until every accepted payload went through all stages."""
+        for stage in self.stages:
+            await stage.queue.join()
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    def stats(self):
+        return {
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'stages': {stage.name: stage.stats() for stage in self.stages},
+        }
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from processor.batches import encode_batch
+from receiver.metrics import Counter, Histogram
+
+logger = logging.getLogger("webhook_logger")
+
+publish_seconds = Histogram('psyduck_publish_seconds', 'Time to encode and send one batch to the broker, including retries.', ['type'])
+publish_failures = Counter('psyduck_publish_failures_total', 'Failed attempts to send a batch to the broker.', ['type'])
+
+
+# Encoded in the publisher threads, the event loop never serializes a batch
+def send_batch(insert_task, record_type, batch_data, batch_unique_id):
+    return insert_task.delay(encode_batch(record_type, batch_data), batch_unique_id)
+
+
+class BatchPublisher:
+    """Sends queued batches to Celery from a thread pool, the event loop only hands batches off."""
+
+    def __init__(self, max_workers=2, max_retries=2, retry_delay=5, on_published=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch_publisher")
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # Called with the spool sequence numbers of every published batch
+        self.on_published = on_published
+        self.pending = set()
+        # True while the last attempt to reach the broker failed
+        self.failing = False
+
+    def __len__(self):
+        return len(self.pending)
+
+    # Pop one batch from a queue and publish it in the background
+    def submit(self, queue, insert_task, label):
+        batch_data, batch_ids, batch_seqs = queue.pop_batch()
+        if not batch_data:
+            return None
+        task = asyncio.get_running_loop().create_task(self.publish(queue, batch_data, batch_ids, batch_seqs, insert_task, label))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return task
+
+    async def publish(self, queue, batch_data, batch_ids, batch_seqs, insert_task, label):
+        loop = asyncio.get_running_loop()
+        batch_unique_id = queue.batch_id(batch_ids)
+        started = time.perf_counter()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await loop.run_in_executor(self.executor, send_batch, insert_task, queue.record_type, batch_data, batch_unique_id)
+            except Exception as e:
+                self.failing = True
+                publish_failures.labels(queue.record_type).inc()
+                logger.error("Error publishing %s batch on attempt %s: %s", label, attempt + 1, e)
+                if attempt < self.max_retries:
+                    # Exponential backoff, other connections keep being served meanwhile
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt)
+                continue
+            self.failing = False
+            queue.release(batch_data)
+            publish_seconds.labels(queue.record_type).observe(time.perf_counter() - started)
+            logger.debug("Published %s batch of %s with unique_id: %s", label, len(batch_data), batch_unique_id)
+            if self.on_published:
+                self.on_published(batch_seqs)
+            return True
+
+        logger.error("Maximum retry attempts reached. %s batch of %s goes back to its queue.", label, len(batch_data))
+        queue.requeue(batch_data, batch_ids, batch_seqs)
+        return False
+
+    # Wait for every batch already handed off
+    async def drain(self):
+        while self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,227 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+logger = logging.getLogger("webhook_logger")
+
+# Frame header: payload length, payload crc32 and frame kind
+FRAME_HEADER = struct.Struct('<IIc')
+RECORDS_FRAME = b'R'
+ACK_FRAME = b'A'
+SEGMENT_SUFFIX = '.wal'
+
+
+class SpoolSegment:
+    """One memory mapped segment file, appended to until it is full."""
+
+    def __init__(self, path, index, size):
+        self.path = path
+        self.index = index
+        self.size = size
+        self.offset = 0
+        self.first_seq = None
+        self.last_seq = None
+        self.pending = 0
+        self.sealed = False
+        self.file = None
+        self.map = None
+
+    def open(self):
+        self.file = open(self.path, 'w+b')
+        self.file.truncate(self.size)
+        self.map = mmap.mmap(self.file.fileno(), self.size)
+
+    def fits(self, frame_size):
+        return self.offset + frame_size <= self.size
+
+    def write(self, kind, payload):
+        header = FRAME_HEADER.pack(len(payload), zlib.crc32(payload), kind)
+        self.map[self.offset:self.offset + len(header)] = header
+        self.map[self.offset + len(header):self.offset + len(header) + len(payload)] = payload
+        self.offset += len(header) + len(payload)
+
+    def seal(self):
+        self.sealed = True
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+            self.map = None
+            self.file = None
+
+    def delete(self):
+        self.seal()
+        os.remove(self.path)
+
+
+def read_frames(path):
+    with open(path, 'rb') as segment_file:
+        data = segment_file.read()
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(data):
+        length, checksum, kind = FRAME_HEADER.unpack_from(data, offset)
+        start = offset + FRAME_HEADER.size
+        payload = data[start:start + length]
+        # A zeroed header is the end of the segment, a bad checksum a write cut short by a crash
+        if kind not in (RECORDS_FRAME, ACK_FRAME) or len(payload) != length or zlib.crc32(payload) != checksum:
+            break
+        yield kind, payload
+        offset = start + length
+
+
+class RecordSpool:
+    """Append-only write-ahead log of queued records, rotated in memory mapped segments.
+
+    Once the segments take more than max_bytes the oldest ones are removed, their records are still
+    queued in memory but no longer survive a crash. A max_bytes of 0 doesn't limit the spool.
+    """
+
+    def __init__(self, directory, segment_size=67108864, max_bytes=0):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_bytes = max_bytes
+        self.segments = []
+        self.segment_first_seqs = []
+        self.next_seq = 0
+        # Records below this sequence number were in removed segments, their acks are ignored
+        self.dropped_before = 0
+        self.dropped = 0
+        self.active = None
+        os.makedirs(directory, exist_ok=True)
+
+    def segment_path(self, index):
+        return os.path.join(self.directory, f"{index:012d}{SEGMENT_SUFFIX}")
+
+    def existing_segments(self):
+        indexes = [int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX)]
+        return sorted(indexes)
+
+    def replay(self):
+        """Read every segment left by a previous run, returns its unconfirmed records in order."""
+        records = {}
+        acked = set()
+        last_index = -1
+        for index in self.existing_segments():
+            segment = SpoolSegment(self.segment_path(index), index, os.path.getsize(self.segment_path(index)))
+            segment.sealed = True
+            for kind, payload in read_frames(segment.path):
+                if kind == RECORDS_FRAME:
+                    first_seq, record_type, frame_records = json.loads(payload)
+                    for seq, record in enumerate(frame_records, first_seq):
+                        records[seq] = (record_type, record)
+                    if segment.first_seq is None:
+                        segment.first_seq = first_seq
+                    segment.last_seq = first_seq + len(frame_records) - 1
+                else:
+                    acked.update(json.loads(payload))
+            # Segments holding only confirmations are kept until everything older is removed
+            self.add_segment(segment)
+            if segment.last_seq is not None:
+                self.next_seq = max(self.next_seq, segment.last_seq + 1)
+            last_index = index
+
+        pending = []
+        for seq in sorted(records.keys() - acked):
+            self.segments[self.segment_position(seq)].pending += 1
+            record_type, record = records[seq]
+            pending.append((record_type, record, seq))
+        self.truncate()
+        self.rotate(last_index + 1)
+        if pending:
+            logger.info("Replaying %s unconfirmed records from the spool.", len(pending))
+        return pending
+
+    def add_segment(self, segment):
+        self.segments.append(segment)
+        self.segment_first_seqs.append(segment.first_seq if segment.first_seq is not None else self.next_seq)
+
+    def segment_position(self, seq):
+        return bisect.bisect_right(self.segment_first_seqs, seq) - 1
+
+    def rotate(self, index=None, size=None):
+        if index is None:
+            index = self.active.index + 1
+        if self.active is not None:
+            self.active.seal()
+        self.active = SpoolSegment(self.segment_path(index), index, size or self.segment_size)
+        self.active.open()
+        self.add_segment(self.active)
+        self.enforce_max_bytes()
+
+    def size(self):
+        return sum(segment.size for segment in self.segments)
+
+    # The active segment is never removed, so a spool always holds the records being written
+    def enforce_max_bytes(self):
+        if not self.max_bytes:
+            return
+        removed = 0
+        records = 0
+        while len(self.segments) > 1 and self.size() > self.max_bytes:
+            segment = self.segments.pop(0)
+            self.segment_first_seqs.pop(0)
+            if segment.last_seq is not None:
+                self.dropped_before = max(self.dropped_before, segment.last_seq + 1)
+            records += max(segment.pending, 0)
+            segment.delete()
+            removed += 1
+        if removed:
+            self.dropped += records
+            logger.warning(
+                "Spool is over %s bytes, removed the %s oldest segments. %s records in them are no longer kept on disk.",
+                self.max_bytes, removed, records,
+            )
+
+    def write_frame(self, kind, payload):
+        frame_size = FRAME_HEADER.size + len(payload)
+        if not self.active.fits(frame_size):
+            # Oversized frames get a segment of their own
+            self.rotate(size=max(self.segment_size, frame_size))
+        self.active.write(kind, payload)
+
+    def append(self, record_type, records):
+        """Spool a list of records of one type, returns the sequence number of each."""
+        if not records:
+            return []
+        first_seq = self.next_seq
+        self.next_seq += len(records)
+        payload = json.dumps([first_seq, record_type, records], separators=(',', ':')).encode()
+        self.write_frame(RECORDS_FRAME, payload)
+        segment = self.active
+        # Records written into a fresh segment start its sequence range
+        if segment.first_seq is None:
+            segment.first_seq = first_seq
+            self.segment_first_seqs[-1] = first_seq
+        segment.last_seq = self.next_seq - 1
+        segment.pending += len(records)
+        return list(range(first_seq, self.next_seq))
+
+    def ack(self, seqs):
+        """Confirm published records, segments are removed once they and all older ones are confirmed."""
+        seqs = [seq for seq in seqs if seq is not None and seq >= self.dropped_before]
+        if not seqs:
+            return
+        self.write_frame(ACK_FRAME, json.dumps(seqs, separators=(',', ':')).encode())
+        for seq in seqs:
+            self.segments[self.segment_position(seq)].pending -= 1
+        self.truncate()
+
+    # Acks of older segments can live in newer ones, so segments are removed oldest first only
+    def truncate(self):
+        while self.segments and self.segments[0].sealed and self.segments[0].pending <= 0:
+            self.segments.pop(0).delete()
+            self.segment_first_seqs.pop(0)
+
+    def pending(self):
+        return sum(segment.pending for segment in self.segments)
+
+    def close(self):
+        if self.active is None:
+            return
+        self.active.seal()
+        self.truncate()
+        self.active = None
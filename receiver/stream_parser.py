@@ -0,0 +1,105 @@
+import codecs
+import json
+
+# Message fields the receiver uses, everything else is dropped right after decoding
+MESSAGE_FIELDS = {
+    'pokemon': (
+        'pokemon_id', 'form', 'latitude', 'longitude', 'individual_attack', 'individual_defense',
+        'individual_stamina', 'shiny', 'disappear_time', 'first_seen', 'pvp', 'spawnpoint_id', 'encounter_id'
+    ),
+    'quest': ('pokestop_id', 'type', 'with_ar', 'latitude', 'longitude', 'rewards', 'updated'),
+    'raid': (
+        'gym_id', 'ex_raid_eligible', 'is_exclusive', 'level', 'pokemon_id', 'form', 'costume',
+        'latitude', 'longitude', 'end'
+    ),
+    'invasion': (
+        'pokestop_id', 'display_type', 'character', 'confirmed', 'latitude', 'longitude',
+        'incident_expire_timestamp'
+    ),
+}
+
+WHITESPACE = ' \t\n\r'
+
+
+class WebhookStreamError(ValueError):
+    pass
+
+
+# Only keep rank 1 pvp entries, they are the only ones stored
+def prune_pvp(pvp_data):
+    if not isinstance(pvp_data, dict):
+        return pvp_data
+    return {
+        category: [entry for entry in entries if isinstance(entry, dict) and entry.get('rank') == 1]
+        for category, entries in pvp_data.items() if isinstance(entries, list)
+    }
+
+def prune_item(item):
+    item_type = item.get('type')
+    message = item.get('message', {})
+    if not isinstance(message, dict):
+        return {'type': item_type, 'message': message}
+    pruned_message = {field: message[field] for field in MESSAGE_FIELDS[item_type] if field in message}
+    if 'pvp' in pruned_message:
+        pruned_message['pvp'] = prune_pvp(pruned_message['pvp'])
+    return {'type': item_type, 'message': pruned_message}
+
+async def iter_webhook_items(chunks, max_item_size=1048576):
+    """Yield the pruned items of a top level JSON array while the body is still arriving."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    array_started = False
+    finished = False
+
+    async for chunk in chunks:
+        buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position >= len(buffer):
+                break
+
+            if not array_started:
+                if buffer[position] != '[':
+                    raise WebhookStreamError("Received data is not in list format")
+                array_started = True
+                position += 1
+                continue
+            if finished:
+                raise WebhookStreamError("Unexpected data after the end of the list")
+            if buffer[position] == ',':
+                position += 1
+                continue
+            if buffer[position] == ']':
+                finished = True
+                position += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Most likely an item split across chunks, wait for more data
+                if len(buffer) - position > max_item_size:
+                    raise WebhookStreamError(f"Webhook item exceeds {max_item_size} bytes or is invalid JSON")
+                break
+            position = end
+
+            # Other items only keep what the receiver needs to count them, None for items that are not objects
+            if not isinstance(item, dict):
+                yield None
+                continue
+            item_type = item.get('type')
+            if isinstance(item_type, str) and item_type in MESSAGE_FIELDS:
+                yield prune_item(item)
+            else:
+                yield {'type': item_type if isinstance(item_type, str) else None}
+
+    buffer = buffer[position:] + text_decoder.decode(b'', final=True)
+    if buffer.strip() or (array_started and not finished):
+        raise WebhookStreamError("Webhook body ended before the list was complete")
+    if not array_started:
+        raise WebhookStreamError("Received data is not in list format")
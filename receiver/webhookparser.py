@@ -1,22 +1,38 @@
 import logging
-from logging.handlers import RotatingFileHandler
-from logging import StreamHandler
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi import FastAPI, Request, Response, HTTPException
+from fastapi.responses import RedirectResponse, PlainTextResponse
 import json
-from shapely.geometry import Point, Polygon
-import requests
 import os
-from datetime import datetime, timedelta
 import asyncio
-from processor.celery_app import celery
-from config.app_config import app_config
-from processor.tasks import insert_data_task, generate_unique_id, insert_quest_data_task, insert_raid_data_task, insert_invasion_data_task
-from threading import Lock, Thread
 import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config.app_config import app_config
+from processor.tasks import insert_data_task, insert_quest_data_task, insert_raid_data_task, insert_invasion_data_task, upsert_aggregates_task
+from processor.streams import StreamProducer
+from processor.batches import RECORD_TYPES, RECORD_FIELDS
+from processor.geofences import publish_geofences
 from cachetools import TTLCache
 import httpx
+import redis
 import backoff
+from receiver.batch_buffer import BatchBuffer, INSTANCE_ID
+from receiver.geofence_index import GeofenceIndex, GRID_HIT_KINDS
+from receiver.geofence_snapshot import geofence_version, save_snapshot, load_snapshot
+from receiver.publisher import BatchPublisher
+from receiver.spool import RecordSpool
+from receiver.dedup import DedupFilter, dedup_key
+from receiver.admission import AdmissionController
+from receiver.aggregator import PokemonAggregator
+from receiver.pipeline import Stage, Pipeline
+from receiver.metrics import registry, Counter, Gauge, Histogram
+from receiver import multiworker
+from receiver.decoders import DECODERS, decode_message
+from receiver.classify import classify_messages as assign_areas, build_records, build_unclassified_records, with_area
+from receiver.payload_worker import init_worker, process_payload, StaleGeofences
+from receiver.stream_parser import iter_webhook_items, WebhookStreamError
+from utils.logging_setup import setup_logging, RateLimitedLogger, WorkerLogQueue
 
 # Setup the FastAPI app
 webhook_processor = FastAPI()
@@ -24,89 +40,214 @@ webhook_processor = FastAPI()
 # Caching geofences
 geofence_cache = TTLCache(maxsize=app_config.max_size_geofence, ttl=app_config.cache_geofences)
 
+# Area memo for stable locations (pokestops, gyms and spawnpoints)
+area_memo = TTLCache(maxsize=app_config.area_memo_size, ttl=app_config.area_memo_ttl)
+
+# Full batches go to the stream writer instead of the Celery insert tasks
+if app_config.transport == "redis_stream":
+    stream_producer = StreamProducer(redis.StrictRedis.from_url(app_config.redis_url), max_len=app_config.stream_max_len)
+    insert_data_task = stream_producer.task("pokemon")
+    insert_quest_data_task = stream_producer.task("quest")
+    insert_raid_data_task = stream_producer.task("raid")
+    insert_invasion_data_task = stream_producer.task("invasion")
+
+# Insert workers read the geofences from Redis when they classify the records
+geofence_redis = redis.StrictRedis.from_url(app_config.redis_url) if app_config.defer_classification else None
+
+# Celery publishing happens off the event loop
+publisher = BatchPublisher(max_workers=app_config.publish_workers, max_retries=app_config.max_retries, retry_delay=app_config.retry_delay, on_published=lambda batch_seqs: confirm_published(batch_seqs))
+
+# Write-ahead spool of queued records, opened on startup
+record_spool = None
+
+# Recently received messages of every type, repeats are dropped before they are queued
+dedup_filters = {}
+if app_config.dedup:
+    dedup_filters = {
+        'pokemon': DedupFilter(app_config.pokemon_dedup_ttl, app_config.dedup_max_keys),
+        'quest': DedupFilter(app_config.quest_dedup_ttl, app_config.dedup_max_keys),
+        'raid': DedupFilter(app_config.raid_dedup_ttl, app_config.dedup_max_keys),
+        'invasion': DedupFilter(app_config.invasion_dedup_ttl, app_config.dedup_max_keys),
+    }
+
+# Pokemon counters upserted into aggregated_pokemon_stats, they need the areas classified here
+aggregator = PokemonAggregator() if app_config.pokemon_aggregation and not app_config.defer_classification else None
+aggregate_flushes = 0
+# Flushes of (unique_id, deltas, spool seqs) not sent yet. They are sent again with the same unique_id, a flush
+# the broker did get before the error is then only added once
+unsent_aggregates = []
+# Spool sequence numbers of the pokemon counted since the last flush
+aggregate_seqs = []
+# Spooled pokemon rows that were only aggregated, replayed into the counters of the hour they were counted in
+AGGREGATE_SPOOL_TYPE = 'aggregate'
+
 # Data processing queue Pokémon
-is_processing_queue = False
-data_queue = []
+data_queue = BatchBuffer('pokemon', app_config.max_queue_size)
 data_queue_lock = asyncio.Lock()
 
 # Quests processing queue
-is_quests_processing_queue = False
-quests_data_queue = []
+quests_data_queue = BatchBuffer('quest', app_config.max_quest_queue_size)
 quests_data_queue_lock = asyncio.Lock()
 
 # Raids processing queue
-is_raids_processing_queue = False
-raids_data_queue = []
+raids_data_queue = BatchBuffer('raid', app_config.max_raid_queue_size)
 raids_data_queue_lock = asyncio.Lock()
 
 # Invasions processing queue
-is_invasions_processing_queue = False
-invasions_data_queue = []
+invasions_data_queue = BatchBuffer('invasion', app_config.max_invasion_queue_size)
 invasions_data_queue_lock = asyncio.Lock()
 
-# Time processors
-last_quests_processing_time = datetime.now()
-last_raids_processing_time = datetime.now()
-last_invasions_processing_time = datetime.now()
-
-# Configuration values
-console_log_level_str = app_config.webhook_console_log_level.upper()
-log_level_str = app_config.webhook_log_level.upper()
-log_file = app_config.webhook_log_file
-max_bytes = app_config.webhook_log_max_bytes
-backup_count = app_config.webhook_max_log_files
-
-# Console Logger
-console_logger = logging.getLogger("webhook_console_logger")
-if console_log_level_str == "OFF":
-    console_logger.disabled = True
-else:
-    console_log_level = getattr(logging, console_log_level_str, logging.INFO)
-    console_logger.setLevel(console_log_level)
-    # Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(console_log_level)
-    # Formatter
-    console_formatter = logging.Formatter('[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
-    console_handler.setFormatter(console_formatter)
-    console_logger.addHandler(console_handler)
-
-# File logger
-file_logger = logging.getLogger("webhook_file_logger")
-if log_level_str == "OFF":
-    log_level = logging.NOTSET
-else:
-    log_level = getattr(logging, log_level_str, logging.INFO)
-
-file_logger.setLevel(log_level)
-if not os.path.exists(os.path.dirname(log_file)):
-    os.makedirs(os.path.dirname(log_file))
-
-#handler
-file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-file_handler.setLevel(log_level)
-# Formatter
-file_formatter = logging.Formatter('[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
-file_handler.setFormatter(file_formatter)
-file_logger.addHandler(file_handler)
+# Stops accepting record types once too much is held in memory, lowest priority first
+admission = AdmissionController(
+    {queue.record_type: queue for queue in (data_queue, quests_data_queue, raids_data_queue, invasions_data_queue)},
+    {
+        'pokemon': (app_config.pokemon_max_buffered, app_config.pokemon_max_buffered_bytes),
+        'quest': (app_config.quest_max_buffered, app_config.quest_max_buffered_bytes),
+        'raid': (app_config.raid_max_buffered, app_config.raid_max_buffered_bytes),
+        'invasion': (app_config.invasion_max_buffered, app_config.invasion_max_buffered_bytes),
+    },
+    max_bytes=app_config.max_buffered_bytes,
+    shed_order=app_config.shed_order,
+    shed_start=app_config.shed_start,
+    retry_after=app_config.retry_after,
+)
+
+# Receiver metrics served on /metrics, hot paths keep the children of every type around
+messages_received = Counter('psyduck_messages_received_total', 'Webhook messages received, other is any unsupported type.', ['type'])
+messages_accepted = Counter('psyduck_messages_accepted_total', 'Messages queued for the database.', ['type'])
+messages_filtered = Counter('psyduck_messages_filtered_total', 'Messages dropped before classification.', ['type', 'reason'])
+messages_outside_geofence = Counter('psyduck_messages_outside_geofence_total', 'Messages outside every geofence.', ['type'])
+queue_flushes = Counter('psyduck_queue_flushes_total', 'Batches handed to the publisher.', ['type', 'reason'])
+queue_depth = Gauge('psyduck_queue_depth', 'Records waiting in the queue.', ['type'])
+queue_bytes = Gauge('psyduck_queue_bytes', 'Approximate bytes of the records waiting in the queue.', ['type'])
+queue_in_flight = Gauge('psyduck_queue_in_flight', 'Records of batches being published.', ['type'])
+queue_oldest_age = Gauge('psyduck_queue_oldest_age_seconds', 'Seconds the oldest queued record has been waiting.', ['type'])
+geofence_lookup_seconds = Histogram('psyduck_geofence_lookup_seconds', 'Time to assign areas to the messages of one payload slice.')
+geofence_grid_lookups = Counter('psyduck_geofence_grid_lookups_total', 'Geofence lookups by the grid cell of the point, boundary cells need a polygon test.', ['cell'])
+aggregate_keys = Gauge('psyduck_aggregate_keys', 'Pokemon counters waiting for the next aggregate flush or to be sent again.')
+aggregate_upserts = Counter('psyduck_aggregate_upserts_total', 'Aggregate upsert tasks sent to the broker.')
+
+received_counts = {item_type: messages_received.labels(item_type) for item_type in RECORD_TYPES + ('other',)}
+accepted_counts = {item_type: messages_accepted.labels(item_type) for item_type in RECORD_TYPES}
+outside_geofence_counts = {item_type: messages_outside_geofence.labels(item_type) for item_type in RECORD_TYPES}
+filtered_counts = {
+    (item_type, reason): messages_filtered.labels(item_type, reason)
+    for item_type in RECORD_TYPES for reason in ('invalid', 'duplicate', 'shed')
+}
+unsupported_count = messages_filtered.labels('other', 'unsupported')
+# Items that are not a JSON object, they have no type
+filtered_counts['other', 'invalid'] = messages_filtered.labels('other', 'invalid')
+grid_lookup_counts = {kind: geofence_grid_lookups.labels(kind) for kind in GRID_HIT_KINDS}
+for record_queue in (data_queue, quests_data_queue, raids_data_queue, invasions_data_queue):
+    queue_depth.labels(record_queue.record_type).set_function(record_queue.__len__)
+    queue_bytes.labels(record_queue.record_type).set_function(lambda record_queue=record_queue: record_queue.nbytes)
+    queue_in_flight.labels(record_queue.record_type).set_function(lambda record_queue=record_queue: record_queue.in_flight)
+    queue_oldest_age.labels(record_queue.record_type).set_function(record_queue.oldest_age)
+if aggregator is not None:
+    aggregate_keys.set_function(lambda: len(aggregator) + sum(len(deltas) for _, deltas, _ in unsent_aggregates))
+
+# One logger for the receiver, its handlers run on a background thread
+logger = setup_logging(
+    logging.getLogger("webhook_logger"), app_config.webhook_console_log_level, app_config.webhook_log_level,
+    app_config.webhook_log_file, app_config.webhook_log_max_bytes, app_config.webhook_max_log_files
+)
+# Events of single messages and requests are logged at most once every 10 seconds
+item_logger = RateLimitedLogger(logger)
+
+# Stages of the ack-first pipeline, a webhook is answered once its body is in the first one
+def decode_stage(body):
+    data = json.loads(body)
+    if not isinstance(data, list):
+        logger.error("Received data is not in list format")
+        return None
+    pending_messages, shed = decode_webhook_items(data, admission.shed_types())
+    if shed:
+        item_logger.warning("Shed %s messages, buffers are full. Shed types: %s", shed, sorted(admission.shed_types()))
+    return pending_messages or None
+
+def classify_stage(pending_messages):
+    geofence_index = geofence_cache.get('geofence_index')
+    # Deferred records are classified by the insert workers, with the geofences published before
+    if not geofence_index and not app_config.defer_classification:
+        item_logger.warning("No geofences available, dropped %s messages.", len(pending_messages))
+        return None
+    return classify_webhook_messages(pending_messages, geofence_index)
+
+def buffer_stage(queued_records):
+    enqueue_classified(queued_records)
+    return None
+
+async def process_stage(body):
+    queued_records, shed = await process_body_in_pool(body)
+    if shed:
+        item_logger.warning("Shed %s messages, buffers are full. Shed types: %s", shed, sorted(admission.shed_types()))
+    return queued_records
+
+# Publishing is the last stage, batches go from the queues to the publisher threads
+def build_pipeline():
+    if app_config.process_workers > 0:
+        # Decoding and classification run together in the worker processes, one payload per worker at a time
+        return Pipeline([
+            Stage('process', process_stage, app_config.pipeline_queue_size, workers=app_config.process_workers),
+            Stage('buffer', buffer_stage, app_config.pipeline_queue_size),
+        ])
+    return Pipeline([
+        Stage('decode', decode_stage, app_config.pipeline_queue_size),
+        Stage('classify', classify_stage, app_config.pipeline_queue_size),
+        Stage('buffer', buffer_stage, app_config.pipeline_queue_size),
+    ])
+
+pipeline = build_pipeline() if app_config.pipeline else None
 
 refresh_task = None
+flush_task = None
+# Worker processes decoding and classifying webhook bodies, started with the app
+payload_pool = None
+# Logs of the worker processes, handled by the receiver logger
+worker_log_queue = None
 
 @webhook_processor.on_event("startup")
 async def startup_event():
-    global geofence_cache, refresh_task
-    try:
-        geofences = await fetch_geofences()
-        geofence_cache['geofences'] = geofences
-        console_logger.info(f"Sucessfully obtained {len(geofences)} geofences.")
-        file_logger.info(f"Sucessfully obtained {len(geofences)} geofences.")
-        # Cancel existing refresh tasks before creating a new one
-        if refresh_task:
-            refresh_task.cancel()
-        refresh_task = asyncio.create_task(refresh_geofences())
-    except httpx.HTTPError as e:
-        console_logger.error(f"Failed to fetch geofences: {e}")
-        file_logger.error(f"Failed to fetch geofences: {e}")
+    global geofence_cache, refresh_task, flush_task, record_spool, payload_pool
+    if multiworker.worker_state:
+        logger.info("Starting receiver worker %s.", multiworker.worker_state.worker_id)
+    if app_config.pokemon_aggregation and aggregator is None:
+        logger.warning("POKEMON_AGGREGATION needs the areas, it is off while DEFER_CLASSIFICATION is on.")
+    if app_config.stream_parse and (pipeline or app_config.process_workers > 0):
+        logger.warning("STREAM_PARSE is ignored, PIPELINE and PROCESS_WORKERS read webhook bodies whole.")
+    if dedup_filters and app_config.receiver_workers > 1:
+        logger.warning("DEDUP only drops repeats seen by the same receiver worker, repeats spread over the %s workers are kept.", app_config.receiver_workers)
+    if app_config.spool and record_spool is None:
+        # Every worker has its own spool, a restarted worker replays the one it left behind
+        spool_dir = app_config.spool_dir
+        if multiworker.worker_state:
+            spool_dir = os.path.join(spool_dir, f"worker-{multiworker.worker_state.worker_id}")
+        record_spool = RecordSpool(spool_dir, segment_size=app_config.spool_segment_size, max_bytes=app_config.spool_max_bytes)
+        replay_spool()
+    # The flusher runs even when geofences could not be fetched, so queued data is never stuck
+    if flush_task:
+        flush_task.cancel()
+    flush_task = asyncio.create_task(flush_queues())
+    if app_config.process_workers > 0 and payload_pool is None:
+        payload_pool = start_payload_pool()
+    if pipeline:
+        pipeline.start()
+    # Classify right away with the last saved geofences, Koji is asked in the background
+    from_snapshot = await load_geofence_snapshot()
+    if not from_snapshot:
+        try:
+            geofences = await fetch_geofences()
+            await update_geofences(geofences)
+            logger.info("Sucessfully obtained %s geofences.", len(geofences))
+        except httpx.HTTPError as e:
+            logger.error("Failed to fetch geofences: %s", e)
+        except Exception as e:
+            # Fences that can't be indexed or saved must not keep the receiver from starting
+            logger.error("Failed to load the fetched geofences: %s", e, exc_info=True)
+    # Cancel existing refresh tasks before creating a new one
+    if refresh_task:
+        refresh_task.cancel()
+    refresh_task = asyncio.create_task(refresh_geofences(fetch_now=from_snapshot))
 
 
 @backoff.on_exception(backoff.expo, httpx.HTTPError, max_tries=app_config.max_tries_geofences, jitter=None, factor=app_config.retry_delay_mult_geofences)
@@ -117,44 +258,376 @@ async def fetch_geofences():
         if response.status_code == 200:
             return response.json().get("data", {}).get("features", [])
         else:
-            console_logger.error(f"Failed to fetch geofences. Status Code: {response.status_code}")
-            file_logger.error(f"Failed to fetch geofences. Status Code: {response.status_code}")
+            logger.error("Failed to fetch geofences. Status Code: %s", response.status_code)
             raise httpx.HTTPError(f"Failed to fetch geofences. Status Code: {response.status_code}")
 
-async def refresh_geofences():
+async def refresh_geofences(fetch_now=False):
+    if not fetch_now:
+        await asyncio.sleep(app_config.refresh_geofences)
     while True:
         try:
             geofences = await fetch_geofences()
-            geofence_cache['geofences'] = geofences
-            console_logger.info(f"Successfully refreshed {len(geofences)} geofences.")
-            file_logger.info(f"Successfully refreshed {len(geofences)} geofences.")
-        except httpx.HTTPError as e:
-            console_logger.error(f"Failed to refresh geofences: {e}")
-            file_logger.error(f"Failed to refresh geofences: {e}")
+            if await update_geofences(geofences):
+                logger.info("Successfully refreshed %s geofences.", len(geofences))
+            else:
+                logger.info("Geofences unchanged, %s geofences kept.", len(geofences))
+        except Exception as e:
+            # Any failure keeps the current index, the refresh task keeps running
+            logger.error("Failed to refresh geofences: %s", e, exc_info=not isinstance(e, httpx.HTTPError))
+            # Cached geofences expire, keep classifying with the saved ones meanwhile
+            if not geofence_cache.get('geofence_index'):
+                await load_geofence_snapshot()
         await asyncio.sleep(app_config.refresh_geofences)
 
-
-def is_inside_geofence(lat, lon, geofences):
-    point = Point(lon, lat)
-    for geofence in geofences:
-        geofence_name = geofence.get("properties", {}).get("name", "Unknown")
-        polygon = geofence["geometry"]["coordinates"][0]
-        console_logger.debug(f"Polygon data:, {polygon}")
-        file_logger.debug(f"Polygon data:, {polygon}")
+def build_geofence_index(geofences):
+    return GeofenceIndex(geofences, grid_cell_size=app_config.geofence_grid_cell_size, grid_max_cells=app_config.geofence_grid_max_cells)
+
+# Swap in a fence set and its prebuilt index, requests see either the old or the new one
+def store_geofences(geofences, version=None, geofence_index=None):
+    if version is None:
+        version = geofence_version(geofences)
+    if geofence_index is None:
+        geofence_index = build_geofence_index(geofences)
+    previous_index = geofence_cache.get('geofence_index')
+    if previous_index and previous_index.grid_cell_size > 0:
+        grid_stats = previous_index.grid_stats()
+        logger.info("Geofence grid hit rate %.2f%% (inside: %s, outside: %s, boundary: %s).", 100 * grid_stats['hit_rate'], grid_stats['inside_hits'], grid_stats['outside_hits'], grid_stats['boundary_hits'])
+    # Memoized areas are only valid for the fence set they were computed against
+    if version != geofence_cache.get('geofence_version'):
+        area_memo.clear()
+    geofence_cache['geofences'] = geofences
+    geofence_cache['geofence_version'] = version
+    geofence_cache['geofence_index'] = geofence_index
+
+# Hash and rebuild off the event loop, only when the fences changed. Returns True when they did
+async def update_geofences(geofences):
+    version = await asyncio.to_thread(geofence_version, geofences)
+    # Published on every refresh, so a flushed Redis gets them back
+    await publish_worker_geofences(geofences, version)
+    geofence_index = geofence_cache.get('geofence_index')
+    if geofence_index is not None and version == geofence_cache.get('geofence_version'):
+        # Storing them again renews their cache time
+        store_geofences(geofences, version, geofence_index)
+        return False
+    geofence_index = await asyncio.to_thread(build_geofence_index, geofences)
+    # Saved before the swap, worker processes load the new version from it
+    if app_config.geofence_snapshot:
         try:
-            if point.within(Polygon(polygon)):
-                return True, geofence_name
-        except Exception as e:
-            console_logger.error(f"Error processing polygon for geofence {geofence_name}: {polygon}, Error: {e}")
-            file_logger.error(f"Error processing polygon for geofence {geofence_name}: {polygon}, Error: {e}")
-    return False, None
-
-def calculate_despawn_time(disappear_time, first_seen):
-    if disappear_time is None or first_seen is None:
+            await asyncio.to_thread(save_snapshot, app_config.geofence_snapshot, geofences, version)
+        except OSError as e:
+            logger.error("Failed to save geofence snapshot: %s", e)
+    store_geofences(geofences, version, geofence_index)
+    return True
+
+# Returns True when the saved geofences were loaded
+async def load_geofence_snapshot():
+    if not app_config.geofence_snapshot:
+        return False
+    snapshot = await asyncio.to_thread(load_snapshot, app_config.geofence_snapshot)
+    if snapshot is None:
+        return False
+    geofences, version = snapshot
+    await publish_worker_geofences(geofences, version)
+    try:
+        geofence_index = await asyncio.to_thread(build_geofence_index, geofences)
+    except Exception as e:
+        logger.error("Failed to index the geofences of the snapshot %s: %s", app_config.geofence_snapshot, e, exc_info=True)
+        return False
+    store_geofences(geofences, version, geofence_index)
+    logger.info("Loaded %s geofences from the snapshot %s.", len(geofences), app_config.geofence_snapshot)
+    return True
+
+# Only needed when the insert workers classify the records
+async def publish_worker_geofences(geofences, version):
+    if geofence_redis is None:
+        return
+    try:
+        await asyncio.to_thread(publish_geofences, geofence_redis, geofences, version)
+    except Exception as e:
+        logger.error("Failed to publish geofences for the insert workers: %s", e, exc_info=not isinstance(e, redis.RedisError))
+
+# Assign an area to every message at once, None when outside all geofences
+def classify_messages(pending_messages, geofence_index):
+    grid_hits = geofence_index.grid_hits()
+    geofence_names = assign_areas(pending_messages, geofence_index, area_memo, app_config.geofence_batch_lookup, geofence_lookup_seconds.observe)
+    for kind, before, after in zip(GRID_HIT_KINDS, grid_hits, geofence_index.grid_hits()):
+        if after > before:
+            grid_lookup_counts[kind].inc(after - before)
+    return geofence_names
+
+def is_duplicate(item_type, decoded):
+    dedup_filter = dedup_filters.get(item_type)
+    if dedup_filter is None:
+        return False
+    key = dedup_key(item_type, decoded)
+    return key is not None and dedup_filter.seen(key)
+
+# Filter, classify and queue a list of webhook items, returns how many were shed
+def process_webhook_items(items, geofence_index):
+    pending_messages, shed = decode_webhook_items(items, admission.shed_types())
+    enqueue_classified(classify_webhook_messages(pending_messages, geofence_index))
+    return shed
+
+# Decode the supported messages that are not shed or repeats, returns them with how many were shed
+def decode_webhook_items(items, shed_types):
+    shed = 0
+    # Decode the whole payload first so it can be classified in one go
+    pending_messages = []
+    for item in items:
+        if not isinstance(item, dict):
+            received_counts['other'].inc()
+            filtered_counts['other', 'invalid'].inc()
+            item_logger.debug("Webhook item is not an object: %.100r", item)
+            continue
+        item_type = item.get('type')
+        if not isinstance(item_type, str) or item_type not in DECODERS:
+            received_counts['other'].inc()
+            unsupported_count.inc()
+            item_logger.debug("Unsupported data type found in payload: %s", item_type)
+            continue
+        received_counts[item_type].inc()
+        # Shed before the dedup check, so the scanner can still send them again later
+        if item_type in shed_types:
+            admission.record_shed(item_type)
+            filtered_counts[item_type, 'shed'].inc()
+            shed += 1
+            continue
+
+        decoded = decode_message(item_type, item.get('message', {}))
+        if decoded is None:
+            filtered_counts[item_type, 'invalid'].inc()
+            item_logger.debug("%s data did not meet filter criteria", item_type)
+            continue
+        if is_duplicate(item_type, decoded):
+            filtered_counts[item_type, 'duplicate'].inc()
+            continue
+        pending_messages.append((item_type, decoded))
+    return pending_messages, shed
+
+# Records of the decoded messages inside a geofence, by record type
+def classify_webhook_messages(pending_messages, geofence_index):
+    if app_config.defer_classification:
+        return build_unclassified_records(pending_messages)
+    queued_records, outside_counts = build_records(pending_messages, classify_messages(pending_messages, geofence_index))
+    for item_type, count in outside_counts.items():
+        outside_geofence_counts[item_type].inc(count)
+    return queued_records
+
+def enqueue_classified(queued_records):
+    for item_type, records in queued_records.items():
+        accepted_counts[item_type].inc(len(records))
+        if item_type == 'pokemon' and aggregator is not None:
+            aggregate_pokemon(records)
+            if not app_config.pokemon_raw_storage:
+                continue
+        enqueue_records(item_type, records)
+
+# Worker processes read the geofences from the snapshot, they can't classify without one
+def start_payload_pool():
+    global worker_log_queue
+    if not app_config.geofence_snapshot and not app_config.defer_classification:
+        logger.warning("PROCESS_WORKERS needs GEOFENCE_SNAPSHOT, webhooks are processed in the receiver process.")
         return None
-    time_diff = disappear_time - first_seen
-    total_seconds = time_diff // 1
-    return total_seconds
+    logger.info("Starting %s webhook processing workers.", app_config.process_workers)
+    mp_context = multiprocessing.get_context('spawn')
+    if worker_log_queue is None:
+        worker_log_queue = WorkerLogQueue(logger, mp_context)
+    return ProcessPoolExecutor(
+        max_workers=app_config.process_workers,
+        mp_context=mp_context,
+        initializer=init_worker,
+        initargs=(
+            worker_log_queue.worker_config(), app_config.geofence_snapshot, app_config.geofence_grid_cell_size,
+            app_config.geofence_grid_max_cells, app_config.geofence_batch_lookup,
+        ),
+    )
+
+# Decode and classify a whole body on the event loop, returns the records to queue and how many messages were shed
+def process_body(body):
+    data = json.loads(body)
+    if not isinstance(data, list):
+        logger.error("Received data is not in list format")
+        return {}, 0
+    pending_messages, shed = decode_webhook_items(data, admission.shed_types())
+    geofence_index = geofence_cache.get('geofence_index')
+    # Deferred records are classified by the insert workers, with the geofences published before
+    if not geofence_index and not app_config.defer_classification:
+        item_logger.warning("No geofences available, dropped %s messages.", len(pending_messages))
+        return {}, shed
+    return classify_webhook_messages(pending_messages, geofence_index), shed
+
+# Same as process_body in a worker process, the counts it returns are added to the metrics here
+async def process_body_in_pool(body):
+    global pool_turn
+    previous_turn = pool_turn
+    turn = pool_turn = asyncio.get_running_loop().create_future()
+    try:
+        return await process_body_in_turn(body, previous_turn)
+    finally:
+        turn.set_result(None)
+
+# Bodies are done with in the order they arrived, so repeats and remembered areas are the ones the receiver
+# process would have found. Only the dedup and area memo step waits, not the work in the worker processes
+pool_turn = None
+
+async def wait_turn(previous_turn):
+    if previous_turn is not None:
+        await asyncio.shield(previous_turn)
+
+async def process_body_in_turn(body, previous_turn):
+    global payload_pool
+    if payload_pool is None:
+        await wait_turn(previous_turn)
+        return process_body(body)
+    shed_types = admission.shed_types()
+    try:
+        messages, counts, lookup_seconds = await asyncio.get_running_loop().run_in_executor(
+            payload_pool, process_payload, body, geofence_cache.get('geofence_version'), frozenset(shed_types),
+            app_config.defer_classification
+        )
+    except StaleGeofences:
+        # The snapshot is behind the geofences in use, it is saved again on the next change
+        item_logger.warning("Geofence snapshot is not the version in use, processing webhook in the receiver process.")
+        await wait_turn(previous_turn)
+        return process_body(body)
+    except BrokenProcessPool:
+        logger.error("A webhook processing worker died, restarting the workers.")
+        payload_pool.shutdown(wait=False)
+        payload_pool = start_payload_pool()
+        await wait_turn(previous_turn)
+        return process_body(body)
+    except ValueError as e:
+        logger.error("Failed to parse webhook body: %s", e)
+        return {}, 0
+
+    await wait_turn(previous_turn)
+
+    shed = 0
+    for (counter, item_type), count in counts.items():
+        if counter == 'received':
+            received_counts[item_type].inc(count)
+        elif counter == 'unsupported':
+            unsupported_count.inc(count)
+        elif counter == 'grid':
+            # Lookups of the worker's own geofence index
+            grid_lookup_counts[item_type].inc(count)
+        else:
+            filtered_counts[item_type, counter].inc(count)
+            if counter == 'shed':
+                admission.record_shed(item_type, count)
+                shed += count
+    for seconds in lookup_seconds:
+        geofence_lookup_seconds.observe(seconds)
+    return collect_pool_messages(messages), shed
+
+# Messages of a worker process go through the dedup filter and the area memo here, in the same order as
+# decode_webhook_items and classify_messages, so the records are the ones the receiver would have queued
+def collect_pool_messages(messages):
+    queued_records = {'pokemon': [], 'quest': [], 'raid': [], 'invasion': []}
+    kept_messages = []
+    for item_type, key, memo_key, geofence_name, row in messages:
+        dedup_filter = dedup_filters.get(item_type)
+        if dedup_filter is not None and key is not None and dedup_filter.seen(key):
+            filtered_counts[item_type, 'duplicate'].inc()
+            continue
+        if memo_key is not None and memo_key in area_memo:
+            memo_name = area_memo[memo_key]
+            if memo_name != geofence_name:
+                row = with_area(item_type, row, memo_name)
+            # Already remembered, nothing to store
+            kept_messages.append((item_type, None, memo_name, row))
+        else:
+            kept_messages.append((item_type, memo_key, geofence_name, row))
+
+    # Looked up areas are remembered once the whole payload was checked against the memo
+    for item_type, memo_key, geofence_name, row in kept_messages:
+        if memo_key is not None:
+            area_memo[memo_key] = geofence_name
+        if geofence_name is None and not app_config.defer_classification:
+            outside_geofence_counts[item_type].inc()
+            continue
+        queued_records[item_type].append(row)
+    return queued_records
+
+# Counted with the time they were added, so a restart replays them into the same hour
+def aggregate_pokemon(records, now=None):
+    now = int(time.time()) if now is None else now
+    aggregator.add(records, now)
+    if record_spool is not None:
+        aggregate_seqs.extend(record_spool.append(AGGREGATE_SPOOL_TYPE, [[now, records]]))
+
+# Spool accepted records before they are queued, so they survive a receiver crash
+def spool_records(item_type, records):
+    if record_spool is None:
+        return [None] * len(records)
+    return record_spool.append(item_type, records)
+
+def confirm_published(batch_seqs):
+    if record_spool is not None:
+        record_spool.ack(batch_seqs)
+
+def enqueue_records(item_type, records, seqs=None):
+    if not records:
+        return
+    if seqs is None:
+        seqs = spool_records(item_type, records)
+
+    if item_type == 'pokemon':
+        for filtered_data, seq in zip(records, seqs):
+            data_queue.append(filtered_data, seq)
+
+            if len(data_queue) >= app_config.max_queue_size:
+                process_full_queue()
+
+    elif item_type == 'quest':
+        for quest_data_to_store, seq in zip(records, seqs):
+            quests_data_queue.append(quest_data_to_store, seq)
+
+            # Logic for Queue or Time Based Queue
+            if len(quests_data_queue) >= app_config.max_quest_queue_size:
+                quest_process_full_queue()
+                logger.info("Processing Quest queue because it reached the maximum size of %s.", app_config.max_quest_queue_size)
+
+    elif item_type == 'raid':
+        for raid_data_to_store, seq in zip(records, seqs):
+            raids_data_queue.append(raid_data_to_store, seq)
+
+            # Logic for Queue or Time Based Queue
+            if len(raids_data_queue) >= app_config.max_raid_queue_size:
+                raid_process_full_queue()
+                logger.info("Processing Raid queue because it reached the maximum size of %s.", app_config.max_raid_queue_size)
+
+    elif item_type == 'invasion':
+        for invasion_data_to_store, seq in zip(records, seqs):
+            invasions_data_queue.append(invasion_data_to_store, seq)
+
+            # Logic for Queue or Time Based Queue
+            if len(invasions_data_queue) >= app_config.max_invasion_queue_size:
+                invasion_process_full_queue()
+                logger.info("Processing Invasion queue because it reached the maximum size of %s.", app_config.max_invasion_queue_size)
+
+# Queue the records a previous run spooled but never published
+def replay_spool():
+    replayed_records = {'pokemon': [], 'quest': [], 'raid': [], 'invasion': []}
+    replayed_aggregates = []
+    for item_type, record, seq in record_spool.replay():
+        if item_type == AGGREGATE_SPOOL_TYPE:
+            replayed_aggregates.append((record, seq))
+            continue
+        # Rows spooled by older versions have no location columns
+        record = tuple(record) + (None,) * (len(RECORD_FIELDS[item_type]) - len(record))
+        replayed_records[item_type].append((record, seq))
+    for item_type, replayed in replayed_records.items():
+        enqueue_records(item_type, [record for record, _ in replayed], [seq for _, seq in replayed])
+    for (now, rows), seq in replayed_aggregates:
+        rows = [tuple(row) for row in rows]
+        if aggregator is not None:
+            aggregator.add(rows, now)
+            aggregate_seqs.append(seq)
+        else:
+            # Aggregation was turned off since, they are stored as sightings instead
+            enqueue_records('pokemon', rows)
+            record_spool.ack([seq])
 
 async def validate_remote_addr(request: Request):
     if not app_config.allow_webhook_host:
@@ -166,611 +639,277 @@ async def validate_remote_addr(request: Request):
 def root_post_redirect():
     return RedirectResponse(url="/webhook", status_code=307)
 
+# Refuse the whole webhook when no record type is accepted, before its body is read
+def check_admission():
+    shed_types = admission.shed_types()
+    if not admission.rejects_all(shed_types):
+        return
+    status_code = 503 if publisher.failing else 429
+    admission.record_rejected(status_code)
+    item_logger.warning("Refusing webhook with %s, buffers are full. Shed types: %s", status_code, sorted(shed_types))
+    raise HTTPException(status_code=status_code, detail="Receiver buffers are full", headers={"Retry-After": str(admission.retry_after)})
+
 @webhook_processor.post("/webhook")
-async def receive_data(request: Request):
-    console_logger.debug(f"Received request on path: {request.url.path}")
-    file_logger.debug(f"Received request on path: {request.url.path}")
-    global data_queue, is_processing_queue, geofence_cache, quests_data_queue, is_quests_processing_queue, last_quests_processing_time, raids_data_queue, is_raids_processing_queue, last_raids_processing_time, invasions_data_queue, is_invasions_processing_queue, last_invasions_processing_time
+async def receive_data(request: Request, response: Response):
+    item_logger.debug("Received request on path: %s", request.url.path)
     await validate_remote_addr(request)
-    console_logger.debug(f"Queue size before processing: {len(data_queue)}")
-    file_logger.debug(f"Queue size before processing: {len(data_queue)}")
-    async with data_queue_lock:
-        data = await request.json()
-
-    geofences = geofence_cache.get('geofences', [])
-    if not geofences:
-        console_logger.info("No geofences matched.")
-        file_logger.info("No geofences matched.")
+    check_admission()
+    item_logger.debug("Queue size before processing: %s", len(data_queue))
+    geofence_index = geofence_cache.get('geofence_index')
+    if not geofence_index and not app_config.defer_classification:
+        logger.info("No geofences matched.")
         return {"status": "info", "message": "No geofences available"}
 
-    # Raid filters
-    def raid_filter_criteria(message):
-        raid_required_fields = [
-            'gym_id', 'ex_raid_eligible', 'is_exclusive', 'level', 'pokemon_id', 'form', 'costume', 'latitude', 'longitude'
-        ]
-        return all(message.get(raid_field) is not None for raid_field in raid_required_fields)
-
-    # Invasion filters
-    def invasion_filter_criteria(message):
-        invasion_required_fields = [
-            'display_type', 'character', 'confirmed', 'pokestop_id', 'latitude', 'longitude'
-        ]
-        return all(message.get(invasion_field) is not None for invasion_field in invasion_required_fields)
-
-    # Quest filters
-    def quest_filter_criteria(message):
-        # Check for mandatory fields: type, with_ar, latitude, and longitude
-        basic_checks = all(key in message for key in ['type', 'with_ar', 'latitude', 'longitude'])
-
-        # Initialize rewards_check to False to ensure it must pass checks to turn True
-        rewards_check = False
-        if 'rewards' in message and isinstance(message['rewards'], list) and len(message['rewards']) > 0:
-            for reward in message['rewards']:
-                # Each reward must have a type and an info dictionary
-                if 'type' in reward and 'info' in reward:
-                    info = reward['info']
-                    # Each info must have either (pokemon_id and form_id) or (item_id and amount)
-                    if ('pokemon_id' in info) or ('item_id' in info and 'amount' in info) or ('amount' in info):
-                        rewards_check = True
-                    else:
-                        # If any reward does not meet the criteria, fail the check and stop looping
-                        rewards_check = False
-                        break
-                else:
-                    # If any reward does not have the correct structure, fail the check and stop looping
-                    rewards_check = False
-                    break
-
-        return basic_checks and rewards_check
-
-    # Extract quest rewards information
-    def extract_quest_rewards(quest_rewards):
-        extracted_rewards = []  # Use a list to store information about each reward
-
-        for reward in quest_rewards:
-            reward_info = reward.get('info', {})
-            reward_data = {
-                'reward_type': reward.get('type'),  # Always extract the reward type
-                'pokemon_id': reward_info.get('pokemon_id'),
-                'form_id': reward_info.get('form_id'),
-                'item_id': reward_info.get('item_id'),
-                'amount': reward_info.get('amount')
-            }
-
-            # Keep None values, as they will be stored as NULL in the database
-            extracted_rewards.append(reward_data)
-
-        return extracted_rewards
-
-    # Pokémon filters
-    def filter_criteria(message):
-        required_fields = [
-            'pokemon_id', 'form', 'latitude', 'longitude',
-            'individual_attack', 'individual_defense', 'individual_stamina'
-        ]
-        return all(message.get(field) is not None for field in required_fields)
-
-    def extract_pvp_ranks(pvp_data):
-        ranks = {f'pvp_{category}_rank': None for category in ['great', 'little', 'ultra']}
-        if pvp_data:
-            for category in ['great', 'little', 'ultra']:
-                category_data = pvp_data.get(category, [])
-                ranks[f'pvp_{category}_rank'] = 1 if any(entry.get('rank') == 1 for entry in category_data) else None
-        return ranks
+    if pipeline:
+        return await accept_webhook(request, response)
 
     # Webhook logic
-    if isinstance(data, list):
-        for item in data:
-            # Pokémon Logic
-            if item.get('type') == 'pokemon':
-                message = item.get('message', {})
-                if filter_criteria(message):
-                    lat, lon = message.get('latitude'), message.get('longitude')
-                    inside, geofence_name = is_inside_geofence(lat, lon, geofences)
-                    if inside:
-                        ind_attack = message['individual_attack']
-                        ind_defense = message['individual_defense']
-                        ind_stamina = message['individual_stamina']
-
-                        if ind_attack == ind_defense == ind_stamina == 15:
-                            iv_value = 100
-                        elif ind_attack == ind_defense == ind_stamina == 0:
-                            iv_value = 0
-                        else:
-                            iv_value = None
-
-                        despawn_time = calculate_despawn_time(
-                            message.get('disappear_time'),
-                            message.get('first_seen')
-                        )
-                        filtered_data = {
-                            'pokemon_id': message['pokemon_id'],
-                            'form': message['form'],
-                            'latitude': lat,
-                            'longitude': lon,
-                            'iv': iv_value,
-                            **extract_pvp_ranks(message.get('pvp', {})),
-                            'shiny':message['shiny'],
-                            'area_name': geofence_name,
-                            'despawn_time': despawn_time
-                        }
-
-                        item_unique_id = generate_unique_id(filtered_data)
-                        data_queue.append((filtered_data, item_unique_id))
-
-                        if len(data_queue) >= app_config.max_queue_size and not is_processing_queue:
-                            is_processing_queue = True
-                            process_full_queue()
-                else:
-                    console_logger.debug("Pokemon Data did not meet filter criteria")
-                    file_logger.debug("Pokemon Data did not meet filter criteria")
-
-            # Quest Logic
-            elif item.get('type') == 'quest':
-                message = item.get('message', {})
-                # Log the Raw Quest Data
-                console_logger.debug(f"Raw Quest Received: {message}")
-                file_logger.debug(f"Raw Quest received: {message}")
-                if quest_filter_criteria(message):
-                    lat, lon = message.get('latitude'), message.get('longitude')
-                    inside, geofence_name = is_inside_geofence(lat, lon, geofences)
-                    if inside:
-                        rewards_extracted = extract_quest_rewards(message.get('rewards', []))
-                        quest_data_to_store = {
-                            'pokestop_id': message.get('pokestop_id'),
-                            'area_name': geofence_name,
-                            # Initialize as None by default
-                            'ar_type': None,
-                            'normal_type': None,
-                            'reward_ar_type': None,
-                            'reward_normal_type': None,
-                            'reward_ar_item_id': None,
-                            'reward_ar_item_amount': None,
-                            'reward_normal_item_id': None,
-                            'reward_normal_item_amount': None,
-                            'reward_ar_poke_id': None,
-                            'reward_ar_poke_form': None,
-                            'reward_normal_poke_id': None,
-                            'reward_normal_poke_form': None,
-                        }
-                        # Determine AR or Normal
-                        quest_type_field = 'ar_type' if message.get('with_ar') else 'normal_type'
-                        quest_data_to_store[quest_type_field] = message.get('type')
-
-                        # Process rewards
-                        for reward in rewards_extracted:
-                            reward_prefix = 'reward_ar_' if message.get('with_ar') else 'reward_normal_'
-                            if 'pokemon_id' in reward:
-                                quest_data_to_store[f'{reward_prefix}poke_id'] = reward.get('pokemon_id')
-                                quest_data_to_store[f'{reward_prefix}poke_form'] = reward.get('form_id', None)
-                            if 'item_id' in reward:
-                                quest_data_to_store[f'{reward_prefix}item_id'] = reward.get('item_id')
-                                quest_data_to_store[f'{reward_prefix}item_amount'] = reward.get('amount', None)
-                            elif 'amount' in reward and not ('pokemon_id' in reward or 'item_id' in reward):
-                                quest_data_to_store[f'{reward_prefix}item_amount'] = reward.get('amount')
-
-                            # Update reward_ar_type or reward_normal_type based on the reward type and with_ar value
-                            if message.get('with_ar'):
-                                quest_data_to_store['reward_ar_type'] = reward.get('reward_type')
-                            else:
-                                quest_data_to_store['reward_normal_type'] = reward.get('reward_type')
-                            # Break if theres more then one reward per quest
-                            break
-
-                        # Generate unique ID for quests
-                        quest_unique_id = generate_unique_id(quest_data_to_store)
-                        quests_data_queue.append((quest_data_to_store, quest_unique_id))
-
-                        # Calculate time checker for time based task
-                        now = datetime.now()
-                        time_since_last_process = (now - last_quests_processing_time).total_seconds()
-
-                        # Logic for Queue or Time Based Queue
-                        if len(quests_data_queue) >= app_config.max_quest_queue_size and not is_quests_processing_queue:
-                            is_quests_processing_queue = True
-                            quest_process_full_queue()
-                            last_quests_processing_time = now
-                            console_logger.info(f"Processing Quest queue because it reached the maximum size of {app_config.max_quest_queue_size}.")
-                            file_logger.info(f"Processing Quest queue because it reached the maximum size of {app_config.max_quest_queue_size}.")
-
-                else:
-                    console_logger.debug("Quest Data did not meet filter criteria")
-                    file_logger.debug("Quest Data did not meet filter criteira")
-
-            # Raid logic
-            elif item.get('type') == 'raid':
-                message = item.get('message', {})
-                if raid_filter_criteria(message) and message['pokemon_id'] not in (None, 0):
-                    lat, lon = message.get('latitude'), message.get('longitude')
-                    inside, geofence_name = is_inside_geofence(lat, lon, geofences)
-                    if inside:
-                        raid_data_to_store = {
-                            'gym_id': message['gym_id'],
-                            'ex_raid_eligible': message['ex_raid_eligible'],
-                            'is_exclusive': message['is_exclusive'],
-                            'level': message['level'],
-                            'pokemon_id': message['pokemon_id'],
-                            'form': message['form'],
-                            'costume': message['costume'],
-                            'area_name': geofence_name,
-                        }
-
-                        # Generate unique ID for Raids
-                        raid_unique_id = generate_unique_id(raid_data_to_store)
-                        raids_data_queue.append((raid_data_to_store, raid_unique_id))
-
-                        # Calculate time checker for time based task
-                        now = datetime.now()
-                        time_since_last_process = (now - last_raids_processing_time).total_seconds()
-
-                        # Logic for Queue or Time Based Queue
-                        if len(raids_data_queue) >= app_config.max_raid_queue_size and not is_raids_processing_queue:
-                            is_raids_processing_queue = True
-                            raid_process_full_queue()
-                            last_raids_processing_time = now
-                            console_logger.info(f"Processing Raid queue because it reached the maximum size of {app_config.max_raid_queue_size}.")
-                            file_logger.info(f"Processing Raid queue because it reached the maximum size of {app_config.max_raid_queue_size}.")
-                else:
-                    console_logger.debug("Raid Data did not meet filter criteria")
-                    file_logger.debug("Raid Data did not meet filter criteira")
-
-            # Invasion logic
-            elif item.get('type') == 'invasion':
-                message = item.get('message', {})
-                if invasion_filter_criteria(message):
-                    lat, lon = message.get('latitude'), message.get('longitude')
-                    inside, geofence_name = is_inside_geofence(lat, lon, geofences)
-                    if inside:
-                        invasion_data_to_store = {
-                            'pokestop_id': message['pokestop_id'],
-                            'display_type': message['display_type'],
-                            'character': message['character'],
-                            'confirmed': message['confirmed'],
-                            'area_name': geofence_name,
-                        }
-
-                        # Generate unique ID for Invasions
-                        invasion_unique_id = generate_unique_id(invasion_data_to_store)
-                        invasions_data_queue.append((invasion_data_to_store, invasion_unique_id))
-
-                        # Calculate time checker for time based task
-                        now = datetime.now()
-                        time_since_last_invasion_process = (now - last_invasions_processing_time).total_seconds()
-
-                        # Logic for Queue or Time Based Queue
-                        if len(invasions_data_queue) >= app_config.max_invasion_queue_size and not is_invasions_processing_queue:
-                            is_invasions_processing_queue = True
-                            invasion_process_full_queue()
-                            last_invasions_processing_time = now
-                            console_logger.info(f"Processing Invasion queue because it reached the maximum size of {app_config.max_invasion_queue_size}.")
-                            file_logger.info(f"Processing Invasion queue because it reached the maximum size of {app_config.max_invasion_queue_size}.")
-                    else:
-                        console_logger.debug("Invasion Data did not meet filter criteria")
-                        file_logger.debug("Invasion Data did not meet filter criteira")
-
-            else:
-                console_logger.debug(f"Unsupported data type found in payload: {item.get('type')}")
-                file_logger.debug(f"Unsupported data type found in payload: {item.get('type')}")
-    else:
-        console_logger.error("Received data is not in list format")
-        file_logger.error("Received data is not in list format")
-
-    # Time check conditions
-    now = datetime.now()
-
-    # Check Quests Time Condition
-    console_logger.info("Checking Quests Time Condition...")
-    file_logger.info("Checking Quests Time Condition...")
-    if not is_quests_processing_queue and len(quests_data_queue) > 0:
-        time_since_last_quest_process = (now - last_quests_processing_time).total_seconds()
-        if time_since_last_quest_process >= 1800:
-            is_quests_processing_queue = True
-            console_logger.info(f"Processing quest queue due to time condition met. Queue size: {len(quests_data_queue)}. Time since last process: {time_since_last_quest_process} seconds.")
-            file_logger.info(f"Processing quest queue due to time condition met. Queue size: {len(quests_data_queue)}. Time since last process: {time_since_last_quest_process} seconds.")
-            quest_process_full_queue()
-            last_quests_processing_time = now
-        else:
-            # When the time condition is not met
-            console_logger.info(f"Quest Time Condition not met. Time since last process: {time_since_last_quest_process} seconds. Queue size: {len(quests_data_queue)}.")
-            file_logger.info(f"Quest Time Condition not met. Time since last process: {time_since_last_quest_process} seconds. Queue size: {len(quests_data_queue)}.")
-    else:
-        # When the queue is empty or processing is already in progress
-        console_logger.info("Quest queue processing skipped. Queue is empty.")
-        file_logger.info("Quest queue processing skipped. Queue is empty.")
-
-    # Check Raids Time Condition
-    console_logger.info("Checking Raids Time Condition...")
-    file_logger.info("Checking Raids Time Condition...")
-    if not is_raids_processing_queue and len(raids_data_queue) > 0:
-        time_since_last_raid_process = (now - last_raids_processing_time).total_seconds()
-        if time_since_last_raid_process >= 1800:
-            is_raids_processing_queue = True
-            console_logger.info(f"Processing Raid queue due to time condition met. Queue size: {len(raids_data_queue)}. Time since last process: {time_since_last_raid_process} seconds.")
-            file_logger.info(f"Processing Raid queue due to time condition met. Queue size: {len(raids_data_queue)}. Time since last process: {time_since_last_raid_process} seconds.")
-            raid_process_full_queue()
-            last_raids_processing_time = now
-        else:
-            # When the time condition is not met
-            console_logger.info(f"Raid Time Condition not met. Time since last process: {time_since_last_raid_process} seconds. Queue size: {len(raids_data_queue)}.")
-            file_logger.info(f"Raid Time Condition not met. Time since last process: {time_since_last_raid_process} seconds. Queue size: {len(raids_data_queue)}.")
+    shed = 0
+    if payload_pool:
+        queued_records, shed = await process_body_in_pool(await request.body())
+        enqueue_classified(queued_records)
+    elif app_config.stream_parse:
+        # Classify the body in bounded slices while it is still arriving
+        items = []
+        try:
+            async for item in iter_webhook_items(request.stream(), app_config.stream_max_item_size):
+                items.append(item)
+                if len(items) >= app_config.stream_batch_size:
+                    shed += process_webhook_items(items, geofence_index)
+                    items = []
+        except WebhookStreamError as e:
+            logger.error("Failed to parse webhook body: %s", e)
+        if items:
+            shed += process_webhook_items(items, geofence_index)
     else:
-        # When the queue is empty or processing is already in progress
-        console_logger.info("Raid queue processing skipped. Queue is empty.")
-        file_logger.info("Raid queue processing skipped. Queue is empty.")
-
-    # Check Invasions Time Condition
-    console_logger.info("Checking Invasions Time Condition...")
-    file_logger.info("Checking Invasions Time Condition...")
-    if not is_invasions_processing_queue and len(invasions_data_queue) > 0:
-        time_since_last_invasion_process = (now - last_invasions_processing_time).total_seconds()
-        if time_since_last_invasion_process >= 1800:
-            is_invasions_processing_queue = True
-            console_logger.info(f"Processing Invasion queue due to time condition met. Queue size: {len(invasions_data_queue)}. Time since last process: {time_since_last_invasion_process} seconds.")
-            file_logger.info(f"Processing Invasion queue due to time condition met. Queue size: {len(invasions_data_queue)}. Time since last process: {time_since_last_invasion_process} seconds.")
-            invasion_process_full_queue()
-            last_invasions_processing_time = now
+        data = await request.json()
+        if isinstance(data, list):
+            shed += process_webhook_items(data, geofence_index)
         else:
-            # When the time condition is not met
-            console_logger.info(f"Invasion Time Condition not met. Time since last process: {time_since_last_invasion_process} seconds. Queue size: {len(invasions_data_queue)}.")
-            file_logger.info(f"Raid Time Condition not met. Time since last process: {time_since_last_invasion_process} seconds. Queue size: {len(invasions_data_queue)}.")
-    else:
-        # When the queue is empty or processing is already in progress
-        console_logger.info("Invasion queue processing skipped. Queue is empty.")
-        file_logger.info("Invasion queue processing skipped. Queue is empty.")
+            logger.error("Received data is not in list format")
 
     # Pokemon Queue Info
-    console_logger.info(f"Pokemon Queue size AFTER processing: {len(data_queue)}")
-    file_logger.info(f"Pokemon Queue size AFTER processing: {len(data_queue)}")
+    item_logger.info("Pokemon Queue size AFTER processing: %s", len(data_queue))
 
     # Quest Queue Info
-    console_logger.info(f"Quest Queue size AFTER processing: {len(quests_data_queue)}")
-    file_logger.info(f"Quest Queue size AFTER processing: {len(quests_data_queue)}")
+    item_logger.info("Quest Queue size AFTER processing: %s", len(quests_data_queue))
 
     # Raid Queue Info
-    console_logger.info(f"Raids Queue size AFTER processing: {len(raids_data_queue)}")
-    file_logger.info(f"Raids Queue size AFTER processing: {len(raids_data_queue)}")
+    item_logger.info("Raids Queue size AFTER processing: %s", len(raids_data_queue))
 
     # Invasion Queue Info
-    console_logger.info(f"Invasions Queue size AFTER processing: {len(invasions_data_queue)}")
-    file_logger.info(f"Invasions Queue size AFTER processing: {len(invasions_data_queue)}")
+    item_logger.info("Invasions Queue size AFTER processing: %s", len(invasions_data_queue))
 
+    if shed:
+        # Ask the scanner to slow down, the rest of the webhook was accepted
+        response.headers["Retry-After"] = str(admission.retry_after)
+        item_logger.warning("Shed %s messages, buffers are full. Shed types: %s", shed, sorted(admission.shed_types()))
+        return {"status": "success", "shed": shed}
     return {"status": "success"}
 
-# Invasion processing queue
-def invasion_process_full_queue():
-    global invasions_data_queue, is_invasions_processing_queue
-    console_logger.info(f"Starting Invasion full queue processing. Current Invasion queue size: {len(invasions_data_queue)}")
-    file_logger.info(f"Starting Invasion full queue processing. Current Invasion queue size: {len(invasions_data_queue)}")
-
-    retry_count = 0
-    while retry_count <= app_config.max_retries:
-        try:
-            current_invasion_batch_data = [item[0] for item in invasions_data_queue[:app_config.max_invasion_queue_size]]
-            current_invasion_batch_ids = [item[1] for item in invasions_data_queue[:app_config.max_invasion_queue_size]]
-            invasion_batch_unique_id = generate_unique_id(current_invasion_batch_ids)
-
-            insert_invasion_data_task.delay(current_invasion_batch_data, invasion_batch_unique_id)
-            console_logger.debug(f"Processed Invasion full queue with unique_id: {invasion_batch_unique_id}")
-            file_logger.debug(f"Processed Invasion full queue with unique_id: {invasion_batch_unique_id}")
-            invasions_data_queue = invasions_data_queue[app_config.max_invasion_queue_size:]
-            break
-        except Exception as e:
-            retry_count += 1
-            console_logger.error(f"Error processing Invasion queue on attempt {retry_count}: {e}")
-            file_logger.error(f"Error processing Invasion queue on attempt {retry_count}: {e}")
-            time.sleep(app_config.retry_delay)
-
-    if retry_count > app_config.max_retries:
-        console_logger.error("Maximum retry attempts reached. Unable to process Invasion queue")
-        file_logger.error("Maximum retry attempts reached. Unable to process Invasion queue")
-    is_invasions_processing_queue = False
-    console_logger.info(f"Finished Invasion queue processing. Updated Invasion queue size: {len(invasions_data_queue)}")
-    file_logger.info(f"Finished Invasion queue processing. Updated Invasion queue size: {len(invasions_data_queue)}")
+# Hand the raw body to the pipeline and answer right away
+async def accept_webhook(request, response):
+    body = await request.body()
+    if not pipeline.submit(body):
+        status_code = 503 if publisher.failing else 429
+        admission.record_rejected(status_code)
+        item_logger.warning("Refusing webhook with %s, the pipeline is full.", status_code)
+        raise HTTPException(status_code=status_code, detail="Receiver pipeline is full", headers={"Retry-After": str(admission.retry_after)})
+    response.status_code = 202
+    # Some types are shed, ask the scanner to slow down
+    if admission.shed_types():
+        response.headers["Retry-After"] = str(admission.retry_after)
+    return {"status": "accepted"}
+
+@webhook_processor.get("/metrics")
+async def receiver_metrics(request: Request):
+    await validate_remote_addr(request)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# Lookups of every geofence index so far, in the receiver and its worker processes
+def grid_lookup_stats():
+    stats = {f"{kind}_hits": grid_lookup_counts[kind].value for kind in GRID_HIT_KINDS}
+    total = sum(stats.values())
+    stats['hit_rate'] = (stats['inside_hits'] + stats['outside_hits']) / total if total else 0.0
+    geofence_index = geofence_cache.get('geofence_index')
+    stats['cell_size'] = geofence_index.grid_cell_size if geofence_index else None
+    return stats
+
+@webhook_processor.get("/stats")
+async def receiver_stats(request: Request):
+    await validate_remote_addr(request)
+    dedup_stats = {item_type: dedup_filter.stats() for item_type, dedup_filter in dedup_filters.items()}
+    checked = sum(stats['checked'] for stats in dedup_stats.values())
+    dropped = sum(stats['dropped'] for stats in dedup_stats.values())
+    return {
+        "queues": {queue.record_type: queue.stats() for queue, _, _, _ in flush_targets()},
+        "dedup": {"ratio": dropped / checked if checked else 0.0, "types": dedup_stats},
+        "admission": admission.stats(),
+        "pipeline": pipeline.stats() if pipeline else None,
+        "aggregator": dict(aggregator.stats(), unsent_flushes=len(unsent_aggregates)) if aggregator else None,
+        "geofence_grid": grid_lookup_stats(),
+        "publisher": {"batches": len(publisher), "failing": publisher.failing},
+    }
 
+# Invasion processing queue
+def invasion_process_full_queue(reason="full"):
+    logger.info("Starting Invasion full queue processing. Current Invasion queue size: %s, bytes: %s", len(invasions_data_queue), invasions_data_queue.nbytes)
+    handed_off = publisher.submit(invasions_data_queue, insert_invasion_data_task, "Invasion") is not None
+    logger.info("Handed off Invasion batch to the publisher. Updated Invasion queue size: %s", len(invasions_data_queue))
+    if handed_off:
+        queue_flushes.labels(invasions_data_queue.record_type, reason).inc()
+    return handed_off
 
 # Raid processing queue
-def raid_process_full_queue():
-    global raids_data_queue, is_raids_processing_queue
-    console_logger.info(f"Starting Raid full queue processing. Current Raid queue size: {len(raids_data_queue)}")
-    file_logger.info(f"Starting Raid full queue processing. Current Raid queue size: {len(raids_data_queue)}")
-
-    retry_count = 0
-    while retry_count <= app_config.max_retries:
-        try:
-            current_raid_batch_data = [item[0] for item in raids_data_queue[:app_config.max_raid_queue_size]]
-            current_raid_batch_ids = [item[1] for item in raids_data_queue[:app_config.max_raid_queue_size]]
-            raid_batch_unique_id = generate_unique_id(current_raid_batch_ids)
-
-            insert_raid_data_task.delay(current_raid_batch_data, raid_batch_unique_id)
-            console_logger.debug(f"Processed Raid full queue with unique_id: {raid_batch_unique_id}")
-            file_logger.debug(f"Processed Raid full queue with unique_id: {raid_batch_unique_id}")
-            raids_data_queue = raids_data_queue[app_config.max_raid_queue_size:]
-            break
-        except Exception as e:
-            retry_count += 1
-            console_logger.error(f"Error processing Raid queue on attempt {retry_count}: {e}")
-            file_logger.error(f"Error processing Raid queue on attempt {retry_count}: {e}")
-            time.sleep(app_config.retry_delay)
-
-    if retry_count > app_config.max_retries:
-        console_logger.error("Maximum retry attempts reached. Unable to process Raid queue")
-        file_logger.error("Maximum retry attempts reached. Unable to process Raid queue")
-    is_raids_processing_queue = False
-    console_logger.info(f"Finished Raid queue processing. Updated Raid queue size: {len(raids_data_queue)}")
-    file_logger.info(f"Finished Raid queue processing. Updated Raid queue size: {len(raids_data_queue)}")
+def raid_process_full_queue(reason="full"):
+    logger.info("Starting Raid full queue processing. Current Raid queue size: %s, bytes: %s", len(raids_data_queue), raids_data_queue.nbytes)
+    handed_off = publisher.submit(raids_data_queue, insert_raid_data_task, "Raid") is not None
+    logger.info("Handed off Raid batch to the publisher. Updated Raid queue size: %s", len(raids_data_queue))
+    if handed_off:
+        queue_flushes.labels(raids_data_queue.record_type, reason).inc()
+    return handed_off
 
 # Quest processing queue
-def quest_process_full_queue():
-    global quests_data_queue, is_quests_processing_queue
-    console_logger.info(f"Starting Quest full queue processing. Current Quest queue size: {len(quests_data_queue)}")
-    file_logger.info(f"Starting Quest full queue processing. Current Quest queue size: {len(quests_data_queue)}")
-
-    retry_count = 0
-    while retry_count <= app_config.max_retries:
-        try:
-            current_quest_batch_data = [item[0] for item in quests_data_queue[:app_config.max_quest_queue_size]]
-            current_quest_batch_ids = [item[1] for item in quests_data_queue[:app_config.max_quest_queue_size]]
-            quest_batch_unique_id = generate_unique_id(current_quest_batch_ids)
-
-            insert_quest_data_task.delay(current_quest_batch_data, quest_batch_unique_id)
-            console_logger.debug(f"Processed Quests full queue with unique_id: {quest_batch_unique_id}")
-            file_logger.debug(f"Processed Quests full queue with unique_id: {quest_batch_unique_id}")
-            quests_data_queue = quests_data_queue[app_config.max_quest_queue_size:]
-            break
-        except Exception as e:
-            retry_count += 1
-            console_logger.error(f"Error processing Quests queue on attempt {retry_count}: {e}")
-            file_logger.error(f"Error processing Quests queue on attempt {retry_count}: {e}")
-            time.sleep(app_config.retry_delay)
-
-    if retry_count > app_config.max_retries:
-        console_logger.error("Maximum retry attempts reached. Unable to process Quests queue")
-        file_logger.error("Maximum retry attempts reached. Unable to process Quests queue")
-    is_quests_processing_queue = False
-    console_logger.info(f"Finished Quests queue processing. Updated Quests queue size: {len(quests_data_queue)}")
-    file_logger.info(f"Finished Quests queue processing. Updated Quests queue size: {len(quests_data_queue)}")
+def quest_process_full_queue(reason="full"):
+    logger.info("Starting Quest full queue processing. Current Quest queue size: %s, bytes: %s", len(quests_data_queue), quests_data_queue.nbytes)
+    handed_off = publisher.submit(quests_data_queue, insert_quest_data_task, "Quests") is not None
+    logger.info("Handed off Quests batch to the publisher. Updated Quests queue size: %s", len(quests_data_queue))
+    if handed_off:
+        queue_flushes.labels(quests_data_queue.record_type, reason).inc()
+    return handed_off
 
 # Pokemon processing queue
-def process_full_queue():
-    global data_queue, is_processing_queue
-    console_logger.info(f"Starting Pokemon full queue processing. Current queue size: {len(data_queue)}")
-    file_logger.info(f"Starting Pokemon full queue processing. Current queue size: {len(data_queue)}")
-
-    retry_count = 0
-    while retry_count <= app_config.max_retries:
-        try:
-            current_batch_data = [item[0] for item in data_queue[:app_config.max_queue_size]]
-            current_batch_ids = [item[1] for item in data_queue[:app_config.max_queue_size]]
-            batch_unique_id = generate_unique_id(current_batch_ids)
-
-            insert_data_task.delay(current_batch_data, batch_unique_id)
-            console_logger.debug(f"Processed Pokemon full queue with unique_id: {batch_unique_id}")
-            file_logger.debug(f"Processed Pokemon full queue with unique_id: {batch_unique_id}")
-            data_queue = data_queue[app_config.max_queue_size:]
-            break
-        except Exception as e:
-            retry_count += 1
-            console_logger.error(f"Error processing Pokemon queue on attempt {retry_count}: {e}")
-            file_logger.error(f"Error processing Pokemon queue on attempt {retry_count}: {e}")
-            time.sleep(app_config.retry_delay)
-
-    if retry_count > app_config.max_retries:
-        console_logger.error("Maximum retry attempts reached. Unable to process Pokemon queue")
-        file_logger.error("Maximum retry attempts reached. Unable to process Pokemon queue")
-    is_processing_queue = False
-    console_logger.info(f"Finished Pokemon queue processing. Updated Pokemon queue size: {len(data_queue)}")
-    file_logger.info(f"Finished Pokemon queue processing. Updated Pokemon queue size: {len(data_queue)}")
-
-# Pokemon processing queue on shutdown
-async def process_remaining_queue_on_shutdown():
-    global data_queue
-    console_logger.debug("Processing remaining items in Pokemon queue before shutdown.")
-    file_logger.debug("Processing remaining items in Pokemon queue before shutdown.")
-    while data_queue:
-        try:
-            current_batch_data = [item[0] for item in data_queue[:app_config.max_queue_size]]
-            current_batch_ids = [item[1] for item in data_queue[:app_config.max_queue_size]]
-            batch_unique_id = generate_unique_id(current_batch_ids)
-
-            insert_data_task.delay(current_batch_data, batch_unique_id)
-            console_logger.debug(f"Processed Pokemon batch with unique_id: {batch_unique_id}")
-            file_logger.debug(f"Processed Pokemon batch with unique_id: {batch_unique_id}")
-
-            # Remove processed items from the queue
-            data_queue = data_queue[app_config.max_queue_size:]
-            console_logger.info(f"Processed and cleaned Pokemon queue -- Goodbye")
-            file_logger.info(f"Processed and cleaned Pokemon queue -- Goodbye")
-
-        except Exception as e:
-            console_logger.error(f"Error processing Pokemon batch during shutdown: {e}")
-            file_logger.error(f"Error processing Pokemon batch during shutdown: {e}")
-
-# Quest processing queue on shutdown
-async def process_remaining_quest_queue_on_shutdown():
-    global quests_data_queue
-    console_logger.debug("Processing remaining items in Quest queue before shutdown.")
-    file_logger.debug("Processing remaining items in Quest queue before shutdown.")
-    while quests_data_queue:
-        try:
-            current_batch_data = [item[0] for item in quests_data_queue[:app_config.max_quest_queue_size]]
-            current_batch_ids = [item[1] for item in quests_data_queue[:app_config.max_quest_queue_size]]
-            batch_unique_id = generate_unique_id(current_batch_ids)
-
-            insert_quest_data_task.delay(current_batch_data, batch_unique_id)
-            console_logger.debug(f"Processed Quest batch with unique_id: {batch_unique_id}")
-            file_logger.debug(f"Processed Quest batch with unique_id: {batch_unique_id}")
-
-            # Remove processed items from the queue
-            quests_data_queue = quests_data_queue[app_config.max_quest_queue_size:]
-            console_logger.info(f"Processed and cleaned Quest queue -- Goodbye")
-            file_logger.info(f"Processed and cleaned Quest queue -- Goodbye")
-
-        except Exception as e:
-            console_logger.error(f"Error processing Quest batch during shutdown: {e}")
-            file_logger.error(f"Error processing Quest batch during shutdown: {e}")
-
-# Raid processing queue on shutdown
-async def process_remaining_raid_queue_on_shutdown():
-    global raids_data_queue
-    console_logger.debug("Processing remaining items in Raid queue before shutdown.")
-    file_logger.debug("Processing remaining items in Raid queue before shutdown.")
-    while raids_data_queue:
+def process_full_queue(reason="full"):
+    logger.info("Starting Pokemon full queue processing. Current queue size: %s, bytes: %s", len(data_queue), data_queue.nbytes)
+    handed_off = publisher.submit(data_queue, insert_data_task, "Pokemon") is not None
+    logger.info("Handed off Pokemon batch to the publisher. Updated Pokemon queue size: %s", len(data_queue))
+    if handed_off:
+        queue_flushes.labels(data_queue.record_type, reason).inc()
+    return handed_off
+
+# Queues checked by the flusher, with the maximum age of their oldest record
+def flush_targets():
+    return [
+        (data_queue, app_config.pokemon_max_age, process_full_queue, "Pokemon"),
+        (quests_data_queue, app_config.quest_max_age, quest_process_full_queue, "Quest"),
+        (raids_data_queue, app_config.raid_max_age, raid_process_full_queue, "Raid"),
+        (invasions_data_queue, app_config.invasion_max_age, invasion_process_full_queue, "Invasion"),
+    ]
+
+# Flush every queue that is full, too old, or when too much is buffered overall
+def flush_due_queues():
+    total_buffered = sum(len(queue) for queue, _, _, _ in flush_targets())
+    over_threshold = total_buffered >= app_config.extra_flush_threshold
+    # With several workers the threshold applies to all of them together
+    if multiworker.worker_state:
+        over_threshold = multiworker.worker_state.flush_requested() or over_threshold
+    for queue, max_age, process_queue, label in flush_targets():
+        while queue:
+            oldest_age = queue.oldest_age()
+            if queue.is_full():
+                reason = f"it reached the maximum size of {queue.batch_size}"
+                flush_reason = "full"
+            elif over_threshold:
+                reason = f"{total_buffered} records are buffered in total"
+                flush_reason = "threshold"
+            elif oldest_age >= max_age:
+                reason = f"its oldest record waited {oldest_age:.0f} seconds"
+                flush_reason = "age"
+            else:
+                break
+            logger.info("Flushing %s queue because %s. Queue size: %s.", label, reason, len(queue))
+            # A failed batch is requeued, try again on the next check
+            if not process_queue(flush_reason):
+                break
+    if multiworker.worker_state:
+        multiworker.worker_state.report_buffered(sum(len(queue) for queue, _, _, _ in flush_targets()))
+
+async def flush_queues():
+    last_aggregate_flush = time.monotonic()
+    while True:
+        await asyncio.sleep(app_config.flush_check_interval)
         try:
-            current_batch_data = [item[0] for item in raids_data_queue[:app_config.max_raid_queue_size]]
-            current_batch_ids = [item[1] for item in raids_data_queue[:app_config.max_raid_queue_size]]
-            batch_unique_id = generate_unique_id(current_batch_ids)
-
-            insert_raid_data_task.delay(current_batch_data, batch_unique_id)
-            console_logger.debug(f"Processed Raid batch with unique_id: {batch_unique_id}")
-            file_logger.debug(f"Processed Raid batch with unique_id: {batch_unique_id}")
-
-            # Remove processed items from the queue
-            raids_data_queue = raids_data_queue[app_config.max_raid_queue_size:]
-            console_logger.info(f"Processed and cleaned Raid queue -- Goodbye")
-            file_logger.info(f"Processed and cleaned Raid queue -- Goodbye")
-
+            flush_due_queues()
         except Exception as e:
-            console_logger.error(f"Error processing Raid batch during shutdown: {e}")
-            file_logger.error(f"Error processing Raid batch during shutdown: {e}")
-
-# Invasion processing queue on shutdown
-async def process_remaining_invasion_queue_on_shutdown():
-    global invasions_data_queue
-    console_logger.debug("Processing remaining items in Invasion queue before shutdown.")
-    file_logger.debug("Processing remaining items in Invasion queue before shutdown.")
-    while invasions_data_queue:
+            logger.error("Error flushing queues: %s", e)
+        if aggregator is not None and time.monotonic() - last_aggregate_flush >= app_config.aggregation_flush_interval:
+            last_aggregate_flush = time.monotonic()
+            await flush_aggregates()
+
+# Send the counters since the last flush as one upsert task, they are kept for the next one when that fails
+async def flush_aggregates():
+    global aggregate_flushes, aggregate_seqs
+    deltas = aggregator.pop_deltas()
+    seqs, aggregate_seqs = aggregate_seqs, []
+    if deltas:
+        aggregate_flushes += 1
+        unsent_aggregates.append((f"{INSTANCE_ID}:aggregates:{aggregate_flushes}", deltas, seqs))
+    # Oldest first, the ones after a failure wait for the next flush
+    while unsent_aggregates:
+        unique_id, deltas, seqs = unsent_aggregates[0]
         try:
-            current_batch_data = [item[0] for item in invasions_data_queue[:app_config.max_invasion_queue_size]]
-            current_batch_ids = [item[1] for item in invasions_data_queue[:app_config.max_invasion_queue_size]]
-            batch_unique_id = generate_unique_id(current_batch_ids)
-
-            insert_invasion_data_task.delay(current_batch_data, batch_unique_id)
-            console_logger.debug(f"Processed Invasion batch with unique_id: {batch_unique_id}")
-            file_logger.debug(f"Processed Invasion batch with unique_id: {batch_unique_id}")
-
-            # Remove processed items from the queue
-            invasions_data_queue = invasions_data_queue[app_config.max_invasion_queue_size:]
-            console_logger.info(f"Processed and cleaned Invasion queue -- Goodbye")
-            file_logger.info(f"Processed and cleaned Invasion queue -- Goodbye")
-
+            await asyncio.get_running_loop().run_in_executor(publisher.executor, upsert_aggregates_task.delay, deltas, unique_id)
         except Exception as e:
-            console_logger.error(f"Error processing Invasion batch during shutdown: {e}")
-            file_logger.error(f"Error processing Invasion batch during shutdown: {e}")
+            logger.error("Failed to send %s Pokemon aggregate rows, sent again on the next flush: %s", len(deltas), e)
+            return False
+        unsent_aggregates.pop(0)
+        confirm_published(seqs)
+        aggregate_upserts.inc()
+        logger.debug("Sent %s Pokemon aggregate rows with unique_id: %s", len(deltas), unique_id)
+    return True
+
+# Processing remaining items of a queue on shutdown
+async def process_remaining_queue_on_shutdown(queue, insert_task, label):
+    logger.debug("Processing remaining items in %s queue before shutdown.", label)
+    while queue:
+        current_batch_data, current_batch_ids, current_batch_seqs = queue.pop_batch()
+        if not await publisher.publish(queue, current_batch_data, current_batch_ids, current_batch_seqs, insert_task, label):
+            logger.error("Unable to process %s queue during shutdown. %s items left in queue.", label, len(queue))
+            return
+    logger.info("Processed and cleaned %s queue -- Goodbye", label)
 
 @webhook_processor.on_event("shutdown")
 async def shutdown_event():
-    global refresh_task
-    console_logger.info("Application shutdown initiated.")
-    file_logger.info("Application shutdown initiated.")
-    # Cancel refresh task during shutdown
+    global refresh_task, flush_task, record_spool, payload_pool, worker_log_queue
+    logger.info("Application shutdown initiated.")
+    # Cancel refresh and flush tasks during shutdown
     if refresh_task:
         refresh_task.cancel()
+    if flush_task:
+        flush_task.cancel()
+    # Webhooks already answered are queued before the queues are drained
+    if pipeline:
+        await pipeline.join()
+        pipeline.stop()
+    if payload_pool:
+        await asyncio.to_thread(payload_pool.shutdown)
+        payload_pool = None
+    if worker_log_queue is not None:
+        worker_log_queue.stop()
+        worker_log_queue = None
+    # Batches already handed off are published first, failed ones are back in their queues by then
+    await publisher.drain()
     # Ensure all remaining items in the queue are processed
     async with data_queue_lock:
-        await process_remaining_queue_on_shutdown()
+        await process_remaining_queue_on_shutdown(data_queue, insert_data_task, "Pokemon")
     async with quests_data_queue_lock:
-        await process_remaining_quest_queue_on_shutdown()
+        await process_remaining_queue_on_shutdown(quests_data_queue, insert_quest_data_task, "Quest")
     async with raids_data_queue_lock:
-        await process_remaining_raid_queue_on_shutdown()
+        await process_remaining_queue_on_shutdown(raids_data_queue, insert_raid_data_task, "Raid")
     async with invasions_data_queue_lock:
-        await process_remaining_invasion_queue_on_shutdown()
+        await process_remaining_queue_on_shutdown(invasions_data_queue, insert_invasion_data_task, "Invasion")
+    if aggregator is not None and not await flush_aggregates():
+        unsent_keys = sum(len(deltas) for _, deltas, _ in unsent_aggregates)
+        if record_spool is not None:
+            logger.warning("Pokemon aggregates of %s keys left in the spool for the next start.", unsent_keys)
+        else:
+            logger.error("Pokemon aggregates of %s keys were lost on shutdown.", unsent_keys)
+    publisher.shutdown()
+    # Records that could not be published stay spooled for the next start
+    if record_spool is not None:
+        if record_spool.pending():
+            logger.warning("%s records left in the spool for the next start.", record_spool.pending())
+        record_spool.close()
+        record_spool = None
+    if multiworker.worker_state:
+        multiworker.worker_state.report_buffered(sum(len(queue) for queue, _, _, _ in flush_targets()))
@@ -0,0 +1,17 @@
+import socket
+from config.app_config import app_config
+from processor.stream_writer import StreamWriter
+from processor.tasks import redis_client, db_config, worker_geofences
+
+if __name__ == "__main__":
+    writer = StreamWriter(
+        redis_client,
+        db_config,
+        consumer_name=app_config.stream_writer_name or socket.gethostname(),
+        batch_size=app_config.stream_writer_batch_size,
+        max_wait=app_config.stream_writer_max_wait,
+        claim_idle=app_config.stream_writer_claim_idle,
+        retry_delay=app_config.retry_delay,
+        geofences=worker_geofences
+    )
+    writer.run()
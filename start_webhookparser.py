@@ -1,5 +1,16 @@
+import logging
+import socket
 import uvicorn
 from config.app_config import app_config
+from receiver.multiworker import ReceiverSupervisor
 
 if __name__ == "__main__":
-    uvicorn.run("receiver.webhookparser:webhook_processor", host=app_config.receiver_host, port=app_config.receiver_port, workers=app_config.receiver_workers)
\ No newline at end of file
+    if app_config.receiver_reuse_port and app_config.receiver_workers > 1 and hasattr(socket, "SO_REUSEPORT"):
+        logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
+        ReceiverSupervisor(
+            app_config.receiver_workers, app_config.receiver_host, app_config.receiver_port,
+            app_config.extra_flush_threshold, check_interval=app_config.flush_check_interval,
+            shutdown_timeout=app_config.receiver_shutdown_timeout,
+        ).run()
+    else:
+        uvicorn.run("receiver.webhookparser:webhook_processor", host=app_config.receiver_host, port=app_config.receiver_port, workers=app_config.receiver_workers)
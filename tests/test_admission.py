@@ -0,0 +1,93 @@
+import importlib
+import json
+import os
+import pytest
+from fastapi import HTTPException
+from receiver.admission import AdmissionController
+
+RECORD_TYPES = ('pokemon', 'quest', 'raid', 'invasion')
+
+
+class FakeBuffer:
+    def __init__(self, records=0, nbytes=0):
+        self.records = records
+        self.nbytes = nbytes
+
+    def buffered(self):
+        return self.records, self.nbytes
+
+
+def controller(limits=None, **kwargs):
+    buffers = {record_type: FakeBuffer() for record_type in RECORD_TYPES}
+    return AdmissionController(buffers, limits or {}, **kwargs)
+
+
+def test_types_over_their_limits_are_shed():
+    admission = controller({'pokemon': (100, 0), 'quest': (0, 1000)})
+    assert admission.shed_types() == set()
+    admission.buffers['pokemon'].records = 100
+    admission.buffers['quest'].nbytes = 999
+    admission.buffers['raid'].records = 10 ** 6
+    assert admission.shed_types() == {'pokemon'}
+    admission.buffers['quest'].nbytes = 1000
+    assert admission.shed_types() == {'pokemon', 'quest'}
+
+def test_lowest_priority_types_are_shed_first():
+    admission = controller(max_bytes=1000, shed_order=('invasion', 'quest'), shed_start=0.7)
+    assert admission.shed_thresholds == pytest.approx({'invasion': 700, 'quest': 800, 'pokemon': 900, 'raid': 1000})
+    admission.buffers['pokemon'].nbytes = 699
+    assert admission.shed_types() == set()
+    admission.buffers['raid'].nbytes = 101
+    assert admission.shed_types() == {'invasion', 'quest'}
+    admission.buffers['raid'].nbytes = 301
+    assert admission.rejects_all(admission.shed_types())
+
+def test_stats_count_shed_messages_and_rejected_webhooks():
+    admission = controller({'raid': (1, 0)})
+    admission.buffers['raid'].records = 1
+    admission.record_shed('raid', 3)
+    admission.record_rejected(429)
+    admission.record_rejected(429)
+    admission.record_rejected(503)
+    assert admission.stats() == {
+        'shed_types': ['raid'],
+        'shed': {'pokemon': 0, 'quest': 0, 'raid': 3, 'invasion': 0},
+        'rejected': {429: 2, 503: 1},
+    }
+
+
+# The receiver reads its config on import, without a config.json the example one is used like the benchmarks do
+@pytest.fixture
+def webhookparser(tmp_path, monkeypatch):
+    if not os.path.exists('config/config.json') and 'PSYDUCK_CONFIG' not in os.environ:
+        with open('config/config.example.json') as example_file:
+            example_config = json.load(example_file)
+        example_config['database']['PORT'] = '3306'
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps(example_config))
+        monkeypatch.setenv('PSYDUCK_CONFIG', str(config_path))
+    webhookparser = importlib.import_module('receiver.webhookparser')
+    full = controller({record_type: (1, 0) for record_type in RECORD_TYPES}, retry_after=12)
+    for buffer in full.buffers.values():
+        buffer.records = 1
+    monkeypatch.setattr(webhookparser, 'admission', full)
+    monkeypatch.setattr(webhookparser.publisher, 'failing', False)
+    return webhookparser
+
+def test_full_buffers_refuse_webhooks_with_429(webhookparser):
+    with pytest.raises(HTTPException) as refused:
+        webhookparser.check_admission()
+    assert refused.value.status_code == 429
+    assert refused.value.headers == {'Retry-After': '12'}
+
+def test_full_buffers_refuse_webhooks_with_503_while_publishing_fails(webhookparser):
+    webhookparser.publisher.failing = True
+    with pytest.raises(HTTPException) as refused:
+        webhookparser.check_admission()
+    assert refused.value.status_code == 503
+    assert webhookparser.admission.stats()['rejected'] == {503: 1}
+
+def test_webhooks_are_accepted_while_one_type_is_not_shed(webhookparser):
+    webhookparser.admission.buffers['raid'].records = 0
+    webhookparser.check_admission()
+    assert webhookparser.admission.stats()['rejected'] == {}
@@ -0,0 +1,87 @@
+from processor.batches import AGGREGATE_FIELDS
+from processor.inserts import upsert_aggregates, AGGREGATE_UPSERT_QUERY
+from receiver.aggregator import PokemonAggregator, BUCKET_SECONDS
+
+# 2024-01-01 10:00:00 UTC
+HOUR = 1704103200
+
+
+def pokemon(pokemon_id=1, form=0, iv=50.0, great=None, little=None, ultra=None, shiny=False, area='A', despawn=None):
+    return (pokemon_id, form, 1.0, 2.0, iv, great, little, ultra, shiny, area, despawn)
+
+def counters(delta):
+    return dict(zip(AGGREGATE_FIELDS, delta[4:-1]))
+
+
+def test_pokemon_count_in_the_quarter_hour_they_are_added():
+    aggregator = PokemonAggregator()
+    aggregator.add([pokemon()], now=HOUR + 10)
+    aggregator.add([pokemon()], now=HOUR + BUCKET_SECONDS - 1)
+    aggregator.add([pokemon()], now=HOUR + BUCKET_SECONDS)
+    deltas = sorted(aggregator.pop_deltas())
+    assert [(delta[0], delta[4], delta[-1]) for delta in deltas] == [(HOUR, 2, HOUR + 10), (HOUR + BUCKET_SECONDS, 1, HOUR + BUCKET_SECONDS)]
+
+def test_counters_match_the_sightings():
+    aggregator = PokemonAggregator()
+    aggregator.add([
+        pokemon(iv=100, little=1, shiny=True, despawn=299),
+        pokemon(iv=0, great=1, ultra=1, despawn=3300),
+        pokemon(despawn=None),
+        pokemon(area='B'),
+        pokemon(form=1),
+    ], now=HOUR)
+    deltas = {tuple(delta[1:4]): delta for delta in aggregator.pop_deltas()}
+    assert set(deltas) == {('A', 1, '0'), ('B', 1, '0'), ('A', 1, '1')}
+    counts = counters(deltas['A', 1, '0'])
+    assert counts['total'] == 3
+    assert (counts['total_iv100'], counts['total_iv0'], counts['total_shiny']) == (1, 1, 1)
+    assert (counts['total_top1_little'], counts['total_top1_great'], counts['total_top1_ultra']) == (1, 1, 1)
+    assert (counts['sum_lat'], counts['sum_lon']) == (3.0, 6.0)
+    assert (counts['sum_despawn'], counts['count_despawn']) == (3599, 2)
+    assert (counts['tth_5'], counts['tth_55'], counts['tth_55_plus']) == (1, 0, 1)
+
+def test_flushes_start_over():
+    aggregator = PokemonAggregator()
+    aggregator.add([pokemon(), pokemon()], now=HOUR)
+    assert len(aggregator.pop_deltas()) == 1
+    assert aggregator.pop_deltas() == []
+    aggregator.add([pokemon()], now=HOUR + 60)
+    (delta,) = aggregator.pop_deltas()
+    assert counters(delta)['total'] == 1 and delta[-1] == HOUR + 60
+    assert aggregator.stats() == {'keys': 0, 'aggregated': 3}
+
+
+class FakeCursor:
+    def __init__(self, applied=()):
+        self.applied = set(applied)
+        self.rows = []
+        self.hours = None
+
+    def execute(self, query, args):
+        if query.startswith('INSERT IGNORE'):
+            if args[0] in self.applied:
+                return 0
+            self.applied.add(args[0])
+            return 1
+        self.hours = tuple(f"hour of {bucket}" for bucket in args)
+        return 1
+
+    def fetchone(self):
+        return self.hours
+
+    def executemany(self, query, rows):
+        assert query == AGGREGATE_UPSERT_QUERY
+        self.rows += rows
+
+
+def test_flushes_are_upserted_once_under_their_hour():
+    aggregator = PokemonAggregator()
+    aggregator.add([pokemon()], now=HOUR)
+    aggregator.add([pokemon()], now=HOUR + BUCKET_SECONDS)
+    deltas = aggregator.pop_deltas()
+    cursor = FakeCursor()
+    assert upsert_aggregates(cursor, deltas, 'flush-1') == 2
+    assert sorted(row[0] for row in cursor.rows) == [f"hour of {HOUR}", f"hour of {HOUR + BUCKET_SECONDS}"]
+    assert all(len(row) == 5 + len(AGGREGATE_FIELDS) for row in cursor.rows)
+    assert upsert_aggregates(cursor, deltas, 'flush-1') is None
+    assert len(cursor.rows) == 2
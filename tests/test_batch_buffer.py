@@ -0,0 +1,38 @@
+from receiver.batch_buffer import BatchBuffer, SIZE_SAMPLE, record_size
+
+
+def fill(buffer, count):
+    for index in range(count):
+        buffer.append((index, 'x' * 10), seq=index)
+
+
+def test_batches_pop_in_order():
+    buffer = BatchBuffer('pokemon', 3)
+    fill(buffer, 7)
+    assert buffer.is_full()
+    batch_data, batch_ids, batch_seqs = buffer.pop_batch()
+    assert [record[0] for record in batch_data] == [0, 1, 2]
+    assert batch_ids == batch_seqs == [0, 1, 2]
+    assert len(buffer) == 4 and buffer.in_flight == 3
+    buffer.release(batch_data)
+    assert buffer.in_flight == 0
+    assert [record[0] for record in buffer.pop_batch(10)[0]] == [3, 4, 5, 6]
+
+def test_requeued_batches_keep_their_id():
+    buffer = BatchBuffer('raid', 2)
+    fill(buffer, 3)
+    batch_data, batch_ids, batch_seqs = buffer.pop_batch()
+    batch_id = buffer.batch_id(batch_ids)
+    buffer.requeue(batch_data, batch_ids, batch_seqs)
+    assert len(buffer) == 3 and buffer.in_flight == 0
+    batch_data, batch_ids, _ = buffer.pop_batch()
+    assert [record[0] for record in batch_data] == [0, 1]
+    assert buffer.batch_id(batch_ids) == batch_id
+
+def test_bytes_are_estimated_from_sampled_rows():
+    buffer = BatchBuffer('quest', 100)
+    fill(buffer, SIZE_SAMPLE * 2)
+    assert buffer.nbytes == len(buffer) * record_size((0, 'x' * 10))
+    buffer.pop_batch(SIZE_SAMPLE)
+    assert buffer.buffered() == (SIZE_SAMPLE * 2, buffer.nbytes + buffer.in_flight_bytes)
+    assert buffer.in_flight_bytes == buffer.nbytes
@@ -0,0 +1,72 @@
+import pytest
+from processor.batches import RECORD_FIELDS, encode_batch, decode_batch, load_batch, record_from_row
+
+ROWS = {
+    'pokemon': [
+        (25, 0, 40.1, -3.7, 100, 1, None, 12, True, 'Area1', 1500),
+        (1, 163, 40.2, -3.6, None, None, None, None, False, 'Area2', None),
+    ],
+    'quest': [
+        ('stop1', 'Area1', 1, None, 2, None, 3, 4, None, None, None, None, 25, 0, 40.1, -3.7),
+        ('stop2', 'Área 2', None, 5, None, 7, None, None, 8, 9, 10, 11, None, None, 40.2, -3.6),
+    ],
+    'raid': [
+        ('gym1', True, False, 5, 150, 0, 0, 'Area1', 40.1, -3.7),
+        ('gym2', False, None, 1, 1, None, 2, 'Area2', 40.2, -3.6),
+    ],
+    'invasion': [
+        ('stop1', 1, 4, True, 'Area1', 40.1, -3.7),
+        ('stop2', 2, 44, False, 'Area2', 40.2, -3.6),
+    ],
+}
+LOCATION_TYPES = ('quest', 'raid', 'invasion')
+
+
+@pytest.mark.parametrize('record_type', list(ROWS))
+def test_unclassified_rows_round_trip(record_type):
+    area_index = RECORD_FIELDS[record_type].index('area_name')
+    rows = [row[:area_index] + (None,) + row[area_index + 1:] for row in ROWS[record_type]]
+    assert decode_batch(encode_batch(record_type, rows)) == (record_type, rows)
+
+@pytest.mark.parametrize('record_type', list(ROWS))
+def test_classified_rows_round_trip(record_type):
+    rows = ROWS[record_type]
+    decoded_type, decoded_rows = decode_batch(encode_batch(record_type, rows))
+    assert decoded_type == record_type
+    if record_type in LOCATION_TYPES:
+        # Their location is only needed to classify them
+        rows = [row[:-2] + (None, None) for row in rows]
+    assert decoded_rows == rows
+
+@pytest.mark.parametrize('record_type', LOCATION_TYPES)
+def test_partly_classified_rows_keep_their_location(record_type):
+    area_index = RECORD_FIELDS[record_type].index('area_name')
+    first, second = ROWS[record_type]
+    rows = [first, second[:area_index] + (None,) + second[area_index + 1:]]
+    assert decode_batch(encode_batch(record_type, rows)) == (record_type, rows)
+
+@pytest.mark.parametrize('record_type', list(ROWS))
+def test_empty_batch_round_trip(record_type):
+    assert decode_batch(encode_batch(record_type, [])) == (record_type, [])
+
+def test_mixed_and_large_values_round_trip():
+    rows = [
+        ('stop1', 'Area1', 2 ** 40, None, 'text', 1.5, None, None, None, None, None, None, None, None, None, None),
+        ('stop2', 'Area1', -2 ** 70, 3, 4, None, None, None, None, None, None, None, None, None, None, None),
+    ]
+    decoded_type, decoded_rows = decode_batch(encode_batch('quest', rows))
+    assert decoded_rows == rows
+
+def test_load_batch_gives_records():
+    payload = encode_batch('pokemon', ROWS['pokemon'])
+    assert load_batch(payload) == [record_from_row('pokemon', row) for row in ROWS['pokemon']]
+
+def test_load_batch_keeps_record_lists():
+    records = [{'pokemon_id': 1}]
+    assert load_batch(records) is records
+
+def test_decode_rejects_other_payloads():
+    import base64
+    import zlib
+    with pytest.raises(ValueError):
+        decode_batch(base64.b64encode(zlib.compress(b'XXXX' + bytes(5))).decode())
@@ -0,0 +1,60 @@
+import pytest
+from benchmarks.bench_decoders import LEGACY_PATH, legacy_process, decoder_process
+from benchmarks.synthetic import synthesize_items
+from processor.batches import record_from_row
+from receiver.decoders import decode_message
+
+POKEMON = {
+    'pokemon_id': 25, 'form': 0, 'latitude': 38.5, 'longitude': -28.6, 'individual_attack': 15,
+    'individual_defense': 15, 'individual_stamina': 15, 'shiny': False, 'disappear_time': 1000.5, 'first_seen': 100,
+    'pvp': {'great': [{'rank': 3}, {'rank': 1}], 'little': [{'rank': 2}]},
+}
+QUEST = {
+    'pokestop_id': 'stop', 'type': 4, 'with_ar': True, 'latitude': 38.5, 'longitude': -28.6,
+    'rewards': [{'type': 7, 'info': {'pokemon_id': 1, 'form_id': 163}}, {'type': 2, 'info': {'item_id': 1, 'amount': 3}}],
+}
+RAID = {
+    'gym_id': 'gym', 'ex_raid_eligible': False, 'is_exclusive': False, 'level': 5, 'pokemon_id': 150, 'form': 0,
+    'costume': 0, 'latitude': 38.5, 'longitude': -28.6,
+}
+INVASION = {'pokestop_id': 'stop', 'display_type': 1, 'character': 4, 'confirmed': False, 'latitude': 38.5, 'longitude': -28.6}
+
+
+def records(process, items):
+    if process is decoder_process:
+        return [record_from_row(item_type, row) for item_type, row in decoder_process(items)]
+    return legacy_process(items)
+
+# Queued records also carry the location of quests, raids and invasions, the legacy ones did not
+def assert_same_records(items):
+    legacy_records = records(legacy_process, items)
+    decoder_records = records(decoder_process, items)
+    assert len(decoder_records) == len(legacy_records)
+    for legacy_record, record in zip(legacy_records, decoder_records):
+        assert {key: record.get(key) for key in legacy_record} == legacy_record
+
+
+@pytest.mark.parametrize('item_type, message', [('pokemon', POKEMON), ('quest', QUEST), ('raid', RAID), ('invasion', INVASION)])
+def test_messages_decode_like_the_legacy_path(item_type, message):
+    assert_same_records([{'type': item_type, 'message': message}])
+
+@pytest.mark.parametrize('item_type, message, missing', [
+    ('pokemon', POKEMON, 'individual_attack'),
+    ('pokemon', POKEMON, 'form'),
+    ('quest', QUEST, 'with_ar'),
+    ('raid', RAID, 'gym_id'),
+    ('invasion', INVASION, 'character'),
+])
+def test_incomplete_messages_are_rejected_like_the_legacy_path(item_type, message, missing):
+    message = {key: value for key, value in message.items() if key != missing}
+    filter_function, _ = LEGACY_PATH[item_type]
+    assert not filter_function(message)
+    assert decode_message(item_type, message) is None
+
+def test_eggs_and_non_numeric_locations_are_rejected():
+    assert decode_message('raid', dict(RAID, pokemon_id=0)) is None
+    assert decode_message('pokemon', dict(POKEMON, latitude='38.5')) is None
+    assert decode_message('pokemon', 'not a message') is None
+
+def test_synthetic_payload_decodes_like_the_legacy_path():
+    assert_same_records(synthesize_items(3000, seed=3))
@@ -0,0 +1,86 @@
+import pytest
+from receiver import dedup
+from receiver.dedup import DedupFilter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(dedup.time, 'monotonic', clock)
+    return clock
+
+
+def test_repeats_are_seen(clock):
+    dedup_filter = DedupFilter(ttl=60)
+    assert not dedup_filter.seen(('a',))
+    assert dedup_filter.seen(('a',))
+    assert not dedup_filter.seen(('b',))
+    assert dedup_filter.stats() == {'checked': 3, 'dropped': 1, 'ratio': 1 / 3, 'keys': 2}
+
+def test_keys_outlive_one_rotation(clock):
+    dedup_filter = DedupFilter(ttl=60)
+    dedup_filter.seen(('a',))
+    clock.now += 61
+    # Rotates, the key is still in the previous generation
+    dedup_filter.seen(('b',))
+    assert dedup_filter.previous == {('a',)}
+    assert dedup_filter.seen(('a',))
+
+def test_keys_expire_after_two_rotations(clock):
+    dedup_filter = DedupFilter(ttl=60)
+    dedup_filter.seen(('a',))
+    clock.now += 61
+    dedup_filter.seen(('b',))
+    clock.now += 61
+    dedup_filter.seen(('c',))
+    assert not dedup_filter.seen(('a',))
+
+def test_repeated_keys_are_carried_over(clock):
+    dedup_filter = DedupFilter(ttl=60)
+    dedup_filter.seen(('a',))
+    clock.now += 61
+    dedup_filter.seen(('b',))
+    # Seen again from the previous generation, kept in the current one
+    assert dedup_filter.seen(('a',))
+    clock.now += 61
+    dedup_filter.seen(('c',))
+    assert dedup_filter.seen(('a',))
+
+def test_full_generation_rotates(clock):
+    # Generations of two keys each
+    dedup_filter = DedupFilter(ttl=3600, max_keys=4)
+    for key in range(3):
+        assert not dedup_filter.seen((key,))
+    assert dedup_filter.previous == {(0,), (1,)}
+    assert dedup_filter.current == {(2,)}
+
+    for key in range(3, 5):
+        assert not dedup_filter.seen((key,))
+    assert dedup_filter.previous == {(2,), (3,)}
+    assert len(dedup_filter) <= 4
+    # Forgotten before its ttl, the filter was full
+    assert not dedup_filter.seen((0,))
+
+def test_keys_with_the_same_hash_are_told_apart(clock):
+    class Colliding:
+        def __init__(self, value):
+            self.value = value
+
+        def __hash__(self):
+            return 1
+
+        def __eq__(self, other):
+            return self.value == other.value
+
+    dedup_filter = DedupFilter(ttl=60)
+    assert not dedup_filter.seen(Colliding(1))
+    assert not dedup_filter.seen(Colliding(2))
+    assert dedup_filter.seen(Colliding(1))
@@ -0,0 +1,76 @@
+import pytest
+from benchmarks.synthetic import synthesize_items, synthesize_geofences
+from processor.batches import LOCATION_FIELDS, encode_batch, load_batch
+from processor.geofences import GeofencesUnavailable, WorkerGeofences, publish_geofences
+from receiver.classify import build_records, build_unclassified_records, classify_messages
+from receiver.decoders import decode_message
+from receiver.geofence_index import GeofenceIndex
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.values = {}
+
+    def set(self, key, value):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def execute(self):
+        self.redis_client.values.update(self.values)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def pending_messages(count, seed):
+    pending = []
+    for item in synthesize_items(count, seed=seed):
+        decoded = decode_message(item['type'], item['message'])
+        if decoded is not None:
+            pending.append((item['type'], decoded))
+    return pending
+
+# Records classified by the receiver are sent without their location, the deferred ones keep it
+def without_location(records):
+    return [{key: value for key, value in record.items() if key not in LOCATION_FIELDS} for record in records]
+
+
+def test_deferred_records_are_classified_like_in_the_receiver():
+    geofences = synthesize_geofences(20, seed=1)
+    pending = pending_messages(3000, seed=2)
+    queued_records, outside_counts = build_records(pending, classify_messages(pending, GeofenceIndex(geofences), None))
+    assert sum(outside_counts.values()) > 0
+
+    redis_client = FakeRedis()
+    publish_geofences(redis_client, geofences, 'v1')
+    worker_geofences = WorkerGeofences(redis_client)
+    for record_type, rows in build_unclassified_records(pending).items():
+        classified = worker_geofences.assign_areas(load_batch(encode_batch(record_type, rows)))
+        expected = load_batch(encode_batch(record_type, queued_records[record_type]))
+        assert without_location(classified) == without_location(expected)
+
+def test_records_with_an_area_are_kept_as_they_are():
+    records = [{'area_name': 'Area1', 'latitude': None, 'longitude': None}]
+    assert WorkerGeofences(FakeRedis()).assign_areas(records) is records
+
+def test_unpublished_geofences_can_not_classify():
+    with pytest.raises(GeofencesUnavailable):
+        WorkerGeofences(FakeRedis()).assign_areas([{'area_name': None, 'latitude': 38.55, 'longitude': -28.65}])
+
+def test_workers_load_the_fences_again_when_the_version_changes():
+    redis_client = FakeRedis()
+    publish_geofences(redis_client, synthesize_geofences(4, seed=1), 'v1')
+    worker_geofences = WorkerGeofences(redis_client, check_interval=0)
+    first_index = worker_geofences.current_index()
+    assert worker_geofences.current_index() is first_index
+    publish_geofences(redis_client, synthesize_geofences(9, seed=1), 'v2')
+    assert worker_geofences.current_index() is not first_index
+    assert worker_geofences.version == 'v2'
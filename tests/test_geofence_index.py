@@ -0,0 +1,76 @@
+import math
+import random
+import pytest
+from shapely.geometry import Point, Polygon
+from receiver.geofence_index import GeofenceIndex
+
+
+def make_geofences(count=30, vertices=12, seed=1):
+    rnd = random.Random(seed)
+    geofences = []
+    for index in range(count):
+        center_lon, center_lat = rnd.uniform(-1, 1), rnd.uniform(40, 42)
+        radius = rnd.uniform(0.05, 0.4)
+        ring = [
+            [center_lon + radius * math.cos(2 * math.pi * step / vertices) * rnd.uniform(0.6, 1),
+             center_lat + radius * math.sin(2 * math.pi * step / vertices) * rnd.uniform(0.6, 1)]
+            for step in range(vertices)
+        ]
+        ring.append(ring[0])
+        geofences.append({"type": "Feature", "properties": {"name": f"Area{index}"}, "geometry": {"type": "Polygon", "coordinates": [ring]}})
+    return geofences
+
+# First fence in Koji order containing each point, like the receiver did before the index
+def brute_force_lookup(points, geofences):
+    polygons = [(geofence["properties"]["name"], Polygon(geofence["geometry"]["coordinates"][0])) for geofence in geofences]
+    areas = []
+    for lat, lon in points:
+        point = Point(lon, lat)
+        areas.append(next((name for name, polygon in polygons if point.within(polygon)), None))
+    return areas
+
+def random_points(count=3000, seed=2):
+    rnd = random.Random(seed)
+    return [(rnd.uniform(39.5, 42.5), rnd.uniform(-1.5, 1.5)) for _ in range(count)]
+
+
+@pytest.mark.parametrize('grid_cell_size', [0, 0.01, 0.05])
+def test_lookup_matches_brute_force(grid_cell_size):
+    geofences = make_geofences()
+    index = GeofenceIndex(geofences, grid_cell_size=grid_cell_size)
+    points = random_points()
+    for (lat, lon), expected in zip(points, brute_force_lookup(points, geofences)):
+        assert index.lookup(lat, lon) == (expected is not None, expected)
+
+@pytest.mark.parametrize('grid_cell_size', [0, 0.01, 0.05])
+def test_lookup_many_matches_brute_force(grid_cell_size):
+    geofences = make_geofences()
+    index = GeofenceIndex(geofences, grid_cell_size=grid_cell_size)
+    points = random_points()
+    areas = index.lookup_many([lat for lat, _ in points], [lon for _, lon in points])
+    assert areas == brute_force_lookup(points, geofences)
+
+def test_grid_hits_count_every_lookup():
+    index = GeofenceIndex(make_geofences(), grid_cell_size=0.05)
+    points = random_points(500)
+    index.lookup_many([lat for lat, _ in points], [lon for _, lon in points])
+    for lat, lon in points:
+        index.lookup(lat, lon)
+    inside, outside, boundary = index.grid_hits()
+    assert inside + outside + boundary == 1000
+    assert inside and outside and boundary
+
+def test_overlapping_fences_resolve_in_koji_order():
+    square = [[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]]
+    geofences = [
+        {"properties": {"name": "First"}, "geometry": {"coordinates": [square]}},
+        {"properties": {"name": "Second"}, "geometry": {"coordinates": [square]}},
+    ]
+    index = GeofenceIndex(geofences, grid_cell_size=0.1)
+    assert index.lookup(0.5, 0.5) == (True, "First")
+    assert index.lookup_many([0.5, 2], [0.5, 2]) == ["First", None]
+
+def test_invalid_fences_are_skipped():
+    geofences = make_geofences(count=3) + [{"properties": {"name": "Broken"}, "geometry": {"coordinates": [[[0, 0]]]}}]
+    index = GeofenceIndex(geofences)
+    assert len(index) == 3
@@ -0,0 +1,40 @@
+import pytest
+from receiver.metrics import MetricsRegistry, Counter, Gauge, Histogram
+
+
+def test_counters_and_gauges_render_in_the_text_format():
+    registry = MetricsRegistry()
+    received = Counter('received_total', 'Messages received.', ['type'], registry=registry)
+    depth = Gauge('depth', 'Queue depth.', registry=registry)
+    received.labels('pokemon').inc()
+    received.labels('pokemon').inc(2)
+    received.labels('a "quoted"\nname').inc()
+    depth.set_function(lambda: 7)
+    assert registry.render() == (
+        '# HELP received_total Messages received.\n'
+        '# TYPE received_total counter\n'
+        'received_total{type="pokemon"} 3\n'
+        'received_total{type="a \\"quoted\\"\\nname"} 1\n'
+        '# HELP depth Queue depth.\n'
+        '# TYPE depth gauge\n'
+        'depth 7\n'
+    )
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    seconds = Histogram('seconds', 'Time taken.', buckets=(0.5, 0.1), registry=registry)
+    for value in (0.05, 0.1, 0.3, 2):
+        seconds.observe(value)
+    assert registry.render().splitlines()[2:] == [
+        'seconds_bucket{le="0.1"} 2',
+        'seconds_bucket{le="0.5"} 3',
+        'seconds_bucket{le="+Inf"} 4',
+        'seconds_sum 2.45',
+        'seconds_count 4',
+    ]
+
+def test_labels_must_match_the_label_names():
+    counter = Counter('lookups_total', 'Lookups.', ['cell', 'kind'], registry=None)
+    assert counter.labels('a', 'b') is counter.labels('a', 'b')
+    with pytest.raises(ValueError):
+        counter.labels('a')
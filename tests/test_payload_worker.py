@@ -0,0 +1,59 @@
+import json
+import pytest
+from receiver import payload_worker
+from receiver.geofence_snapshot import geofence_version, save_snapshot
+from receiver.payload_worker import StaleGeofences, process_payload
+
+SQUARE = [[-28.7, 38.5], [-28.7, 38.6], [-28.6, 38.6], [-28.6, 38.5], [-28.7, 38.5]]
+GEOFENCES = [{"properties": {"name": "Square"}, "geometry": {"coordinates": [SQUARE]}}]
+
+POKEMON = {
+    'pokemon_id': 25, 'form': 0, 'latitude': 38.55, 'longitude': -28.65, 'individual_attack': 15,
+    'individual_defense': 15, 'individual_stamina': 15, 'shiny': False, 'encounter_id': '1',
+}
+
+
+@pytest.fixture
+def version(tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / 'geofences.json')
+    version = geofence_version(GEOFENCES)
+    save_snapshot(snapshot_path, GEOFENCES, version)
+    monkeypatch.setattr(payload_worker, 'settings', {
+        'snapshot_path': snapshot_path, 'grid_cell_size': 0.01, 'grid_max_cells': 10000, 'batch_lookup': True,
+    })
+    monkeypatch.setattr(payload_worker, 'loaded_version', None)
+    return version
+
+def body(*items):
+    return json.dumps(list(items)).encode()
+
+
+def test_messages_are_classified_with_the_snapshot(version):
+    outside = dict(POKEMON, latitude=40.0, encounter_id='2')
+    messages, counts, lookup_seconds = process_payload(body({'type': 'pokemon', 'message': POKEMON}, {'type': 'pokemon', 'message': outside}), version, frozenset())
+    assert [(item_type, geofence_name) for item_type, _, _, geofence_name, _ in messages] == [('pokemon', 'Square'), ('pokemon', None)]
+    assert messages[0][1] is not None
+    assert counts['received', 'pokemon'] == 2
+    assert sum(count for (counter, _), count in counts.items() if counter == 'grid') == 2
+    assert len(lookup_seconds) == 1
+
+def test_stale_snapshots_are_refused(version):
+    with pytest.raises(StaleGeofences):
+        process_payload(body(), 'another version', frozenset())
+
+def test_items_that_are_not_objects_are_invalid(version):
+    messages, counts, _ = process_payload(body('pokemon', ['a'], {'type': ['a']}, {'type': 'pokemon', 'message': POKEMON}), version, frozenset())
+    assert len(messages) == 1
+    assert counts == {
+        ('received', 'other'): 3, ('invalid', 'other'): 2, ('unsupported', 'other'): 1,
+        ('received', 'pokemon'): 1, ('grid', 'inside'): 1,
+    }
+
+def test_shed_and_deferred_messages(version):
+    payload = body({'type': 'pokemon', 'message': POKEMON}, {'type': 'raid', 'message': {}})
+    messages, counts, _ = process_payload(payload, version, frozenset({'pokemon'}))
+    assert messages == []
+    assert counts == {('received', 'pokemon'): 1, ('shed', 'pokemon'): 1, ('received', 'raid'): 1, ('invalid', 'raid'): 1}
+    messages, _, lookup_seconds = process_payload(payload, None, frozenset(), deferred=True)
+    assert [(item_type, geofence_name) for item_type, _, _, geofence_name, _ in messages] == [('pokemon', None)]
+    assert lookup_seconds == []
@@ -0,0 +1,53 @@
+import asyncio
+from receiver.pipeline import Stage, Pipeline
+
+
+def test_payloads_go_through_every_stage():
+    stored = []
+
+    async def store(payload):
+        stored.append(payload)
+
+    async def main():
+        pipeline = Pipeline([Stage('test_double', lambda payload: payload * 2, 10), Stage('test_store', store, 10, workers=2)])
+        pipeline.start()
+        for payload in range(5):
+            assert pipeline.submit(payload)
+        await pipeline.join()
+        pipeline.stop()
+        return pipeline.stats()
+
+    stats = asyncio.run(main())
+    assert sorted(stored) == [0, 2, 4, 6, 8]
+    assert stats['accepted'] == 5 and stats['rejected'] == 0
+    assert stats['stages']['test_double']['processed'] == stats['stages']['test_store']['processed'] == 5
+
+def test_full_first_stage_rejects_payloads():
+    async def main():
+        pipeline = Pipeline([Stage('test_full', lambda payload: None, 2)])
+        # Not started, nothing leaves the queue
+        return [pipeline.submit(payload) for payload in range(3)], pipeline.stats()
+
+    submitted, stats = asyncio.run(main())
+    assert submitted == [True, True, False]
+    assert stats['rejected'] == 1 and stats['stages']['test_full']['depth'] == 2
+
+def test_failed_payloads_are_dropped_and_the_stage_goes_on():
+    stored = []
+
+    def parse(payload):
+        if payload == 'bad':
+            raise ValueError("not json")
+        return payload
+
+    async def main():
+        pipeline = Pipeline([Stage('test_parse', parse, 10), Stage('test_collect', stored.append, 10)])
+        pipeline.start()
+        for payload in ('a', 'bad', 'b'):
+            pipeline.submit(payload)
+        await pipeline.join()
+        pipeline.stop()
+        return pipeline.stages[0].failure_count.value
+
+    assert asyncio.run(main()) == 1
+    assert stored == ['a', 'b']
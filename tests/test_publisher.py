@@ -0,0 +1,65 @@
+import asyncio
+from processor.batches import decode_batch
+from receiver.batch_buffer import BatchBuffer
+from receiver.publisher import BatchPublisher
+
+
+class FakeTask:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def delay(self, payload, batch_id):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker is down")
+        self.sent.append((decode_batch(payload), batch_id))
+
+
+def filled_queue(count):
+    queue = BatchBuffer('invasion', 10)
+    for index in range(count):
+        queue.append(('stop', 1, index, True, 'Area1', None, None), seq=index)
+    return queue
+
+def publish(publisher, queue, insert_task):
+    async def run():
+        task = publisher.submit(queue, insert_task, 'Invasion')
+        await publisher.drain()
+        return task.result()
+    try:
+        return asyncio.run(run())
+    finally:
+        publisher.shutdown()
+
+
+def test_published_batches_are_released_and_confirmed():
+    published_seqs = []
+    publisher = BatchPublisher(on_published=published_seqs.extend)
+    queue = filled_queue(3)
+    insert_task = FakeTask()
+    assert publish(publisher, queue, insert_task)
+    (((record_type, rows), batch_id),) = insert_task.sent
+    assert record_type == 'invasion' and [row[2] for row in rows] == [0, 1, 2]
+    assert batch_id == queue.batch_id([0, 1, 2])
+    assert published_seqs == [0, 1, 2]
+    assert queue.buffered() == (0, 0)
+    assert not publisher.failing
+
+def test_failed_attempts_are_retried():
+    publisher = BatchPublisher(max_retries=2, retry_delay=0)
+    insert_task = FakeTask(failures=2)
+    assert publish(publisher, filled_queue(3), insert_task)
+    assert len(insert_task.sent) == 1
+    assert not publisher.failing
+
+def test_batches_go_back_to_their_queue_after_the_last_retry():
+    published_seqs = []
+    publisher = BatchPublisher(max_retries=1, retry_delay=0, on_published=published_seqs.extend)
+    queue = filled_queue(3)
+    assert not publish(publisher, queue, FakeTask(failures=2))
+    assert publisher.failing
+    assert published_seqs == []
+    assert len(queue) == 3 and queue.in_flight == 0
+    batch_data, _, batch_seqs = queue.pop_batch()
+    assert [record[2] for record in batch_data] == [0, 1, 2] and batch_seqs == [0, 1, 2]
@@ -0,0 +1,76 @@
+import os
+from receiver.spool import RecordSpool, SEGMENT_SUFFIX
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+
+def open_spool(directory, **kwargs):
+    spool = RecordSpool(str(directory), **kwargs)
+    assert spool.replay() == []
+    return spool
+
+def fill(spool, count, record_type='pokemon'):
+    seqs = []
+    for index in range(count):
+        seqs += spool.append(record_type, [[index, 'x' * 100]])
+    return seqs
+
+
+def test_unacked_records_are_replayed(tmp_path):
+    spool = open_spool(tmp_path, segment_size=4096)
+    seqs = spool.append('pokemon', [[1, 'a'], [2, 'b']]) + spool.append('quest', [['stop', 'c']])
+    spool.ack(seqs[:1])
+    spool.close()
+
+    replayed = RecordSpool(str(tmp_path)).replay()
+    assert replayed == [('pokemon', [2, 'b'], seqs[1]), ('quest', ['stop', 'c'], seqs[2])]
+
+def test_acked_segments_are_removed(tmp_path):
+    spool = open_spool(tmp_path, segment_size=4096)
+    seqs = fill(spool, 200)
+    assert len(segment_files(tmp_path)) > 2
+
+    spool.ack(seqs)
+    assert spool.pending() == 0
+    # Only the active segment is left
+    assert len(segment_files(tmp_path)) == 1
+    spool.close()
+    assert RecordSpool(str(tmp_path)).replay() == []
+
+def test_segments_are_removed_oldest_first(tmp_path):
+    spool = open_spool(tmp_path, segment_size=4096)
+    seqs = fill(spool, 200)
+    segments = len(segment_files(tmp_path))
+
+    # Nothing can go while the first segment still has a record waiting
+    spool.ack(seqs[1:])
+    assert len(segment_files(tmp_path)) == segments
+    spool.ack(seqs[:1])
+    assert len(segment_files(tmp_path)) == 1
+
+def test_truncated_frame_ends_the_replay(tmp_path):
+    spool = open_spool(tmp_path, segment_size=4096)
+    first = spool.append('pokemon', [[1]])
+    spool.append('pokemon', [[2, 'y' * 50]])
+    spool.close()
+    path = os.path.join(str(tmp_path), segment_files(tmp_path)[0])
+    with open(path, 'rb') as segment_file:
+        data = segment_file.read()
+    # Cut the last frame short, as a crash in the middle of a write would
+    cut = data.rstrip(b'\x00')[:-10]
+    with open(path, 'wb') as segment_file:
+        segment_file.write(cut)
+
+    assert RecordSpool(str(tmp_path)).replay() == [('pokemon', [1], first[0])]
+
+def test_max_bytes_drops_oldest_segments(tmp_path):
+    spool = open_spool(tmp_path, segment_size=4096, max_bytes=3 * 4096)
+    seqs = fill(spool, 200)
+    assert spool.size() <= 3 * 4096
+    assert len(segment_files(tmp_path)) == 3
+    assert spool.dropped > 0
+
+    # Acks of records in removed segments are ignored
+    spool.ack(seqs)
+    assert spool.pending() == 0
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import pytest
+from receiver.stream_parser import iter_webhook_items, prune_item, WebhookStreamError
+
+ITEMS = [
+    {'type': 'pokemon', 'message': {'pokemon_id': 25, 'form': 0, 'latitude': 40.1, 'longitude': -3.7, 'unused': 'x' * 50}},
+    {'type': 'gym', 'message': {'gym_id': 'ignored'}},
+    {'type': 'quest', 'message': {'pokestop_id': 'Pokéstop "1"', 'rewards': [{'type': 2, 'info': {'item_id': 1}}], 'with_ar': True}},
+    {'type': 'raid', 'message': {'gym_id': 'gym1', 'level': 5, 'end': 1700000000}},
+    {'type': 'invasion', 'message': {'pokestop_id': 'stop1', 'character': 4, 'incident_expire_timestamp': 1700000000}},
+]
+EXPECTED = [prune_item(item) if item['type'] != 'gym' else {'type': 'gym'} for item in ITEMS]
+
+
+async def chunked(body, size):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+def parse(body, size, **kwargs):
+    async def collect():
+        return [item async for item in iter_webhook_items(chunked(body, size), **kwargs)]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 10000])
+def test_items_split_across_chunks(chunk_size):
+    body = json.dumps(ITEMS, ensure_ascii=False, indent=1).encode()
+    assert parse(body, chunk_size) == EXPECTED
+
+def test_multibyte_characters_split_across_chunks():
+    body = json.dumps(ITEMS, ensure_ascii=False).encode()
+    split = body.index('é'.encode())
+    assert parse(body, split + 1) == EXPECTED
+
+def test_unused_fields_are_pruned():
+    items = parse(json.dumps(ITEMS).encode(), 16)
+    assert 'unused' not in items[0]['message']
+
+def test_other_items_are_kept_to_be_counted():
+    body = json.dumps(['pokemon', 5, {'type': ['gym']}, {'message': {}}]).encode()
+    assert parse(body, 3) == [None, None, {'type': None}, {'type': None}]
+
+def test_empty_list():
+    assert parse(b' [ ] ', 1) == []
+
+@pytest.mark.parametrize('body', [b'{"type": "pokemon"}', b'[{"type": "pokemon", "message": {}}', b'[] []', b''])
+def test_malformed_bodies_are_rejected(body):
+    with pytest.raises(WebhookStreamError):
+        parse(body, 4)
+
+def test_oversized_items_are_rejected():
+    body = json.dumps([{'type': 'pokemon', 'message': {'pokemon_id': 1, 'padding': 'x' * 5000}}]).encode()
+    with pytest.raises(WebhookStreamError):
+        parse(body, 100, max_item_size=1000)
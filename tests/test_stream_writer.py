@@ -0,0 +1,142 @@
+import json
+import os
+import pytest
+from pymysql.err import DataError, OperationalError
+
+if not os.path.exists('config/config.json'):
+    pytest.skip("the stream writer logs through the Celery worker logger, which needs a config.json", allow_module_level=True)
+pytest.importorskip('celery')
+
+from processor import stream_writer
+from processor.stream_writer import StreamWriter
+from processor.streams import STREAM_KEYS, RECORD_FIELD, UNIQUE_ID_FIELD, WRITTEN_KEY
+
+POKEMON = STREAM_KEYS['pokemon']
+RAID = STREAM_KEYS['raid']
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def set(self, key, value, ex=None):
+        self.calls.append(('set', key))
+
+    def xack(self, stream, group, *entry_ids):
+        self.calls.append(('xack', stream, entry_ids))
+
+    def xdel(self, stream, *entry_ids):
+        self.calls.append(('xdel', stream, entry_ids))
+
+    def execute(self):
+        for call in self.calls:
+            if call[0] == 'set':
+                self.redis_client.keys.add(call[1])
+            elif call[0] == 'xack':
+                self.redis_client.acked += [(call[1], entry_id) for entry_id in call[2]]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = set()
+        self.acked = []
+
+    def mget(self, keys):
+        return [b'1' if key in self.keys else None for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.committed = []
+        self.pending = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def commit(self):
+        self.committed += self.pending
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+
+def fake_insert(cursor, record_type, records):
+    for record in records:
+        if record.get('fail') == 'data':
+            raise DataError(1366, 'Incorrect integer value')
+        if record.get('fail') == 'connection':
+            raise OperationalError(2013, 'Lost connection to MySQL server during query')
+    cursor.pending += [record['id'] for record in records]
+    return len(records)
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    monkeypatch.setattr(stream_writer, 'insert_records', fake_insert)
+    writer = StreamWriter(FakeRedis(), {}, 'test')
+    writer.conn = FakeConnection()
+    monkeypatch.setattr(writer, 'connection', lambda: writer.conn)
+    return writer
+
+def entry(entry_id, unique_id, *records):
+    return (entry_id, unique_id, list(records))
+
+
+def test_chunk_is_acknowledged_after_commit(writer):
+    chunk = writer.new_chunk()
+    chunk[POKEMON] = [entry(b'1-0', 'a', {'id': 1}, {'id': 2})]
+    chunk[RAID] = [entry(b'1-1', 'b', {'id': 3})]
+    assert writer.write_chunk(chunk) == {'pokemon': 2, 'quest': 0, 'raid': 1, 'invasion': 0}
+    assert writer.conn.committed == [1, 2, 3]
+    assert sorted(writer.redis_client.acked) == [(POKEMON, b'1-0'), (RAID, b'1-1')]
+    assert writer.redis_client.keys == {WRITTEN_KEY % 'a', WRITTEN_KEY % 'b'}
+
+def test_only_rejected_entries_are_dropped(writer):
+    chunk = writer.new_chunk()
+    chunk[POKEMON] = [entry(b'1-0', 'a', {'id': 1}), entry(b'2-0', 'b', {'id': 2, 'fail': 'data'}), entry(b'3-0', 'c', {'id': 3})]
+    chunk[RAID] = [entry(b'1-1', 'd', {'id': 4})]
+    inserted = writer.write_chunk(chunk)
+    assert inserted['pokemon'] == 2 and inserted['raid'] == 1
+    assert sorted(writer.conn.committed) == [1, 3, 4]
+    # The rejected entry is acknowledged too, it would fail the same way every time
+    assert sorted(writer.redis_client.acked) == [(POKEMON, b'1-0'), (POKEMON, b'2-0'), (POKEMON, b'3-0'), (RAID, b'1-1')]
+    assert not any(chunk.values())
+
+def test_connection_errors_keep_what_is_not_committed(writer):
+    chunk = writer.new_chunk()
+    chunk[POKEMON] = [entry(b'1-0', 'a', {'id': 1}), entry(b'2-0', 'b', {'id': 2, 'fail': 'data'}), entry(b'3-0', 'c', {'id': 3, 'fail': 'connection'})]
+    with pytest.raises(OperationalError):
+        writer.write_chunk(chunk)
+    assert writer.conn.committed == [1]
+    # Retried later, without the entries already committed or dropped
+    assert chunk[POKEMON] == [entry(b'3-0', 'c', {'id': 3, 'fail': 'connection'})]
+
+def test_batches_added_twice_are_inserted_once(writer):
+    fields = {RECORD_FIELD: json.dumps({'id': 1}).encode(), UNIQUE_ID_FIELD: b'a'}
+    chunk = writer.new_chunk()
+    assert writer.add_entries(chunk, POKEMON, [(b'1-0', fields), (b'2-0', fields)]) == 1
+    writer.write_chunk(chunk)
+    assert writer.conn.committed == [1]
+
+    # A third copy read after the first was written is only acknowledged
+    chunk = writer.new_chunk()
+    assert writer.add_entries(chunk, POKEMON, [(b'3-0', fields)]) == 0
+    writer.write_chunk(chunk)
+    assert writer.conn.committed == [1]
+    assert [entry_id for _, entry_id in writer.redis_client.acked] == [b'1-0', b'2-0', b'3-0']
+
+def test_entries_of_older_receivers_have_no_batch_id(writer):
+    fields = {RECORD_FIELD: json.dumps({'id': 1}).encode()}
+    chunk = writer.new_chunk()
+    assert writer.add_entries(chunk, POKEMON, [(b'1-0', fields), (b'2-0', fields)]) == 2
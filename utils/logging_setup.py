@@ -0,0 +1,174 @@
+import atexit
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+
+
+class LocalQueueHandler(QueueHandler):
+    """Hands records to the listener thread as they are, so messages are only formatted there."""
+
+    def prepare(self, record):
+        return record
+
+
+class LogQueue:
+    """Queue between a logger and its handlers, drained by a background listener thread."""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.queue_handler = LocalQueueHandler(queue.SimpleQueue())
+        self.listener = None
+        self.start()
+
+    def start(self):
+        self.listener = QueueListener(self.queue_handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    # The listener thread does not survive a fork, prefork Celery workers start their own
+    def restart_after_fork(self):
+        self.queue_handler.queue = queue.SimpleQueue()
+        self.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+def level_from_name(level_name):
+    """Returns the logging level of a config value, None when it is OFF."""
+    level_name = level_name.upper()
+    if level_name == "OFF":
+        return None
+    return getattr(logging, level_name, logging.INFO)
+
+def setup_logging(logger, console_level_name, file_level_name, log_file, max_bytes, backup_count):
+    """Sends a logger to the console and a rotating file through one queue, returns the logger."""
+    console_level = level_from_name(console_level_name)
+    file_level = level_from_name(file_level_name)
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+
+    if console_level is not None:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    if file_level is not None:
+        if not os.path.exists(os.path.dirname(log_file)):
+            os.makedirs(os.path.dirname(log_file))
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    if not handlers:
+        logger.disabled = True
+        return logger
+
+    # Records below every handler level are dropped before their message is built
+    logger.setLevel(min(handler.level for handler in handlers))
+    log_queue = LogQueue(handlers)
+    logger.addHandler(log_queue.queue_handler)
+    atexit.register(log_queue.stop)
+    os.register_at_fork(after_in_child=log_queue.restart_after_fork)
+    return logger
+
+
+class LoggerHandler(logging.Handler):
+    """Hands records to a logger of this process, which applies its own state and handlers."""
+
+    def __init__(self, logger):
+        super().__init__()
+        self.logger = logger
+
+    def emit(self, record):
+        self.logger.handle(record)
+
+
+class WorkerLogQueue:
+    """Queue the records of spawned worker processes go through to a logger of the parent process."""
+
+    def __init__(self, logger, mp_context):
+        self.logger = logger
+        self.queue = mp_context.Queue()
+        self.listener = QueueListener(self.queue, LoggerHandler(logger))
+        self.listener.start()
+
+    # Arguments of setup_worker_logging, taken when workers start so they follow the logger as it is then
+    def worker_config(self):
+        level = None if self.logger.disabled else self.logger.getEffectiveLevel()
+        return self.logger.name, level, self.queue
+
+    def stop(self):
+        self.listener.stop()
+
+def setup_worker_logging(name, level, log_queue):
+    """Sends a logger of a worker process to the queue of a WorkerLogQueue, disabled when level is None."""
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.propagate = False
+    if level is None:
+        logger.disabled = True
+        return logger
+    logger.disabled = False
+    logger.setLevel(level)
+    logger.addHandler(QueueHandler(log_queue))
+    return logger
+
+
+class RateLimitedLogger:
+    """Logs a message at most once every interval seconds, for events that happen per item.
+
+    Messages are limited per template, or per template and key when one is given, so events of
+    different sources such as client IPs don't hide each other.
+    """
+
+    def __init__(self, logger, interval=10, max_keys=10000):
+        self.logger = logger
+        self.interval = interval
+        self.max_keys = max_keys
+        # Message template and key to (last logged, suppressed since)
+        self.last_logged = {}
+
+    # Keys not logged for an interval have nothing left to suppress
+    def forget_expired(self, now):
+        self.last_logged = {
+            limit_key: (last_logged, suppressed) for limit_key, (last_logged, suppressed) in self.last_logged.items()
+            if now - last_logged < self.interval
+        }
+
+    def log(self, level, msg, *args, key=None, stacklevel=1):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        limit_key = msg if key is None else (msg, key)
+        last_logged, suppressed = self.last_logged.get(limit_key, (None, 0))
+        if last_logged is not None and now - last_logged < self.interval:
+            self.last_logged[limit_key] = (last_logged, suppressed + 1)
+            return
+        if last_logged is None and len(self.last_logged) >= self.max_keys:
+            self.forget_expired(now)
+        self.last_logged[limit_key] = (now, 0)
+        if suppressed:
+            msg += " (%d similar messages suppressed)"
+            args += (suppressed,)
+        self.logger.log(level, msg, *args, stacklevel=stacklevel + 1)
+
+    def debug(self, msg, *args, key=None):
+        self.log(logging.DEBUG, msg, *args, key=key, stacklevel=2)
+
+    def info(self, msg, *args, key=None):
+        self.log(logging.INFO, msg, *args, key=key, stacklevel=2)
+
+    def warning(self, msg, *args, key=None):
+        self.log(logging.WARNING, msg, *args, key=key, stacklevel=2)
+
+    def error(self, msg, *args, key=None):
+        self.log(logging.ERROR, msg, *args, key=key, stacklevel=2)